@@ -0,0 +1,108 @@
+"""
+Size-bounded LRU caching for parsed uploads, reports and exports.
+
+Keys are built from content hashes (of the uploaded bytes or of a
+DataFrame's values) plus whatever options shaped the result, so a stage
+is recomputed only when its inputs actually change.
+"""
+import hashlib
+import io
+import sys
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+
+def content_hash(data):
+    """Short hex digest of raw bytes (e.g. an uploaded file)"""
+    return hashlib.blake2b(bytes(data), digest_size=16).hexdigest()
+
+
+def frame_fingerprint(df):
+    """Hex digest of a DataFrame's columns and values (index ignored)"""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr(list(df.columns)).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def estimate_size(value):
+    """Approximate memory footprint of a cached value in bytes"""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, io.BytesIO):
+        return value.getbuffer().nbytes
+    if hasattr(value, 'nbytes'):
+        return int(value.nbytes)
+    if isinstance(value, tuple):
+        return sum(estimate_size(item) for item in value)
+    if isinstance(value, dict):
+        return sum(estimate_size(item) for item in value.values())
+    return sys.getsizeof(value)
+
+
+class LRUCache:
+    """
+    Thread-safe least-recently-used cache bounded by total size in bytes.
+
+    Values bigger than the whole budget are returned but not stored.
+    """
+
+    def __init__(self, max_bytes, max_entries=None):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def size(self):
+        return self._size
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key][0]
+
+    def put(self, key, value):
+        size = estimate_size(value)
+        with self._lock:
+            if key in self._entries:
+                self._size -= self._entries.pop(key)[1]
+            if size > self.max_bytes:
+                return value
+            self._entries[key] = (value, size)
+            self._size += size
+            while self._size > self.max_bytes or (self.max_entries and len(self._entries) > self.max_entries):
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._size -= evicted_size
+        return value
+
+    def get_or_compute(self, key, compute):
+        """Return the cached value for `key`, computing and storing it on a miss"""
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            value = self.put(key, compute())
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
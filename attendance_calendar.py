@@ -0,0 +1,392 @@
+"""
+Calendar rules for attendance reports: weekends, holidays, leave and shift
+windows.
+
+A calendar is loaded from a CSV or YAML file (see load_calendar) and
+turned into a RuleIndex for one report: per-date arrays (holiday, working
+weekend day, weekday) and per-employee arrays (weekend days as a bitmask,
+leave as a students x dates mask, shift start/end/grace). apply_calendar
+then classifies every employee-day in one vectorized pass: days without
+attendance ('A' or '-') that fall on a holiday, a weekend or approved
+leave become 'H', 'W' or 'L', in that order of precedence. Recorded
+presence ('P' or 'I') is always kept. The punch-log summary also takes
+each employee's shift window from the calendar.
+
+CSV calendars have one rule per row, with the columns
+rule, employee, start, end, value:
+
+    rule,employee,start,end,value
+    weekend,,,,Saturday Sunday
+    weekend,205,,,Friday
+    holiday,,2025-01-01,,New Year
+    holiday,,2025-04-14,2025-04-16,Spring break
+    workday,,2025-02-08,,
+    leave,101,2025-03-03,2025-03-05,Sick
+    shift,,09:00,17:00,10
+    shift,205,13:00,21:00,5
+
+(for shift rows start/end are times of day and value is the grace period
+in minutes). Without a weekend rule no day is a weekend, so a calendar
+holding only holidays or leave marks nothing 'W'. YAML calendars hold the same rules as mappings:
+
+    weekend: [Saturday, Sunday]
+    holidays:
+      - {date: 2025-01-01, name: New Year}
+    workdays: [2025-02-08]
+    leave:
+      - {employee: 101, start: 2025-03-03, end: 2025-03-05, note: Sick}
+    shifts:
+      default: {start: '09:00', end: '17:00', grace_minutes: 10}
+      '205': {start: '13:00', end: '21:00', grace_minutes: 5, weekend: [Friday]}
+
+Employees are matched by roll number (or device ID) or by name
+(case-insensitive). Reading YAML needs PyYAML.
+"""
+import io
+import os
+import re
+from datetime import time
+
+import numpy as np
+import pandas as pd
+
+from attendance_cache import content_hash
+from attendance_dates import report_label_days
+from attendance_status import ABSENT, HOLIDAY, LEAVE, NO_DATA, WEEKEND
+
+RULES = ['weekend', 'holiday', 'workday', 'leave', 'shift']
+
+CSV_COLUMNS = ['rule', 'employee', 'start', 'end', 'value']
+
+WEEKDAYS = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
+
+# A calendar without a (default) weekend rule has no weekend days
+DEFAULT_WEEKEND = ()
+
+# Weekday code for dates that did not parse: no weekend bit matches it
+_NO_WEEKDAY = 7
+
+_NS_PER_MINUTE = 60 * 10**9
+
+
+def _weekdays(value):
+    """Weekday numbers (Monday = 0) from names, abbreviations or numbers"""
+    if isinstance(value, str):
+        value = [part for part in re.split(r'[\s,;/]+', value) if part]
+    days = set()
+    for item in value or []:
+        if isinstance(item, (int, np.integer)) and 0 <= item < 7:
+            days.add(int(item))
+            continue
+        text = str(item).strip().lower()
+        matches = [number for number, day in enumerate(WEEKDAYS) if len(text) >= 2 and day.startswith(text)]
+        if len(matches) != 1:
+            raise ValueError(f"Unknown weekday {item!r}")
+        days.add(matches[0])
+    return frozenset(days)
+
+
+def _day(value):
+    """A calendar date as datetime64[D]"""
+    if value is None or (isinstance(value, str) and not value.strip()):
+        raise ValueError("Missing date")
+    return np.datetime64(pd.Timestamp(value).normalize(), 'D')
+
+
+def _time(value):
+    """A time of day from 'HH:MM' text, datetime.time or (unquoted YAML HH:MM) minutes"""
+    if isinstance(value, time):
+        return value
+    if isinstance(value, (int, np.integer)):
+        return time(int(value) // 60 % 24, int(value) % 60)
+    return pd.Timestamp(str(value).strip()).time()
+
+
+def employee_key(value):
+    """Text an employee is matched on: roll numbers without a trailing '.0', names lower-cased"""
+    if isinstance(value, (float, np.floating)) and float(value).is_integer():
+        value = int(value)
+    return str(value).strip().lower()
+
+
+def _offset_ns(value):
+    return (value.hour * 60 + value.minute) * _NS_PER_MINUTE + value.second * 10**9
+
+
+class AttendanceCalendar:
+    """
+    Weekends, holidays, working weekend days, leave and shifts.
+
+    Built from rule rows (dicts with the CSV columns, see from_rules) by
+    load_calendar. `signature` identifies the rules, for cache keys.
+    """
+
+    def __init__(self, weekend=DEFAULT_WEEKEND, employee_weekends=None, holidays=None, workdays=None,
+                 leave=None, shifts=None, default_shift=None):
+        self.weekend = _weekdays(weekend)
+        self.employee_weekends = dict(employee_weekends or {})
+        self.holidays = dict(holidays or {})
+        self.workdays = set(workdays or [])
+        self.leave = list(leave or [])
+        self.shifts = dict(shifts or {})
+        self.default_shift = default_shift
+        self.signature = content_hash(repr((
+            sorted(self.weekend), sorted((k, sorted(v)) for k, v in self.employee_weekends.items()),
+            sorted((str(k), v) for k, v in self.holidays.items()), sorted(str(d) for d in self.workdays),
+            [(k, str(s), str(e)) for k, s, e in self.leave], sorted(self.shifts.items()), self.default_shift,
+        )).encode())
+
+    @classmethod
+    def from_rules(cls, rules):
+        """
+        Build a calendar from rule rows: dicts with 'rule' (weekend,
+        holiday, workday, leave or shift) and the optional 'employee',
+        'start', 'end' and 'value' entries.
+        """
+        weekend, employee_weekends = DEFAULT_WEEKEND, {}
+        holidays, workdays, leave, shifts, default_shift = {}, set(), [], {}, None
+        for number, row in enumerate(rules, start=1):
+            rule = str(row.get('rule', '')).strip().lower()
+            employee = row.get('employee')
+            employee = employee_key(employee) if employee not in (None, '') and not pd.isna(employee) else None
+            start, end, value = row.get('start'), row.get('end'), row.get('value')
+            try:
+                if rule == 'weekend':
+                    if employee is None:
+                        weekend = _weekdays(value)
+                    else:
+                        employee_weekends[employee] = _weekdays(value)
+                elif rule in ('holiday', 'workday', 'leave'):
+                    first = _day(start)
+                    last = _day(end) if end not in (None, '') else first
+                    if last < first:
+                        raise ValueError("End date is before the start date")
+                    if rule == 'leave':
+                        if employee is None:
+                            raise ValueError("Leave needs an employee")
+                        leave.append((employee, first, last))
+                    else:
+                        days = np.arange(first, last + np.timedelta64(1, 'D'))
+                        if rule == 'holiday':
+                            holidays.update((day, str(value or '').strip()) for day in days)
+                        else:
+                            workdays.update(days)
+                elif rule == 'shift':
+                    grace = int(float(value)) if value not in (None, '') else None
+                    shift = (_time(start), _time(end), grace)
+                    if employee is None:
+                        default_shift = shift
+                    else:
+                        shifts[employee] = shift
+                else:
+                    raise ValueError(f"Unknown rule {rule!r}; expected one of {RULES}")
+            except (ValueError, TypeError) as error:
+                raise ValueError(f"Calendar rule {number}: {error}") from None
+        return cls(weekend, employee_weekends, holidays, workdays, leave, shifts, default_shift)
+
+    def index(self, students, dates):
+        """Precompute the RuleIndex for a report's students and date labels"""
+        return RuleIndex(self, students, dates)
+
+    def shift_arrays(self, rolls, names, shift_start, shift_end, grace_minutes):
+        """
+        Per-employee shift start, end and grace period in nanoseconds (from
+        midnight), for employees given by roll number and name. Employees
+        without a shift of their own get the calendar's default shift, or
+        the given one.
+        """
+        default = self.default_shift or (shift_start, shift_end, grace_minutes)
+        default = (default[0], default[1], grace_minutes if default[2] is None else default[2])
+        names = list(names)
+        rolls = list(rolls) if rolls is not None else [None] * len(names)
+        start = np.empty(len(names), dtype=np.int64)
+        end = np.empty(len(names), dtype=np.int64)
+        grace = np.empty(len(names), dtype=np.int64)
+        for row, (roll, name) in enumerate(zip(rolls, names)):
+            shift = None
+            if roll is not None:
+                shift = self.shifts.get(employee_key(roll))
+            if shift is None:
+                shift = self.shifts.get(employee_key(name), default)
+            start[row] = _offset_ns(shift[0])
+            end[row] = _offset_ns(shift[1])
+            grace[row] = (default[2] if shift[2] is None else shift[2]) * _NS_PER_MINUTE
+        return start, end, grace
+
+    def __repr__(self):
+        return (f"AttendanceCalendar({len(self.holidays)} holidays, {len(self.leave)} leave periods, "
+                f"{len(self.shifts)} shifts)")
+
+
+class RuleIndex:
+    """
+    A calendar's rules laid out for one report as arrays.
+
+    Per date column: `holiday`, `workday` (a working weekend day) and
+    `weekday` (Monday = 0; 7 for labels that are not dates). Per student
+    row: `weekend_bits`, the weekend days as a 7-bit mask. `leave` is the
+    students x dates mask of approved leave.
+    """
+
+    def __init__(self, calendar, students, dates):
+        parsed = report_label_days(dates)
+        days = parsed.to_numpy('datetime64[ns]').astype('datetime64[D]')
+        known = ~np.isnat(days)
+        self.days = days
+
+        self.weekday = np.full(len(days), _NO_WEEKDAY, dtype=np.uint8)
+        # 1970-01-01 was a Thursday
+        self.weekday[known] = (days[known].astype(np.int64) + 3) % 7
+        self.holiday = known & np.isin(days, np.array(sorted(calendar.holidays), dtype='datetime64[D]'))
+        self.workday = known & np.isin(days, np.array(sorted(calendar.workdays), dtype='datetime64[D]'))
+
+        rows = _student_rows(students)
+        self.weekend_bits = np.full(len(students), _bits(calendar.weekend), dtype=np.uint8)
+        for key, weekdays in calendar.employee_weekends.items():
+            self.weekend_bits[rows.get(key, [])] = _bits(weekdays)
+
+        self.leave = _leave_mask(calendar.leave, rows, len(students), days, known)
+
+    def weekend(self):
+        """Students x dates mask of weekend days (working weekend days excluded)"""
+        weekday_bits = np.left_shift(1, self.weekday.astype(np.uint16)).astype(np.uint16)
+        return ((self.weekend_bits[:, None] & weekday_bits[None, :]) != 0) & ~self.workday[None, :]
+
+
+def _bits(weekdays):
+    return sum(1 << day for day in weekdays)
+
+
+def _student_rows(students):
+    """Matrix rows of each employee key (roll number and name)"""
+    rows = {}
+    columns = [column for column in ['Roll No', 'Student Name'] if column in students.columns]
+    for column in columns:
+        codes, uniques = pd.factorize(students[column])
+        keys = [employee_key(value) for value in uniques]
+        order = np.argsort(codes, kind='stable')
+        bounds = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+        for position, key in enumerate(keys):
+            rows.setdefault(key, []).extend(order[bounds[position]:bounds[position + 1]].tolist())
+    return rows
+
+
+def _leave_mask(leave, rows, students, days, known):
+    """
+    Students x dates leave mask. Each period becomes +1 / -1 marks at its
+    first and past-the-end positions among the sorted dates, so a single
+    cumulative sum fills in every period at once.
+    """
+    mask = np.zeros((students, len(days)), dtype=bool)
+    if not leave or not known.any():
+        return mask
+    columns = np.flatnonzero(known)
+    order = columns[np.argsort(days[known], kind='stable')]
+    sorted_days = days[order]
+
+    period_rows, starts, ends = [], [], []
+    for key, first, last in leave:
+        for row in rows.get(key, []):
+            period_rows.append(row)
+            starts.append(first)
+            ends.append(last)
+    if not period_rows:
+        return mask
+    period_rows = np.asarray(period_rows, dtype=np.int64)
+    lo = np.searchsorted(sorted_days, np.asarray(starts, dtype='datetime64[D]'), side='left')
+    hi = np.searchsorted(sorted_days, np.asarray(ends, dtype='datetime64[D]'), side='right')
+
+    marks = np.zeros((students, len(order) + 1), dtype=np.int32)
+    np.add.at(marks, (period_rows, lo), 1)
+    np.add.at(marks, (period_rows, hi), -1)
+    mask[:, order] = np.cumsum(marks, axis=1)[:, :-1] > 0
+    return mask
+
+
+def classify(codes, index):
+    """
+    Apply a RuleIndex to a students x dates code matrix in one pass.
+
+    Cells without attendance ('A' or '-') on holidays, weekends or leave
+    become HOLIDAY, WEEKEND or LEAVE (in that order of precedence); all
+    other cells keep their code.
+    """
+    codes = np.asarray(codes, dtype=np.uint8)
+    open_days = (codes == ABSENT) | (codes == NO_DATA)
+    return np.select(
+        [open_days & index.holiday[None, :], open_days & index.weekend(), open_days & index.leave],
+        [np.uint8(HOLIDAY), np.uint8(WEEKEND), np.uint8(LEAVE)],
+        codes,
+    ).astype(np.uint8)
+
+
+def apply_calendar(matrix, calendar):
+    """The AttendanceMatrix with the calendar's days off marked"""
+    index = calendar.index(matrix.students, matrix.dates)
+    return matrix.with_codes(classify(matrix.codes, index))
+
+
+def _yaml_rules(document):
+    """Rule rows from a parsed YAML calendar"""
+    document = document or {}
+    if not isinstance(document, dict):
+        raise ValueError("A YAML calendar must be a mapping")
+    rules = []
+    if 'weekend' in document:
+        rules.append({'rule': 'weekend', 'value': document['weekend']})
+    holidays = document.get('holidays') or []
+    if isinstance(holidays, dict):
+        holidays = [{'date': day, 'name': name} for day, name in holidays.items()]
+    for holiday in holidays:
+        if not isinstance(holiday, dict):
+            holiday = {'date': holiday}
+        rules.append({'rule': 'holiday', 'start': holiday.get('date', holiday.get('start')),
+                      'end': holiday.get('end'), 'value': holiday.get('name')})
+    for workday in document.get('workdays') or []:
+        rules.append({'rule': 'workday', 'start': workday})
+    for period in document.get('leave') or []:
+        rules.append({'rule': 'leave', 'employee': period.get('employee'),
+                      'start': period.get('start', period.get('date')), 'end': period.get('end'),
+                      'value': period.get('note')})
+    for employee, shift in (document.get('shifts') or {}).items():
+        employee = None if str(employee).strip().lower() == 'default' else employee
+        shift = shift or {}
+        if 'start' in shift or 'end' in shift:
+            rules.append({'rule': 'shift', 'employee': employee, 'start': shift.get('start'),
+                          'end': shift.get('end'), 'value': shift.get('grace_minutes')})
+        if 'weekend' in shift:
+            rules.append({'rule': 'weekend', 'employee': employee, 'value': shift['weekend']})
+    return rules
+
+
+def load_calendar(source, filename=None):
+    """
+    Load a calendar from a .csv, .yaml or .yml file (a path, raw bytes or
+    a file-like object such as a Streamlit upload).
+    """
+    name = filename or getattr(source, 'name', None) or (source if isinstance(source, (str, os.PathLike)) else '')
+    extension = os.path.splitext(str(name))[1].lower()
+    if isinstance(source, (bytes, bytearray)):
+        source = io.BytesIO(source)
+    if hasattr(source, 'seek'):
+        source.seek(0)
+
+    if extension in ('.yaml', '.yml'):
+        try:
+            import yaml
+        except ImportError:
+            raise ValueError("Reading YAML calendars needs PyYAML (pip install pyyaml); "
+                             "CSV calendars work without it") from None
+        if hasattr(source, 'read'):
+            document = yaml.safe_load(source.read())
+        else:
+            with open(source, encoding='utf-8') as handle:
+                document = yaml.safe_load(handle)
+        return AttendanceCalendar.from_rules(_yaml_rules(document))
+    if extension == '.csv':
+        table = pd.read_csv(source, dtype=str, keep_default_na=False, skipinitialspace=True)
+        table.columns = [str(column).strip().lower() for column in table.columns]
+        if 'rule' not in table.columns:
+            raise ValueError(f"A CSV calendar needs the columns {CSV_COLUMNS}")
+        return AttendanceCalendar.from_rules(table.to_dict('records'))
+    raise ValueError(f"Unsupported calendar file {name!r}; expected .csv, .yaml or .yml")
@@ -1,142 +1,469 @@
-import pandas as pd
 import os
+import sys
+import glob
+import json
+import time
+import hashlib
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import nullcontext
 from datetime import datetime
 
-def process_attendance_file(input_file_path, output_file_path=None):
+from attendance_core import convert_attendance_rows, find_date_columns, read_workbook
+from attendance_export import (CONVERTER_STATUS_STYLES, DEFAULT_FORMAT, EXPORT_FORMATS, column_widths, export_path,
+                               write_classic_report, write_report, write_report_chunks, write_styled_report)
+from attendance_ingest import DEFAULT_CHUNK_ROWS, iter_excel_chunks, read_excel_head
+from attendance_merge import merge_wide_sheets, read_sheets
+from attendance_profile import Profiler, profiled, profiling, span
+
+def _quiet(*args, **kwargs):
+    pass
+
+def process_attendance_in_chunks(input_file_path, output_file_path, chunk_rows=DEFAULT_CHUNK_ROWS, verbose=True,
+                                 formats=(DEFAULT_FORMAT,)):
+    """
+    Convert a large attendance file while holding only one chunk of rows
+    in memory. The file is read once to size the columns and once more
+    per export format to stream the rows into the report.
+    """
+    log = print if verbose else _quiet
+    
+    with span('find_date_columns'):
+        date_columns = find_date_columns(read_excel_head(input_file_path, rows=1).columns)
+    log(f"Date columns found: {date_columns}")
+    
+    def converted_chunks():
+        for chunk in iter_excel_chunks(input_file_path, chunk_rows=chunk_rows):
+            yield convert_attendance_rows(chunk, date_columns)
+    
+    # First pass: row count, report columns and column widths
+    total_rows = 0
+    columns = None
+    widths = None
+    with span('size_columns') as record:
+        for report_chunk in converted_chunks():
+            total_rows += len(report_chunk)
+            chunk_widths = column_widths(report_chunk)
+            if columns is None:
+                columns = list(report_chunk.columns)
+                widths = chunk_widths
+            else:
+                widths = [max(a, b) for a, b in zip(widths, chunk_widths)]
+        record['rows'] = total_rows
+    
+    if columns is None:
+        raise ValueError("No attendance rows found in the file")
+    log(f"Total students: {total_rows}")
+    
+    # Then one pass per format to stream the rows
+    for fmt in formats:
+        with span(f'write_{fmt}', rows=total_rows):
+            write_report_chunks(converted_chunks(), export_path(output_file_path, fmt), columns, fmt, widths,
+                                CONVERTER_STATUS_STYLES)
+    return output_file_path, total_rows
+
+def convert_attendance_file(input_file_path, output_file_path=None, fast_export=True, chunk_rows=None, verbose=True,
+                            formats=(DEFAULT_FORMAT,)):
+    """
+    Convert an Excel attendance file to the clean report format.
+    
+    Returns (output_file_path, report_rows) and raises on failure; see
+    process_attendance_file for the options. Each of `formats` (names from
+    attendance_export.EXPORT_FORMATS) is saved at export_path(output_file_path, fmt).
+    """
+    log = print if verbose else _quiet
+    
+    # Generate output filename if not provided
+    if output_file_path is None:
+        input_name = os.path.splitext(os.path.basename(input_file_path))[0]
+        output_file_path = f"{input_name}_attendance_report.xlsx"
+    
+    if chunk_rows:
+        _, report_rows = process_attendance_in_chunks(input_file_path, output_file_path, chunk_rows, verbose, formats)
+        for fmt in formats:
+            log(f"Attendance report saved as: {export_path(output_file_path, fmt)}")
+        return output_file_path, report_rows
+    
+    # Read the Excel file with proper engine detection
+    df = read_attendance_excel(input_file_path)
+    
+    # Display original data info
+    log("Original file loaded successfully!")
+    log(f"Total students: {len(df)}")
+    log(f"Columns: {list(df.columns)}")
+    
+    # Identify date columns (assuming they contain dates)
+    with span('find_date_columns', rows=len(df.columns)):
+        date_columns = find_date_columns(df.columns)
+    
+    log(f"Date columns found: {date_columns}")
+    
+    # Create a clean report
+    with span('convert_rows', rows=len(df)):
+        report_df = convert_attendance_rows(df, date_columns)
+    
+    # Save the report with formatting
+    save_report(report_df, output_file_path, formats, fast_export, log)
+    return output_file_path, len(report_df)
+
+@profiled('read_excel')
+def read_attendance_excel(input_file_path):
+    """Read a whole attendance workbook, picking the engine from the extension"""
+    return read_workbook(input_file_path)
+
+def write_report_excel(report_df, output_file_path, fast_export=True):
+    """Save a converted report with the converter's formatting"""
+    if fast_export:
+        write_styled_report(report_df, output_file_path, CONVERTER_STATUS_STYLES)
+    else:
+        write_classic_report(report_df, output_file_path, CONVERTER_STATUS_STYLES)
+
+def save_report(report_df, output_file_path, formats=(DEFAULT_FORMAT,), fast_export=True, log=_quiet):
+    """Write a converted report in each of `formats` next to output_file_path"""
+    for fmt in formats:
+        path = export_path(output_file_path, fmt)
+        if fmt == 'styled':
+            with span('write_excel', rows=len(report_df)):
+                write_report_excel(report_df, path, fast_export)
+        else:
+            with span(f'write_{fmt}', rows=len(report_df)):
+                write_report(report_df, path, fmt)
+        log(f"Attendance report saved as: {path}")
+
+def process_attendance_file(input_file_path, output_file_path=None, fast_export=True, chunk_rows=None,
+                            formats=(DEFAULT_FORMAT,)):
     """
     Process Excel attendance file and convert to clean report format
+    
+    fast_export streams the styled workbook through attendance_export;
+    set it to False for the original cell-by-cell openpyxl styling.
+    chunk_rows switches to low-memory chunked reading (always uses the
+    streaming writer). `formats` picks the files written: 'styled',
+    'xlsx' (plain values), 'csv' and/or 'parquet'.
     """
     try:
-        # Read the Excel file with proper engine detection
-        file_extension = input_file_path.split('.')[-1].lower()
-        
-        if file_extension == 'xls':
-            # For .xls files, use xlrd engine
-            df = pd.read_excel(input_file_path, engine='xlrd')
-        elif file_extension in ['xlsx', 'xlsm']:
-            # For .xlsx/.xlsm files, use openpyxl engine
-            df = pd.read_excel(input_file_path, engine='openpyxl')
-        else:
-            # Try with openpyxl first, then xlrd
-            try:
-                df = pd.read_excel(input_file_path, engine='openpyxl')
-            except:
-                df = pd.read_excel(input_file_path, engine='xlrd')
-        
-        # Display original data info
-        print("Original file loaded successfully!")
-        print(f"Total students: {len(df)}")
-        print(f"Columns: {list(df.columns)}")
-        
-        # Identify date columns (assuming they contain dates)
-        date_columns = []
-        for col in df.columns:
-            if col not in ['Roll', 'Name', 'Present', 'Absent']:
-                # Try to parse as date
-                try:
-                    pd.to_datetime(col)
-                    date_columns.append(col)
-                except:
-                    # If it's not a date, check if it contains date-like patterns
-                    if any(char in str(col) for char in ['/', '-', '2024', '2025']):
-                        date_columns.append(col)
-        
-        print(f"Date columns found: {date_columns}")
-        
-        # Create a clean report
-        report_data = []
-        
-        for index, row in df.iterrows():
-            student_data = {
-                'Roll No': row.get('Roll', ''),
-                'Student Name': row.get('Name', ''),
-                'Total Present': row.get('Present', 0),
-                'Total Absent': row.get('Absent', 0)
-            }
-            
-            # Add attendance for each date
-            for date_col in date_columns:
-                attendance_value = row.get(date_col, '')
-                # Convert to P/A format
-                if str(attendance_value).upper() in ['P', 'PRESENT']:
-                    student_data[date_col] = 'P'
-                elif str(attendance_value).upper() in ['A', 'ABSENT']:
-                    student_data[date_col] = 'A'
-                elif str(attendance_value).upper() in ['I', 'INCOMPLETE']:
-                    student_data[date_col] = 'I'
-                else:
-                    student_data[date_col] = str(attendance_value)
-            
-            report_data.append(student_data)
-        
-        # Create DataFrame for the report
-        report_df = pd.DataFrame(report_data)
-        
-        # Generate output filename if not provided
-        if output_file_path is None:
-            input_name = os.path.splitext(os.path.basename(input_file_path))[0]
-            output_file_path = f"{input_name}_attendance_report.xlsx"
-        
-        # Save the report with formatting
-        with pd.ExcelWriter(output_file_path, engine='openpyxl') as writer:
-            report_df.to_excel(writer, sheet_name='Attendance Report', index=False)
-            
-            # Get the worksheet to apply formatting
-            worksheet = writer.sheets['Attendance Report']
-            
-            # Auto-adjust column widths
-            for column in worksheet.columns:
-                max_length = 0
-                column_letter = column[0].column_letter
-                for cell in column:
-                    try:
-                        if len(str(cell.value)) > max_length:
-                            max_length = len(str(cell.value))
-                    except:
-                        pass
-                adjusted_width = min(max_length + 2, 20)
-                worksheet.column_dimensions[column_letter].width = adjusted_width
-            
-            # Apply basic formatting
-            from openpyxl.styles import Font, PatternFill, Border, Side, Alignment
-            
-            # Header formatting
-            header_font = Font(bold=True, color="FFFFFF")
-            header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-            
-            for col_num, cell in enumerate(worksheet[1], 1):
-                cell.font = header_font
-                cell.fill = header_fill
-                cell.alignment = Alignment(horizontal='center', vertical='center')
-            
-            # Color code attendance cells
-            for row in worksheet.iter_rows(min_row=2, max_row=worksheet.max_row):
-                for cell in row:
-                    if cell.value == 'P':
-                        cell.fill = PatternFill(start_color="C6EFCE", end_color="C6EFCE", fill_type="solid")
-                        cell.font = Font(color="006100")
-                    elif cell.value == 'A':
-                        cell.fill = PatternFill(start_color="FFC7CE", end_color="FFC7CE", fill_type="solid")
-                        cell.font = Font(color="9C0006")
-                    elif cell.value == 'I':
-                        cell.fill = PatternFill(start_color="FFEB9C", end_color="FFEB9C", fill_type="solid")
-                        cell.font = Font(color="9C5700")
-                    
-                    # Center align attendance values
-                    if cell.column > 4:  # Attendance columns
-                        cell.alignment = Alignment(horizontal='center', vertical='center')
-        
-        print(f"Attendance report saved as: {output_file_path}")
+        output_file_path, _ = convert_attendance_file(input_file_path, output_file_path,
+                                                      fast_export=fast_export, chunk_rows=chunk_rows,
+                                                      formats=formats)
         return output_file_path
         
     except Exception as e:
         print(f"Error processing file: {str(e)}")
         return None
 
-def main():
+def merge_attendance_files(input_file_paths, output_file_path, workers=None, verbose=True,
+                           formats=(DEFAULT_FORMAT,)):
+    """
+    Merge every sheet of several wide attendance workbooks into one report.
+    
+    Sheets are parsed in parallel; students appearing in several sheets are
+    combined into one row (see attendance_merge.merge_wide_sheets).
+    Returns (output_file_path, report_rows, sheet results).
+    """
+    log = print if verbose else _quiet
+    
+    with span('read_sheets') as record:
+        results = read_sheets([(path, path) for path in input_file_paths], workers=workers)
+        record['rows'] = sum(result['rows'] for result in results)
+    for result in results:
+        if result['error']:
+            log(f"  FAIL  {result['file']} [{result['sheet']}]: {result['error']}")
+        else:
+            log(f"  READ  {result['file']} [{result['sheet']}]: {result['rows']} rows in {result['seconds']:.2f}s")
+    
+    with span('merge_sheets') as record:
+        df, duplicates = merge_wide_sheets(results)
+        record['rows'] = len(df)
+    log(f"Merged {len(df)} students from {len(results)} sheet(s) ({duplicates} overlapping rows combined)")
+    
+    with span('find_date_columns', rows=len(df.columns)):
+        date_columns = find_date_columns(df.columns)
+    with span('convert_rows', rows=len(df)):
+        report_df = convert_attendance_rows(df, date_columns)
+    save_report(report_df, output_file_path, formats, log=log)
+    return output_file_path, len(report_df), results
+
+EXCEL_EXTENSIONS = ('.xls', '.xlsx', '.xlsm')
+
+MANIFEST_NAME = '.attendance_manifest.json'
+
+def expand_inputs(patterns):
+    """
+    Resolve files, directories (their Excel files) and glob patterns to a
+    sorted list of unique input paths
+    """
+    found = set()
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            candidates = [os.path.join(pattern, name) for name in os.listdir(pattern)]
+        elif os.path.exists(pattern):
+            candidates = [pattern]
+        else:
+            candidates = glob.glob(pattern, recursive=True)
+        for path in candidates:
+            if os.path.isfile(path) and path.lower().endswith(EXCEL_EXTENSIONS):
+                found.add(os.path.abspath(path))
+    return sorted(found)
+
+def input_root(inputs):
+    """Deepest directory holding all inputs; batch outputs mirror the folders below it"""
+    return os.path.commonpath([os.path.dirname(os.path.abspath(path)) for path in inputs]) if inputs else ''
+
+def report_path_for(input_file_path, output_dir, root=None):
+    """
+    Output path used for an input file in batch mode: the input's folder
+    relative to `root` (see input_root) is kept, so branch_a/attendance.xlsx
+    and branch_b/attendance.xlsx get separate reports
+    """
+    input_name = os.path.splitext(os.path.basename(input_file_path))[0]
+    folder = os.path.dirname(os.path.abspath(input_file_path))
+    relative = os.path.relpath(folder, root) if root else os.curdir
+    return os.path.normpath(os.path.join(output_dir, relative, f"{input_name}_attendance_report.xlsx"))
+
+def manifest_key(output_file_path, output_dir):
+    """Manifest entry name of an output: its path inside the output directory"""
+    return os.path.relpath(output_file_path, output_dir).replace(os.sep, '/')
+
+def file_hash(path):
+    """Content hash of a file, read in 1 MB blocks"""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as handle:
+        for block in iter(lambda: handle.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def conversion_options(chunk_rows, fmt):
+    """The settings an output was built with, as recorded in the manifest"""
+    return {'chunk_rows': chunk_rows, 'format': fmt}
+
+def is_up_to_date(input_file_path, output_file_path, manifest, key=None, options=None):
+    """
+    An output is current when the manifest entry under `key` (default: the
+    output's file name) records the same conversion `options` and the
+    output is newer than its input, or the input's content hash matches
+    the one recorded when it was built
+    """
+    if not os.path.exists(output_file_path):
+        return False
+    recorded = manifest.get(key or os.path.basename(output_file_path))
+    if not isinstance(recorded, dict) or recorded.get('options') != options:
+        return False
+    if os.path.getmtime(output_file_path) >= os.path.getmtime(input_file_path):
+        return True
+    return recorded.get('hash') == file_hash(input_file_path)
+
+def _convert_job(job):
+    """Worker entry point: convert one file and report timing (never raises)
+    
+    With profiling on, the result also carries the per-stage spans.
+    """
+    input_file_path, output_file_path, chunk_rows, profile, formats = job
+    start = time.perf_counter()
+    result = {
+        'input': input_file_path,
+        'output': output_file_path,
+        'outputs': [export_path(output_file_path, fmt) for fmt in formats],
+        'input_bytes': os.path.getsize(input_file_path),
+    }
+    profiler = Profiler(context={'file': os.path.basename(input_file_path)}) if profile else None
+    try:
+        with profiling(profiler) if profiler else nullcontext():
+            with span('convert_file') as record:
+                _, rows = convert_attendance_file(input_file_path, output_file_path, chunk_rows=chunk_rows,
+                                                  verbose=False, formats=formats)
+                record['rows'] = rows
+        result.update(status='ok', rows=rows, hash=file_hash(input_file_path))
+    except Exception as e:
+        result.update(status='failed', rows=0, error=f"{type(e).__name__}: {e}")
+    result['seconds'] = time.perf_counter() - start
+    if profiler is not None:
+        result['spans'] = profiler.records()
+    return result
+
+def _print_result(result):
+    name = os.path.relpath(result['input'])
+    if result['status'] == 'skipped':
+        print(f"  SKIP  {name} (up to date)")
+    elif result['status'] == 'failed':
+        print(f"  FAIL  {name}: {result['error']}")
+    else:
+        seconds = max(result['seconds'], 1e-9)
+        print(f"  OK    {name}: {result['rows']} rows in {seconds:.2f}s "
+              f"({result['rows'] / seconds:,.0f} rows/s, {result['input_bytes'] / seconds / 1e6:.2f} MB/s)")
+
+def run_batch(inputs, output_dir, workers=None, force=False, chunk_rows=None, profile=False,
+              formats=(DEFAULT_FORMAT,)):
+    """
+    Convert many attendance files, in parallel when workers > 1, writing
+    each of `formats` per file. With profile=True each converted file's
+    result includes its 'spans'.
+    
+    Outputs mirror the input folders below their common root, and inputs
+    that would still write the same report (e.g. a.xls and a.xlsx in one
+    folder) all fail instead of overwriting each other.
+    
+    Returns the list of per-file results (status 'ok', 'skipped' or 'failed').
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    manifest_path = os.path.join(output_dir, MANIFEST_NAME)
+    manifest = {}
+    if os.path.exists(manifest_path):
+        with open(manifest_path) as handle:
+            manifest = json.load(handle)
+    
+    root = input_root(inputs)
+    claimed = {}
+    for input_file_path in inputs:
+        output_file_path = report_path_for(input_file_path, output_dir, root)
+        claimed.setdefault(os.path.normcase(output_file_path), []).append(input_file_path)
+    
+    results = []
+    jobs = []
+    for input_file_path in inputs:
+        output_file_path = report_path_for(input_file_path, output_dir, root)
+        outputs = [export_path(output_file_path, fmt) for fmt in formats]
+        others = [path for path in claimed[os.path.normcase(output_file_path)] if path != input_file_path]
+        if others:
+            results.append({'input': input_file_path, 'output': output_file_path, 'outputs': outputs,
+                            'status': 'failed', 'rows': 0, 'seconds': 0.0,
+                            'error': f"report {manifest_key(output_file_path, output_dir)} would also be "
+                                     f"written for {', '.join(others)}; rename one of the inputs"})
+        elif not force and all(is_up_to_date(input_file_path, path, manifest, manifest_key(path, output_dir),
+                                             conversion_options(chunk_rows, fmt))
+                               for fmt, path in zip(formats, outputs)):
+            results.append({'input': input_file_path, 'output': output_file_path, 'outputs': outputs,
+                            'status': 'skipped'})
+        else:
+            os.makedirs(os.path.dirname(output_file_path), exist_ok=True)
+            jobs.append((input_file_path, output_file_path, chunk_rows, profile, formats))
+    
+    for result in results:
+        _print_result(result)
+    
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(jobs) <= 1:
+        completed = map(_convert_job, jobs)
+        for result in completed:
+            _print_result(result)
+            results.append(result)
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+            for future in as_completed([pool.submit(_convert_job, job) for job in jobs]):
+                result = future.result()
+                _print_result(result)
+                results.append(result)
+    
+    for result in results:
+        if result['status'] == 'ok':
+            for fmt, path in zip(formats, result['outputs']):
+                manifest[manifest_key(path, output_dir)] = {'hash': result['hash'],
+                                                            'options': conversion_options(chunk_rows, fmt)}
+    with open(manifest_path, 'w') as handle:
+        json.dump(manifest, handle, indent=2, sort_keys=True)
+    
+    return results
+
+def write_profile(results, destination):
+    """Write the spans of all profiled conversions as JSON lines ('-' = stderr)"""
+    lines = [json.dumps(record, default=str) for result in results for record in result.get('spans', [])]
+    if destination == '-':
+        for line in lines:
+            print(line, file=sys.stderr)
+        return
+    with open(destination, 'a') as handle:
+        for line in lines:
+            handle.write(line + '\n')
+
+def batch_main(argv):
+    """
+    Non-interactive entry point: convert files/directories/globs into an
+    output directory. Exit code 0 = all converted or up to date, 1 = at
+    least one file failed, 2 = bad usage or no input files found.
+    """
+    parser = argparse.ArgumentParser(
+        prog="attendance_converter.py",
+        description="Convert Excel attendance files to formatted attendance reports."
+    )
+    parser.add_argument("inputs", nargs="+", help="Excel files, directories or glob patterns")
+    parser.add_argument("-o", "--output-dir", default="reports", help="Directory for the reports (default: reports)")
+    parser.add_argument("-j", "--workers", type=int, default=None,
+                        help="Parallel worker processes (default: number of CPUs)")
+    parser.add_argument("--force", action="store_true", help="Rebuild reports even if they are up to date")
+    parser.add_argument("--chunk-rows", type=int, default=None,
+                        help="Read inputs in chunks of this many rows (low-memory mode)")
+    parser.add_argument("--profile", nargs="?", const="-", default=None, metavar="FILE",
+                        help="Write per-stage timings and peak memory as JSON lines to FILE "
+                             "(default: stderr)")
+    parser.add_argument("--merge", default=None, metavar="OUTPUT",
+                        help="Merge every sheet of all inputs into the single report OUTPUT")
+    parser.add_argument("--format", action="append", choices=list(EXPORT_FORMATS), default=None, dest="formats",
+                        help="Report format; repeatable. 'styled' is the color-coded workbook, 'xlsx' the same "
+                             "values unstyled, plus 'csv' and 'parquet' (default: styled)")
+    args = parser.parse_args(argv)
+    formats = list(dict.fromkeys(args.formats or [DEFAULT_FORMAT]))
+    
+    if args.workers is not None and args.workers < 1:
+        parser.error("--workers must be at least 1")
+    
+    inputs = expand_inputs(args.inputs)
+    if not inputs:
+        print("No Excel files matched the given inputs.", file=sys.stderr)
+        return 2
+    
+    if args.merge:
+        return merge_main(inputs, args.merge, args.workers, args.profile, formats)
+    
+    print(f"Converting {len(inputs)} file(s) into {args.output_dir}")
+    start = time.perf_counter()
+    results = run_batch(inputs, args.output_dir, workers=args.workers, force=args.force,
+                        chunk_rows=args.chunk_rows, profile=args.profile is not None, formats=formats)
+    elapsed = time.perf_counter() - start
+    
+    if args.profile is not None:
+        write_profile(results, args.profile)
+    
+    converted = [r for r in results if r['status'] == 'ok']
+    failed = [r for r in results if r['status'] == 'failed']
+    skipped = [r for r in results if r['status'] == 'skipped']
+    total_rows = sum(r['rows'] for r in converted)
+    print(f"\nDone in {elapsed:.2f}s: {len(converted)} converted, {len(skipped)} up to date, "
+          f"{len(failed)} failed ({total_rows / max(elapsed, 1e-9):,.0f} rows/s overall)")
+    
+    return 1 if failed else 0
+
+def merge_main(inputs, output_file_path, workers=None, profile=None, formats=(DEFAULT_FORMAT,)):
+    """Merge mode of the command line: exit code 0 = report written, 1 = failed"""
+    print(f"Merging all sheets of {len(inputs)} file(s) into {output_file_path}")
+    start = time.perf_counter()
+    profiler = Profiler(context={'file': os.path.basename(output_file_path)}) if profile is not None else None
+    try:
+        with profiling(profiler) if profiler else nullcontext():
+            _, rows, results = merge_attendance_files(inputs, output_file_path, workers=workers, formats=formats)
+    except Exception as e:
+        print(f"Error merging files: {type(e).__name__}: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if profiler is not None:
+            write_profile([{'spans': profiler.records()}], profile)
+    
+    elapsed = time.perf_counter() - start
+    failed = [result for result in results if result['error']]
+    print(f"\nDone in {elapsed:.2f}s: {rows} students from {len(results) - len(failed)} sheet(s), "
+          f"{len(failed)} sheet(s) failed")
+    return 1 if failed else 0
+
+def main(argv=None):
     """
     Main function to run the attendance converter
+    
+    With command-line arguments it runs in batch mode (see batch_main);
+    otherwise it prompts for a single file.
     """
+    if argv is None:
+        argv = sys.argv[1:]
+    if argv:
+        return batch_main(argv)
+    
     print("=== Excel Attendance Report Converter ===")
     print()
     
@@ -145,7 +472,7 @@ def main():
     
     if not os.path.exists(input_file):
         print("File not found! Please check the path.")
-        return
+        return 1
     
     # Process the file
     output_file = process_attendance_file(input_file)
@@ -158,6 +485,8 @@ def main():
         print("- Summary of present/absent counts")
     else:
         print("\n❌ Failed to create attendance report")
+        return 1
+    return 0
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
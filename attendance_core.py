@@ -0,0 +1,273 @@
+"""
+Headless processing core shared by the Streamlit app, the converter CLI
+and the background job workers.
+
+read -> detect columns -> normalize and pivot -> totals -> export, with no
+Streamlit import: streamlit_app and attendance_converter are thin
+front-ends over these functions, so batch workers start without the web
+stack. openpyxl and xlrd are only imported once a workbook is actually
+read or written.
+"""
+import io
+import os
+
+import numpy as np
+import pandas as pd
+
+from attendance_calendar import apply_calendar
+from attendance_dates import date_labels, report_dates
+from attendance_export import APP_STATUS_STYLES, write_classic_report, write_report, write_styled_report
+from attendance_ingest import excel_engine, iter_excel_chunks, stream_attendance_matrix
+from attendance_matrix import AttendanceMatrix, as_report_frame
+from attendance_pivot import FIRST, pivot_codes
+from attendance_profile import span
+from attendance_punches import daily_summary, find_punch_id_column, looks_like_punch_log, punch_matrix, summarize_punches
+from attendance_schema import detect_schema, find_header_date_columns
+from attendance_status import is_numeric_status, status_codes, status_labels
+from attendance_summary import summarize_report
+from attendance_xls import read_xls
+
+
+def _source_name(source, filename=None):
+    return filename or getattr(source, 'name', None) or (source if isinstance(source, (str, os.PathLike)) else '')
+
+
+def read_workbook(source, filename=None):
+    """
+    Read the first sheet of an Excel file (path or file-like) in full.
+
+    The reader is picked from the file name: .xls through read_xls, .xlsx
+    through openpyxl; unknown extensions try openpyxl, then xlrd.
+    """
+    engine = excel_engine(_source_name(source, filename))
+    if hasattr(source, 'seek'):
+        source.seek(0)
+    if engine == 'xlrd':
+        return read_xls(source)
+    if engine == 'openpyxl':
+        return pd.read_excel(source, engine='openpyxl')
+    try:
+        return pd.read_excel(source, engine='openpyxl')
+    except Exception:
+        if hasattr(source, 'seek'):
+            source.seek(0)
+        return pd.read_excel(source, engine='xlrd')
+
+
+def read_columns_in_chunks(source, columns, filename=None):
+    """Read just the given columns of a workbook, one chunk at a time"""
+    chunks = [chunk[columns] for chunk in iter_excel_chunks(source, filename=_source_name(source, filename))]
+    if hasattr(source, 'seek'):
+        source.seek(0)
+    return pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame(columns=columns)
+
+
+def detect_columns(df):
+    """
+    The report's columns in a records table: name, roll, date, status and
+    time (None when not found), whether it is a raw device punch log
+    ('punch_mode') and the punch log's employee-number column
+    ('punch_id'). 'cached' tells whether the detection was reused from an
+    earlier table with the same header row.
+    """
+    with span('detect_columns', rows=len(df)):
+        schema, cached = detect_schema(df)
+    columns = {key: schema[key] for key in ['name', 'roll', 'date', 'status', 'time']}
+    # Raw device punch logs have timestamps but no status column
+    date_col = columns['date']
+    columns['punch_mode'] = bool(not columns['status'] and date_col is not None
+                                 and looks_like_punch_log(df[date_col]))
+    columns['punch_id'] = (columns['roll'] or find_punch_id_column(df.columns)) if columns['punch_mode'] else None
+    columns['cached'] = cached
+    return columns
+
+
+def missing_columns(columns):
+    """Required columns detect_columns could not find (empty when a report can be built)"""
+    required = ['name', 'date'] if columns['punch_mode'] else ['name', 'date', 'status']
+    return [key for key in required if not columns[key]]
+
+
+def build_attendance_report(df, name_col, date_col, status_col, roll_col=None, duplicates=FIRST):
+    """Pivot raw attendance records into the report layout
+
+    Returns the report as an AttendanceMatrix and a dict of notes for the UI: whether the dates
+    parsed, whether the status column was numeric, and a conversion sample. `duplicates` picks
+    the record kept when a student has several on one day (see attendance_pivot).
+    """
+    # Dates are pivoted as days (so columns sort chronologically) and
+    # labelled MM/DD/YYYY afterwards; unparseable columns keep their values
+    with span('parse_dates', rows=len(df)):
+        dates, dates_parsed = report_dates(df[date_col])
+
+    # Standardize status values - handle numeric values as well
+    # Check if values are numeric (likely student IDs) - convert to P if present, A if missing
+    with span('status_conversion', rows=len(df)):
+        is_numeric = is_numeric_status(df[status_col])
+
+        # Vectorized lookup: Present/Absent, TRUE/FALSE, 1/0 and blanks all map to integer P/A/I/- codes;
+        # other texts keep their own label (not counted as present or absent)
+        other_labels = []
+        codes = status_codes(df[status_col], numeric=is_numeric, other_labels=other_labels)
+
+    conversion_sample = pd.DataFrame({
+        'Original': df[status_col].head(10),
+        'Converted': status_labels(codes[:10], other_labels)
+    })
+
+    # Scatter the integer codes (one byte per cell) straight into the matrix
+    has_roll = bool(roll_col) and roll_col in df.columns
+    keys = pd.DataFrame({'Student Name': df[name_col].to_numpy()})
+    if has_roll:
+        keys.insert(0, 'Roll No', df[roll_col].to_numpy())
+
+    with span('pivot', rows=len(keys)):
+        # Cells without a record are "no data" ('-', counted as absent in totals)
+        students, date_keys, matrix_codes = pivot_codes(keys, dates, codes, policy=duplicates)
+
+    if not has_roll:
+        # Add a roll number column
+        students.insert(0, 'Roll No', range(1, len(students) + 1))
+
+    matrix = AttendanceMatrix(students, date_labels(date_keys), matrix_codes, other_labels)
+
+    notes = {
+        'dates_parsed': dates_parsed,
+        'is_numeric': is_numeric,
+        'conversion_sample': conversion_sample,
+        'other_statuses': other_labels,
+    }
+    return matrix, notes
+
+
+def build_punch_attendance_report(df, name_col, time_col, id_col=None, shift=None, calendar=None):
+    """Build the report from a raw device punch log"""
+    with span('summarize_punches', rows=len(df)):
+        daily = summarize_punches(df, name_col, time_col, id_col=id_col, calendar=calendar, **(shift or {}))
+    with span('punch_report', rows=len(daily)):
+        return punch_matrix(daily), {'daily': daily_summary(daily)}
+
+
+def build_report(df, columns, duplicates=FIRST, shift=None, stream_source=None, calendar=None):
+    """
+    Build the AttendanceMatrix for a records table and its detect_columns()
+    result. Returns (report, notes); notes is None for streamed reports.
+
+    With `stream_source` (the workbook `df` is the first chunk of) the
+    whole file is streamed through attendance_ingest instead of held in
+    memory. `shift` holds the punch-log shift settings. With a `calendar`
+    (attendance_calendar) weekends, holidays and leave are marked and
+    punch logs are judged against each employee's shift.
+    """
+    name_col, date_col, status_col = columns['name'], columns['date'], columns['status']
+    roll_col = columns['roll'] if columns['roll'] in df.columns else None
+    if columns['punch_mode']:
+        id_col = columns['punch_id']
+        if stream_source is not None:
+            df = read_columns_in_chunks(stream_source, [c for c in [name_col, date_col, id_col] if c])
+        report, notes = build_punch_attendance_report(df, name_col, date_col, id_col, shift, calendar)
+    elif stream_source is not None:
+        with span('stream_report'):
+            report = stream_attendance_matrix(stream_source, name_col, date_col, status_col, roll_col=roll_col,
+                                              filename=_source_name(stream_source), duplicates=duplicates)
+        notes = None
+    else:
+        report, notes = build_attendance_report(df, name_col, date_col, status_col, roll_col, duplicates)
+    if calendar is not None:
+        with span('apply_calendar', rows=len(report)):
+            report = apply_calendar(report, calendar)
+    return report, notes
+
+
+def create_excel_download(df, filename=None, fast=True, summary=True):
+    """Create the color-coded Excel report in memory (a BytesIO)
+
+    With fast=True the report is streamed through attendance_export using
+    shared named styles; fast=False keeps the original cell-by-cell styling.
+    With summary=True the attendance_summary tables follow as extra sheets.
+    `df` may also be an AttendanceMatrix; `filename` is not used.
+    """
+    extra_sheets = None
+    if summary:
+        with span('summarize_report', rows=len(df)):
+            extra_sheets = summarize_report(df)
+    df = as_report_frame(df)
+    output = io.BytesIO()
+    if fast:
+        write_styled_report(df, output, APP_STATUS_STYLES, extra_sheets=extra_sheets)
+    else:
+        write_classic_report(df, output, APP_STATUS_STYLES, extra_sheets=extra_sheets)
+    output.seek(0)
+    return output
+
+
+def create_report_download(df, fmt='styled'):
+    """
+    The report in memory (a BytesIO) in one of attendance_export.EXPORT_FORMATS:
+    'styled' is create_excel_download's workbook, 'xlsx', 'csv' and
+    'parquet' are written straight from the report's values.
+    """
+    if fmt == 'styled':
+        return create_excel_download(df)
+    output = io.BytesIO()
+    write_report(as_report_frame(df), output, fmt)
+    output.seek(0)
+    return output
+
+
+def find_date_columns(columns):
+    """
+    Pick the columns of a wide attendance sheet that hold daily attendance
+    """
+    # All headers are parsed in one bulk call instead of one pd.to_datetime each
+    return find_header_date_columns(columns)
+
+
+# Wide-sheet cell values mapped to report statuses (compared upper-cased)
+WIDE_STATUS_VALUES = {'P': 'P', 'PRESENT': 'P', 'A': 'A', 'ABSENT': 'A', 'I': 'I', 'INCOMPLETE': 'I'}
+
+# Wide-sheet columns copied into the report's leading columns, with their defaults
+WIDE_LEADING_COLUMNS = [('Roll No', 'Roll', ''), ('Student Name', 'Name', ''),
+                        ('Total Present', 'Present', 0), ('Total Absent', 'Absent', 0)]
+
+
+def _wide_status_labels(values):
+    """Report label of each cell: P/A/I for the known spellings, otherwise the cell as text"""
+    # str() of every cell in one pass, then one lookup per distinct text
+    texts = pd.Series(values, dtype=object).astype(str)
+    codes, uniques = pd.factorize(texts)
+    labels = np.array([WIDE_STATUS_VALUES.get(text.upper(), text) for text in uniques], dtype=object)
+    return labels[codes]
+
+
+def convert_attendance_rows(df, date_columns):
+    """
+    Convert rows of a wide attendance sheet into report rows (P/A/I per date)
+
+    All date columns are mapped at once: the distinct cell values are
+    looked up once each and the labels are scattered back by code.
+    """
+    if not len(df):
+        return pd.DataFrame()
+    # Cells are seen as a row of the whole sheet would hold them: an
+    # all-numeric sheet upcasts every value to the common numeric type
+    row_dtype = df.iloc[:0].to_numpy().dtype
+
+    def cells(column, default):
+        if column not in df.columns:
+            return np.full(len(df), default, dtype=object)
+        values = df[column] if row_dtype == object else df[column].astype(row_dtype)
+        return values.astype(object).to_numpy()
+
+    report = {}
+    for name, column, default in WIDE_LEADING_COLUMNS:
+        report[name] = pd.Series(cells(column, default), dtype=object).infer_objects()
+
+    if date_columns:
+        block = np.column_stack([cells(column, '') for column in date_columns])
+        labels = _wide_status_labels(block.ravel()).reshape(block.shape)
+        for position, column in enumerate(date_columns):
+            report[column] = labels[:, position]
+
+    # Create DataFrame for the report
+    return pd.DataFrame(report)
@@ -0,0 +1,286 @@
+"""
+Bulk date parsing for attendance columns and headers.
+
+Device exports repeat a handful of distinct dates (or timestamps) over
+many rows, in one layout per file. Values are factorized first, the
+layout is inferred once from a sample of the distinct texts and every
+distinct value is parsed with that explicit format; the results are
+broadcast back by code. Timestamps are nearly all distinct, so they are
+split into their date and time of day, which repeat: each half is read
+once per distinct value (with pyarrow's string kernels when installed)
+and anything that doesn't split cleanly is parsed with the whole format.
+Values the format does not fit are parsed on their own, so mixed columns
+still read. Nothing is remembered between
+calls: an ambiguous sample such as '05/01/2025' must read the same way
+no matter which file was parsed before it.
+"""
+import re
+import warnings
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
+
+# Day-only layouts, month-first before day-first like pandas
+DATE_FORMATS = [
+    '%m/%d/%Y',
+    '%d/%m/%Y',
+    '%Y-%m-%d',
+    '%Y/%m/%d',
+    '%d-%m-%Y',
+    '%m-%d-%Y',
+    '%d.%m.%Y',
+    '%d-%b-%Y',
+    '%d %b %Y',
+    '%b %d, %Y',
+]
+
+# Timestamp layouts seen in device exports, e.g. '5/1/2025 7:59:42 PM'
+DATETIME_FORMATS = [
+    '%m/%d/%Y %I:%M:%S %p',
+    '%m/%d/%Y %I:%M %p',
+    '%Y-%m-%d %H:%M:%S',
+    '%d/%m/%Y %H:%M:%S',
+    '%m/%d/%Y %H:%M:%S',
+    '%d/%m/%Y %H:%M',
+    '%m/%d/%Y %H:%M',
+    '%Y-%m-%d %H:%M',
+    '%Y-%m-%dT%H:%M:%S',
+]
+
+# Date column labels in the report
+REPORT_DATE_FORMAT = '%m/%d/%Y'
+
+DEFAULT_SAMPLE_SIZE = 200
+
+# Time-of-day halves of DATETIME_FORMATS read without strptime, as
+# patterns with hour, minute and (when the layout has them) second and
+# meridiem groups
+_TIME_PATTERNS = {
+    '%I:%M:%S %p': r'(?P<hour>[0-9]{1,2}):(?P<minute>[0-9]{1,2}):(?P<second>[0-9]{1,2})\s+(?P<meridiem>[AaPp][Mm])',
+    '%I:%M %p': r'(?P<hour>[0-9]{1,2}):(?P<minute>[0-9]{1,2})\s+(?P<meridiem>[AaPp][Mm])',
+    '%H:%M:%S': r'(?P<hour>[0-9]{1,2}):(?P<minute>[0-9]{1,2}):(?P<second>[0-9]{1,2})',
+    '%H:%M': r'(?P<hour>[0-9]{1,2}):(?P<minute>[0-9]{1,2})',
+}
+
+# Fewer distinct timestamps than this are parsed whole
+SPLIT_MIN_VALUES = 1000
+
+_NAT = np.datetime64('NaT', 'ns')
+
+def _parsed_count(texts, fmt):
+    return int(pd.to_datetime(texts, format=fmt, errors='coerce').notna().sum())
+
+
+def infer_date_format(texts, sample_size=DEFAULT_SAMPLE_SIZE):
+    """
+    The format that reads the most of a sample of the given strings (the
+    first in DATE_FORMATS + DATETIME_FORMATS on ties, so dates that read
+    either way are month-first), or None when none reads any.
+    """
+    return _infer_distinct(pd.unique(pd.Series(texts, dtype=object).dropna()), sample_size)
+
+
+def _infer_distinct(texts, sample_size=DEFAULT_SAMPLE_SIZE):
+    """infer_date_format for strings that are already distinct"""
+    if len(texts) > sample_size:
+        texts = texts[np.linspace(0, len(texts) - 1, sample_size).astype(np.int64)]
+    texts = pd.Index(texts, dtype=object).str.strip()
+    texts = texts[texts != '']
+    if not len(texts):
+        return None
+
+    best, best_count = None, 0
+    for fmt in DATE_FORMATS + DATETIME_FORMATS:
+        count = _parsed_count(texts, fmt)
+        if count > best_count:
+            best, best_count = fmt, count
+            if count == len(texts):
+                break
+    return best
+
+
+def _timestamp_parts(fmt):
+    """(separator, date format, time format) of a timestamp layout read in two halves, or None"""
+    for separator in (' ', 'T'):
+        date_format, found, time_format = fmt.partition(separator)
+        if found and time_format in _TIME_PATTERNS:
+            return separator, date_format, time_format
+    return None
+
+
+def _arrow_compute():
+    """(pyarrow, pyarrow.compute), or None when pyarrow is not installed"""
+    try:
+        import pyarrow as pa
+        import pyarrow.compute as pc
+    except ImportError:
+        return None
+    return pa, pc
+
+
+def _split_halves(texts, separator):
+    """
+    Factorized halves of each text around its first separator: (codes,
+    distinct values) before it and after it ('' when it has none)
+    """
+    arrow = _arrow_compute()
+    if arrow is None:
+        halves = [text.partition(separator) for text in texts]
+        return (pd.factorize(np.array([half[0] for half in halves], dtype=object)),
+                pd.factorize(np.array([half[2] for half in halves], dtype=object)))
+    # Arrow's string kernels split and encode without a Python call per text
+    pa, pc = arrow
+    texts = pa.array(texts, type=pa.string())
+    split = pc.match_substring(texts, separator)
+    if not pc.all(split).as_py():
+        texts = pc.if_else(split, texts, pc.binary_join_element_wise(texts, separator, ''))
+    parts = pc.split_pattern(texts, separator, max_splits=1)
+    encoded = [pc.list_element(parts, i).dictionary_encode() for i in (0, 1)]
+    return [(np.asarray(half.indices, dtype=np.int64), half.dictionary.to_numpy(zero_copy_only=False))
+            for half in encoded]
+
+
+def _time_fields(texts, pattern):
+    """
+    Named groups of `pattern` matched against the whole of each text:
+    floats for numbers, upper-cased text for 'meridiem'; NaN / None where
+    the text doesn't match
+    """
+    names = list(re.compile(pattern).groupindex)
+    arrow = _arrow_compute()
+    if arrow is None:
+        match = re.compile(pattern).fullmatch
+        found = [match(text) for text in texts]
+        columns = {name: pd.Series([hit.group(name) if hit else None for hit in found], dtype=object)
+                   for name in names}
+        return {name: column.str.upper().to_numpy(dtype=object) if name == 'meridiem'
+                else pd.to_numeric(column).to_numpy(float) for name, column in columns.items()}
+    pa, pc = arrow
+    matched = pc.extract_regex(pa.array(texts, type=pa.string()), f'^{pattern}$')
+    return {name: pc.utf8_upper(values).to_numpy(zero_copy_only=False) if name == 'meridiem'
+            else pc.cast(values, pa.float64()).to_numpy(zero_copy_only=False)
+            for name, values in zip(names, matched.flatten())}
+
+
+def _time_of_day(texts, time_format):
+    """
+    Time of day (timedelta64[ns]) of distinct time texts, NaT where they
+    don't fit the layout exactly as strptime would read it
+    """
+    fields = _time_fields(texts, _TIME_PATTERNS[time_format])
+    hours, minutes = fields['hour'], fields['minute']
+    seconds = fields.get('second', np.zeros(len(hours)))
+    if 'meridiem' in fields:
+        fits = (hours >= 1) & (hours <= 12)
+        hours = hours % 12 + np.where(fields['meridiem'] == 'PM', 12, 0)
+    else:
+        fits = hours < 24
+    fits &= (minutes < 60) & (seconds < 60)
+    total = np.where(fits, (hours * 60 + minutes) * 60 + seconds, np.nan)
+    return pd.to_timedelta(total, unit='s').to_numpy('timedelta64[ns]')
+
+
+def _parse_with_format(texts, fmt):
+    """Parse distinct strings with one explicit format (NaT where it doesn't fit)"""
+    parts = _timestamp_parts(fmt)
+    if parts is None or len(texts) < SPLIT_MIN_VALUES:
+        return pd.to_datetime(texts, format=fmt, errors='coerce').to_numpy('datetime64[ns]')
+    # Nearly every timestamp of a punch log is distinct, but they share a
+    # few days and at most 86,400 times of day: each half is parsed once per
+    # distinct value, and only texts that don't split cleanly go to strptime
+    separator, date_format, time_format = parts
+    (date_codes, date_texts), (time_codes, time_texts) = _split_halves(texts.to_numpy(), separator)
+    days = pd.to_datetime(pd.Series(date_texts, dtype=object), format=date_format,
+                          errors='coerce').to_numpy('datetime64[ns]')
+    parsed = days[date_codes] + _time_of_day(time_texts, time_format)[time_codes]
+    rest = np.isnat(parsed)
+    if rest.any():
+        parsed[rest] = pd.to_datetime(texts[rest], format=fmt, errors='coerce').to_numpy('datetime64[ns]')
+    return parsed
+
+
+def _parse_texts(texts):
+    """Parse distinct strings with the format inferred from a sample of them"""
+    texts = pd.Series(texts, dtype=object)
+    fmt = _infer_distinct(texts.to_numpy())
+    parsed = np.full(len(texts), _NAT)
+    if fmt is not None:
+        parsed = _parse_with_format(texts, fmt)
+    rest = np.isnat(parsed)
+    if rest.any():
+        # Padded values and values in another layout are parsed on their own
+        stripped = texts[rest].str.strip()
+        retry = np.full(len(stripped), _NAT)
+        if fmt is not None:
+            retry = pd.to_datetime(stripped, format=fmt, errors='coerce').to_numpy('datetime64[ns]')
+        other = np.isnat(retry) & (stripped != '').to_numpy()
+        if other.any():
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore', UserWarning)
+                retry[other] = pd.to_datetime(stripped[other], errors='coerce',
+                                              format='mixed').to_numpy('datetime64[ns]')
+        parsed[rest] = retry
+    return parsed
+
+
+def _parse_uniques(uniques):
+    """Parse distinct values to a datetime64[ns] array (NaT where they don't read as a date)"""
+    uniques = np.asarray(uniques, dtype=object)
+    if pd.api.types.infer_dtype(uniques, skipna=True) == 'string':
+        return _parse_texts(uniques)
+    parsed = np.full(len(uniques), _NAT)
+    is_text = np.fromiter((isinstance(value, str) for value in uniques), dtype=bool, count=len(uniques))
+    is_stamp = np.fromiter((isinstance(value, (datetime, date, np.datetime64)) for value in uniques),
+                           dtype=bool, count=len(uniques))
+    if is_stamp.any():
+        parsed[is_stamp] = pd.to_datetime(pd.Series(uniques[is_stamp]), errors='coerce').to_numpy('datetime64[ns]')
+    if is_text.any():
+        parsed[is_text] = _parse_texts(uniques[is_text])
+    return parsed
+
+
+def parse_dates(values):
+    """
+    Parse values as dates (a datetime64 Series aligned with `values`), NaT
+    where they don't read as one. Numbers are never read as dates.
+    """
+    values = pd.Series(values)
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values
+    codes, uniques = pd.factorize(values)
+    # Code -1 (missing) picks the trailing NaT
+    parsed = np.append(_parse_uniques(uniques), _NAT)
+    return pd.Series(parsed[codes], index=values.index)
+
+
+def report_dates(values):
+    """
+    The day of each value, for the report's date columns, and whether
+    they parsed: when any value that is not blank fails to read as a date,
+    the values are returned unchanged instead.
+    """
+    values = pd.Series(values)
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values.dt.normalize(), True
+    codes, uniques = pd.factorize(values)
+    parsed = _parse_uniques(uniques)
+    failed = np.asarray(uniques, dtype=object)[np.isnat(parsed)]
+    if any(not isinstance(value, str) or value.strip() for value in failed):
+        return values, False
+    days = np.append(parsed.astype('datetime64[D]').astype('datetime64[ns]'), _NAT)
+    return pd.Series(days[codes], index=values.index), True
+
+
+def date_labels(keys):
+    """Report labels for date keys: dates as MM/DD/YYYY, anything else unchanged"""
+    return [key.strftime(REPORT_DATE_FORMAT) if isinstance(key, (datetime, date)) else key for key in keys]
+
+
+def report_label_days(labels):
+    """
+    The days of report date labels (REPORT_DATE_FORMAT), NaT for other
+    labels. The layout is fixed, so nothing is inferred.
+    """
+    labels = pd.Series(list(labels), dtype=object)
+    return pd.to_datetime(labels.astype(str), format=REPORT_DATE_FORMAT, errors='coerce')
@@ -0,0 +1,459 @@
+"""
+Fast styled Excel export for attendance reports.
+
+The workbook is written with openpyxl's write-only (streaming) mode.
+Styles are registered once as named styles and every distinct cell value
+in the attendance columns gets a single pre-styled prototype cell that is
+reused for all of its occurrences, so no per-cell Font/PatternFill/
+Alignment objects are created. Column widths are computed from the
+DataFrame's distinct values instead of scanning the finished worksheet.
+
+For downstream systems that re-parse the report, the same rows can be
+written unstyled as CSV, Parquet or a plain .xlsx. The plain workbook's
+sheet XML is rendered once per distinct value and streamed row by row
+into the zip, without openpyxl cell objects, so memory stays flat.
+"""
+import os
+import re
+import zipfile
+from collections import namedtuple
+from contextlib import nullcontext
+from xml.sax.saxutils import escape, quoteattr
+
+import numpy as np
+import pandas as pd
+
+# Status colors as (fill, font color, bold)
+APP_STATUS_STYLES = {
+    'P': ('d4edda', '155724', True),
+    'A': ('f8d7da', '721c24', True),
+    'I': ('fff3cd', '856404', True),
+    'L': ('cfe2ff', '084298', True),
+    'H': ('e2d9f3', '432874', True),
+    'W': ('d1ecf1', '0c5460', True),
+    '-': ('e2e3e5', '383d41', True),
+}
+
+CONVERTER_STATUS_STYLES = {
+    'P': ('C6EFCE', '006100', False),
+    'A': ('FFC7CE', '9C0006', False),
+    'I': ('FFEB9C', '9C5700', False),
+    'L': ('BDD7EE', '1F4E78', False),
+    'H': ('E4DFEC', '60497A', False),
+    'W': ('D9D9D9', '404040', False),
+}
+
+HEADER_FILL = '4472C4'
+
+# Columns up to this one (Roll No, Name, totals) are not centered
+LEADING_COLUMNS = 4
+
+MAX_COLUMN_WIDTH = 20
+
+ExportFormat = namedtuple('ExportFormat', 'label suffix mime')
+
+# Report formats by name; `suffix` replaces the extension of the report path
+EXPORT_FORMATS = {
+    'styled': ExportFormat('Excel (color-coded)', '.xlsx',
+                           'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'),
+    'xlsx': ExportFormat('Excel (plain)', '_plain.xlsx',
+                         'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'),
+    'csv': ExportFormat('CSV', '.csv', 'text/csv'),
+    'parquet': ExportFormat('Parquet', '.parquet', 'application/vnd.apache.parquet'),
+}
+DEFAULT_FORMAT = 'styled'
+
+# Rows rendered and written at a time by the plain .xlsx writer
+XLSX_BLOCK_ROWS = 2000
+
+
+def column_widths(df, max_width=MAX_COLUMN_WIDTH):
+    """
+    Column widths as the classic export sizes them: longest value
+    (header included) plus 2, capped at `max_width`.
+    """
+    widths = []
+    for position, col in enumerate(df.columns):
+        values = pd.Series(pd.unique(df.iloc[:, position].dropna()), dtype=object)
+        longest = len(str(col))
+        if len(values):
+            longest = max(longest, int(values.astype(str).str.len().max()))
+        widths.append(min(longest + 2, max_width))
+    return widths
+
+
+def _register_styles(workbook, status_styles):
+    """Add the header, centered and status named styles to a workbook"""
+    from openpyxl.styles import Alignment, Border, Font, NamedStyle, PatternFill, Side
+    from openpyxl.styles.borders import DEFAULT_BORDER
+    from openpyxl.styles.fonts import DEFAULT_FONT
+
+    center = Alignment(horizontal='center', vertical='center')
+    thin = Side(style='thin')
+
+    workbook.add_named_style(NamedStyle(
+        name='Attendance Header',
+        font=Font(bold=True, color="FFFFFF"),
+        fill=PatternFill(start_color=HEADER_FILL, end_color=HEADER_FILL, fill_type="solid"),
+        border=Border(left=thin, right=thin, top=thin, bottom=thin),
+        alignment=center,
+    ))
+    workbook.add_named_style(NamedStyle(name='Attendance Cell', font=DEFAULT_FONT, border=DEFAULT_BORDER, alignment=center))
+
+    names = {}
+    for value, (fill, color, bold) in status_styles.items():
+        name = f'Attendance {value}'
+        workbook.add_named_style(NamedStyle(
+            name=name,
+            font=Font(color=color, bold=bold),
+            fill=PatternFill(start_color=fill, end_color=fill, fill_type="solid"),
+            border=DEFAULT_BORDER,
+            alignment=center,
+        ))
+        names[value] = name
+    return names
+
+
+def _styled_cell(worksheet, value, style):
+    """Create a write-only cell carrying a named style"""
+    from openpyxl.cell import WriteOnlyCell
+
+    cell = WriteOnlyCell(worksheet, value=value)
+    cell.style = style
+    return cell
+
+
+def write_styled_report(df, output, status_styles=APP_STATUS_STYLES, sheet_name='Attendance Report',
+                        extra_sheets=None):
+    """
+    Write a color-coded attendance report to `output` (path or file-like).
+
+    Produces the same look as the classic cell-by-cell styling: blue bold
+    header, status fills/fonts from `status_styles` and centered values
+    after the first four columns. `extra_sheets` maps sheet names to
+    further tables (e.g. attendance_summary) written after the report.
+    """
+    return write_styled_chunks([df], output, list(df.columns), column_widths(df),
+                               status_styles=status_styles, sheet_name=sheet_name, extra_sheets=extra_sheets)
+
+
+def write_classic_report(df, output, status_styles=APP_STATUS_STYLES, sheet_name='Attendance Report',
+                         extra_sheets=None):
+    """
+    The original cell-by-cell styling: the sheet is written with
+    pandas.to_excel and every cell is then sized, filled and aligned
+    individually. Much slower than write_styled_report; kept as the
+    reference look.
+    """
+    from openpyxl.styles import Alignment, Font, PatternFill
+
+    with pd.ExcelWriter(output, engine='openpyxl') as writer:
+        df.to_excel(writer, sheet_name=sheet_name, index=False)
+        for name, table in (extra_sheets or {}).items():
+            table.to_excel(writer, sheet_name=name, index=False)
+        worksheet = writer.sheets[sheet_name]
+
+        # Every sheet (the report and the extra tables) gets sized columns and the header style
+        header_font = Font(bold=True, color="FFFFFF")
+        header_fill = PatternFill(start_color=HEADER_FILL, end_color=HEADER_FILL, fill_type="solid")
+        for sheet in writer.sheets.values():
+            # Auto-adjust column widths
+            for column in sheet.columns:
+                max_length = 0
+                column_letter = column[0].column_letter
+                for cell in column:
+                    try:
+                        if cell.value is not None and len(str(cell.value)) > max_length:
+                            max_length = len(str(cell.value))
+                    except:
+                        pass
+                sheet.column_dimensions[column_letter].width = min(max_length + 2, MAX_COLUMN_WIDTH)
+
+            for cell in sheet[1]:
+                cell.font = header_font
+                cell.fill = header_fill
+                cell.alignment = Alignment(horizontal='center', vertical='center')
+
+        # Color code attendance cells
+        for row in worksheet.iter_rows(min_row=2, max_row=worksheet.max_row):
+            for cell in row:
+                if cell.value in status_styles:
+                    fill, color, bold = status_styles[cell.value]
+                    cell.fill = PatternFill(start_color=fill, end_color=fill, fill_type="solid")
+                    cell.font = Font(color=color, bold=bold)
+                if cell.column > LEADING_COLUMNS:
+                    cell.alignment = Alignment(horizontal='center', vertical='center')
+    return output
+
+
+def write_styled_chunks(chunks, output, columns, widths, status_styles=APP_STATUS_STYLES,
+                        sheet_name='Attendance Report', extra_sheets=None):
+    """
+    Stream report chunks (DataFrames sharing `columns`) into one styled sheet.
+
+    Column `widths` must be known up front because they are written before
+    the first row; only one chunk has to be in memory at a time.
+    `extra_sheets` (sheet name -> DataFrame) follow with the same header
+    style and plain values.
+    """
+    from openpyxl import Workbook
+    from openpyxl.utils import get_column_letter
+
+    workbook = Workbook(write_only=True)
+    worksheet = workbook.create_sheet(sheet_name)
+    style_names = _register_styles(workbook, status_styles)
+
+    for position, width in enumerate(widths, 1):
+        worksheet.column_dimensions[get_column_letter(position)].width = width
+
+    worksheet.append([_styled_cell(worksheet, col, 'Attendance Header') for col in columns])
+
+    try:
+        for df in chunks:
+            _append_rows(worksheet, df, style_names)
+    except BaseException:
+        # Finish the sheet's temporary file now rather than when it is garbage collected
+        worksheet.close()
+        raise
+
+    for name, table in (extra_sheets or {}).items():
+        _append_table(workbook, name, table)
+
+    workbook.save(output)
+    return output
+
+
+def _append_table(workbook, sheet_name, df):
+    """Add a sheet holding `df` with the report's header style and sized columns"""
+    from openpyxl.utils import get_column_letter
+
+    worksheet = workbook.create_sheet(sheet_name[:31])
+    for position, width in enumerate(column_widths(df), 1):
+        worksheet.column_dimensions[get_column_letter(position)].width = width
+    worksheet.append([_styled_cell(worksheet, col, 'Attendance Header') for col in df.columns])
+    columns = [df.iloc[:, position].astype(object).where(df.iloc[:, position].notna(), None).tolist()
+               for position in range(len(df.columns))]
+    for row in zip(*columns):
+        worksheet.append(row)
+
+
+def _append_rows(worksheet, df, style_names):
+    """Append the rows of one DataFrame using shared prototype cells"""
+    leading = min(LEADING_COLUMNS, len(df.columns))
+    leading_values = [
+        df.iloc[:, position].astype(object).where(df.iloc[:, position].notna(), None).tolist()
+        for position in range(leading)
+    ]
+
+    # One shared prototype cell per distinct attendance value
+    attendance = df.iloc[:, leading:].to_numpy(dtype=object)
+    flat_codes, uniques = pd.factorize(attendance.ravel())
+    prototypes = np.empty(len(uniques) + 1, dtype=object)
+    for i, value in enumerate(uniques):
+        style = style_names.get(value, 'Attendance Cell') if isinstance(value, str) else 'Attendance Cell'
+        prototypes[i] = _styled_cell(worksheet, value, style)
+    prototypes[-1] = _styled_cell(worksheet, None, 'Attendance Cell')  # NaN -> empty, still centered
+    attendance_cells = prototypes[flat_codes].reshape(attendance.shape)
+
+    for row_index in range(len(df)):
+        row = [values[row_index] for values in leading_values]
+        row.extend(attendance_cells[row_index])
+        worksheet.append(row)
+
+
+def export_path(output_file_path, fmt):
+    """The path a report in format `fmt` is saved to, next to `output_file_path`"""
+    return os.path.splitext(output_file_path)[0] + EXPORT_FORMATS[fmt].suffix
+
+
+def write_report(df, output, fmt=DEFAULT_FORMAT, status_styles=APP_STATUS_STYLES, sheet_name='Attendance Report'):
+    """Write a report DataFrame to `output` (path or file-like) in one of EXPORT_FORMATS"""
+    widths = column_widths(df) if fmt == 'styled' else None
+    return write_report_chunks([df], output, list(df.columns), fmt, widths, status_styles, sheet_name)
+
+
+def write_report_chunks(chunks, output, columns, fmt=DEFAULT_FORMAT, widths=None, status_styles=APP_STATUS_STYLES,
+                        sheet_name='Attendance Report'):
+    """
+    Stream report chunks into one file of format `fmt`. `widths` is only
+    used (and required) by the styled workbook.
+    """
+    if fmt == 'styled':
+        return write_styled_chunks(chunks, output, columns, widths, status_styles, sheet_name)
+    if fmt == 'xlsx':
+        return write_plain_xlsx_chunks(chunks, output, columns, sheet_name)
+    if fmt == 'csv':
+        return write_csv_chunks(chunks, output, columns)
+    if fmt == 'parquet':
+        return write_parquet_chunks(chunks, output, columns)
+    raise ValueError(f"Unknown export format {fmt!r}; expected one of {', '.join(EXPORT_FORMATS)}")
+
+
+def _binary_output(output):
+    """Open a path for writing; file-like outputs are used as they are"""
+    if isinstance(output, (str, os.PathLike)):
+        return open(output, 'wb')
+    return nullcontext(output)
+
+
+def write_csv_chunks(chunks, output, columns):
+    """Write report chunks as one UTF-8 CSV with a single header row"""
+    with _binary_output(output) as handle:
+        handle.write(pd.DataFrame(columns=columns).to_csv(index=False).encode('utf-8'))
+        for df in chunks:
+            handle.write(df.to_csv(index=False, header=False).encode('utf-8'))
+    return output
+
+
+def _parquet_table(df, schema=None):
+    """A pyarrow table for a report chunk; mixed-type columns (e.g. Roll No) are stored as text"""
+    import pyarrow as pa
+
+    df = df.copy(deep=False)
+    for col in df.columns[df.dtypes == object]:
+        if pd.api.types.infer_dtype(df[col], skipna=True) not in ('string', 'empty'):
+            df[col] = df[col].where(df[col].isna(), df[col].astype(str))
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    return table if schema is None else table.cast(schema)
+
+
+def write_parquet_chunks(chunks, output, columns):
+    """Write report chunks as one Parquet file (the schema is taken from the first chunk)"""
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ValueError("Parquet export needs pyarrow (pip install pyarrow)") from None
+
+    writer = None
+    try:
+        for df in chunks:
+            table = _parquet_table(df[columns], writer.schema if writer is not None else None)
+            if writer is None:
+                writer = pq.ParquetWriter(output, table.schema)
+            writer.write_table(table)
+        if writer is None:
+            pq.write_table(_parquet_table(pd.DataFrame(columns=columns)), output)
+    finally:
+        if writer is not None:
+            writer.close()
+    return output
+
+
+_MAIN_NS = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+_REL_NS = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+_XML_HEADER = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+
+_PLAIN_PARTS = {
+    '[Content_Types].xml': (
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '<Override PartName="/xl/styles.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+        '<Override PartName="/xl/sharedStrings.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sharedStrings+xml"/>'
+        '</Types>'),
+    '_rels/.rels': (
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        f'<Relationship Id="rId1" Type="{_REL_NS}/officeDocument" Target="xl/workbook.xml"/>'
+        '</Relationships>'),
+    'xl/_rels/workbook.xml.rels': (
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        f'<Relationship Id="rId1" Type="{_REL_NS}/worksheet" Target="worksheets/sheet1.xml"/>'
+        f'<Relationship Id="rId2" Type="{_REL_NS}/styles" Target="styles.xml"/>'
+        f'<Relationship Id="rId3" Type="{_REL_NS}/sharedStrings" Target="sharedStrings.xml"/>'
+        '</Relationships>'),
+    'xl/styles.xml': (
+        f'<styleSheet xmlns="{_MAIN_NS}">'
+        '<fonts count="1"><font><sz val="11"/><name val="Calibri"/></font></fonts>'
+        '<fills count="2"><fill><patternFill patternType="none"/></fill>'
+        '<fill><patternFill patternType="gray125"/></fill></fills>'
+        '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+        '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+        '<cellXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/></cellXfs>'
+        '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+        '</styleSheet>'),
+}
+
+# Characters XML 1.0 does not allow, even escaped
+_ILLEGAL_XML = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+
+def _xml_text(value):
+    return escape(_ILLEGAL_XML.sub('', str(value)))
+
+
+class _SharedStrings:
+    """The workbook's shared string table, filled as cells are rendered"""
+
+    def __init__(self):
+        self.index = {}
+
+    def cell(self, text):
+        position = self.index.setdefault(text, len(self.index))
+        return f'<c t="s"><v>{position}</v></c>'
+
+    def xml(self):
+        items = ''.join(f'<si><t xml:space="preserve">{_xml_text(text)}</t></si>' for text in self.index)
+        return f'{_XML_HEADER}<sst xmlns="{_MAIN_NS}" uniqueCount="{len(self.index)}">{items}</sst>'
+
+
+def _cell_xml(value, strings):
+    """The <c> element for one value (no cell reference: cells follow each other)"""
+    if isinstance(value, (bool, np.bool_)):
+        return f'<c t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, (int, float, np.integer, np.floating)):
+        if np.isfinite(value):
+            return f'<c><v>{value!r}</v></c>' if isinstance(value, float) else f'<c><v>{int(value)}</v></c>'
+        return '<c/>'
+    return strings.cell(str(value))
+
+
+def _rendered_rows(values, first_row, strings, rendered):
+    """
+    Sheet XML rows for a 2-D object array: each distinct value is rendered
+    once (cached in `rendered`) and broadcast to its cells.
+    """
+    codes, uniques = pd.factorize(values.ravel())
+    cells = np.empty(len(uniques) + 1, dtype=object)
+    for i, value in enumerate(uniques):
+        key = (type(value), value)
+        if key not in rendered:
+            rendered[key] = _cell_xml(value, strings)
+        cells[i] = rendered[key]
+    cells[-1] = '<c/>'  # NaN / None
+    grid = cells[codes].reshape(values.shape)
+    return ''.join(f'<row r="{first_row + i}">{"".join(row)}</row>' for i, row in enumerate(grid.tolist()))
+
+
+def write_plain_xlsx_chunks(chunks, output, columns, sheet_name='Attendance Report'):
+    """
+    Stream report chunks into an unstyled .xlsx: values only, strings in
+    a shared table. Rows are rendered and written XLSX_BLOCK_ROWS at a time.
+    """
+    strings = _SharedStrings()
+    rendered = {}
+    with zipfile.ZipFile(output, 'w', zipfile.ZIP_DEFLATED, compresslevel=1) as archive:
+        for name, xml in _PLAIN_PARTS.items():
+            archive.writestr(name, _XML_HEADER + xml)
+        archive.writestr('xl/workbook.xml',
+                         f'{_XML_HEADER}<workbook xmlns="{_MAIN_NS}" xmlns:r="{_REL_NS}"><sheets>'
+                         f'<sheet name={quoteattr(sheet_name[:31])} sheetId="1" r:id="rId1"/></sheets></workbook>')
+        with archive.open('xl/worksheets/sheet1.xml', 'w') as sheet:
+            sheet.write(f'{_XML_HEADER}<worksheet xmlns="{_MAIN_NS}"><sheetData>'.encode('utf-8'))
+            header = np.array(list(columns), dtype=object).reshape(1, -1)
+            sheet.write(_rendered_rows(header, 1, strings, rendered).encode('utf-8'))
+            row = 2
+            for df in chunks:
+                values = df[columns].to_numpy(dtype=object)
+                for start in range(0, len(values), XLSX_BLOCK_ROWS):
+                    block = values[start:start + XLSX_BLOCK_ROWS]
+                    sheet.write(_rendered_rows(block, row, strings, rendered).encode('utf-8'))
+                    row += len(block)
+            sheet.write(b'</sheetData></worksheet>')
+        archive.writestr('xl/sharedStrings.xml', strings.xml())
+    return output
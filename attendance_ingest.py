@@ -0,0 +1,371 @@
+"""
+Chunked ingestion for large ZKTeco .xls/.xlsx exports.
+
+Rows are read incrementally (openpyxl read-only iteration for .xlsx,
+xlrd on-demand sheets for .xls) and handed out as typed DataFrame chunks,
+so the whole workbook never has to be materialised as one DataFrame.
+PivotAccumulator folds those chunks into the Name x Date status matrix;
+its memory grows with students x dates, not with the number of punches.
+"""
+import io
+import os
+from datetime import time
+
+import numpy as np
+import pandas as pd
+
+from attendance_dates import date_labels, report_dates
+from attendance_status import NO_DATA, STATUS_RANK, is_numeric_status, status_codes
+from attendance_matrix import AttendanceMatrix
+from attendance_pivot import BEST, DUPLICATE_POLICIES, FIRST
+
+DEFAULT_CHUNK_ROWS = 5000
+
+# Marks matrix cells no record has reached yet
+_UNSET = 255
+
+# STATUS_RANK for matrix cells: an unset cell ranks below all codes
+_CELL_RANK = STATUS_RANK.copy()
+_CELL_RANK[_UNSET] = -1
+
+
+def excel_engine(filename):
+    """Pick the pandas/reader engine from a file name ('xlrd', 'openpyxl' or None)"""
+    extension = os.path.splitext(str(filename))[1].lower()
+    if extension == '.xls':
+        return 'xlrd'
+    if extension in ['.xlsx', '.xlsm']:
+        return 'openpyxl'
+    return None
+
+
+def _rewind(source):
+    """Seek file-like sources back to the start so they can be read again"""
+    if hasattr(source, 'seek'):
+        source.seek(0)
+
+
+def _iter_xlsx_rows(source, sheet):
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(source, read_only=True, data_only=True)
+    try:
+        worksheet = workbook.worksheets[sheet]
+        for row in worksheet.iter_rows(values_only=True):
+            yield row
+    finally:
+        workbook.close()
+
+
+def _xls_cell(value, cell_type, datemode):
+    """Convert an xlrd cell the same way pandas.read_excel does"""
+    from xlrd import XL_CELL_BOOLEAN, XL_CELL_DATE, XL_CELL_ERROR, XL_CELL_NUMBER, xldate
+
+    if cell_type == XL_CELL_NUMBER:
+        as_int = int(value)
+        return as_int if as_int == value else value
+    if cell_type == XL_CELL_DATE:
+        try:
+            value = xldate.xldate_as_datetime(value, datemode)
+        except OverflowError:
+            return value
+        # Dates on the epoch are time-only values
+        if value.timetuple()[0:3] in [(1899, 12, 31), (1904, 1, 1)]:
+            return time(value.hour, value.minute, value.second, value.microsecond)
+        return value
+    if cell_type == XL_CELL_BOOLEAN:
+        return bool(value)
+    if cell_type == XL_CELL_ERROR:
+        return np.nan
+    return value
+
+
+def _iter_xls_rows(source, sheet):
+    import xlrd
+
+    # xlrd reports recoverable oddities of device exports (missing CODEPAGE,
+    # BIFF versions without on-demand support) on stdout; keep them quiet
+    options = dict(on_demand=True, logfile=io.StringIO())
+    if hasattr(source, 'read'):
+        book = xlrd.open_workbook(file_contents=source.read(), **options)
+    else:
+        book = xlrd.open_workbook(source, **options)
+    try:
+        worksheet = book.sheet_by_index(sheet)
+        for i in range(worksheet.nrows):
+            yield [
+                _xls_cell(value, cell_type, book.datemode)
+                for value, cell_type in zip(worksheet.row_values(i), worksheet.row_types(i))
+            ]
+    finally:
+        book.release_resources()
+
+
+def iter_excel_rows(source, filename=None, sheet=0):
+    """
+    Yield the raw rows of one sheet (header included), skipping blank rows.
+
+    `source` is a path or a file-like object; `filename` is used to pick
+    the reader when `source` has no usable name. Unknown extensions try
+    openpyxl first and fall back to xlrd, like the rest of the app.
+    """
+    engine = excel_engine(filename or getattr(source, 'name', source))
+    _rewind(source)
+    if engine is None:
+        try:
+            rows = _iter_xlsx_rows(source, sheet)
+            first = next(rows)
+        except Exception:
+            _rewind(source)
+            rows = _iter_xls_rows(source, sheet)
+            first = next(rows, None)
+        if first is None:
+            return
+        rows = _chain_first(first, rows)
+    elif engine == 'xlrd':
+        rows = _iter_xls_rows(source, sheet)
+    else:
+        rows = _iter_xlsx_rows(source, sheet)
+
+    for row in rows:
+        if all(value is None or value == '' for value in row):
+            continue
+        yield row
+
+
+def _chain_first(first, rows):
+    yield first
+    yield from rows
+
+
+def _header_names(row):
+    """Column names from a header row, labelled and de-duplicated like pandas"""
+    names = []
+    seen = {}
+    for i, value in enumerate(row):
+        name = f'Unnamed: {i}' if value is None or value == '' else value
+        if name in seen:
+            seen[name] += 1
+            name = f'{name}.{seen[name]}'
+        else:
+            seen[name] = 0
+        names.append(name)
+    return names
+
+
+def _to_frame(rows, columns):
+    """Build a typed chunk: blanks become NaN and dtypes are inferred"""
+    width = len(columns)
+    rows = [list(row[:width]) + [None] * (width - len(row)) for row in rows]
+    chunk = pd.DataFrame(rows, columns=columns).replace({'': np.nan, None: np.nan}).infer_objects()
+
+    # Legacy exports store numbers as text; convert columns that are
+    # entirely numeric, as pandas' parser does
+    for col in chunk.columns[(chunk.dtypes == object).to_numpy()]:
+        try:
+            chunk[col] = pd.to_numeric(chunk[col])
+        except (ValueError, TypeError):
+            pass
+    return chunk
+
+
+def iter_excel_chunks(source, filename=None, chunk_rows=DEFAULT_CHUNK_ROWS, sheet=0):
+    """Yield a sheet as DataFrames of at most `chunk_rows` rows each"""
+    rows = iter_excel_rows(source, filename=filename, sheet=sheet)
+    header = next(rows, None)
+    if header is None:
+        return
+    columns = _header_names(header)
+
+    buffer = []
+    for row in rows:
+        buffer.append(row)
+        if len(buffer) >= chunk_rows:
+            yield _to_frame(buffer, columns)
+            buffer = []
+    if buffer:
+        yield _to_frame(buffer, columns)
+
+
+def read_excel_head(source, filename=None, rows=DEFAULT_CHUNK_ROWS, sheet=0):
+    """Read only the first `rows` data rows (for previews and column detection)"""
+    chunk = next(iter_excel_chunks(source, filename=filename, chunk_rows=rows, sheet=sheet), None)
+    _rewind(source)
+    return chunk if chunk is not None else pd.DataFrame()
+
+
+def _sorted_order(keys, columns):
+    """Positions that sort `keys` the way pivot_table orders its axes"""
+    frame = pd.DataFrame(keys, columns=columns)
+    try:
+        return frame.sort_values(columns, kind='stable').index.to_numpy()
+    except TypeError:
+        return np.arange(len(keys))
+
+
+class PivotAccumulator:
+    """
+    Incremental pivot of (student, date) -> status code.
+
+    Feed it chunks with add(); report() returns the same Roll No / Student
+    Name / totals / dates layout as process_attendance_data. `policy`
+    picks the record that fills a cell with duplicates, as in
+    attendance_pivot ('first' value wins, or the 'best' status). Codes of
+    unrecognised status labels refer to `other_labels`; pass that list to
+    status_codes for every chunk.
+    """
+
+    def __init__(self, policy=FIRST):
+        if policy not in DUPLICATE_POLICIES:
+            raise ValueError(f"Unknown duplicate policy {policy!r}; expected one of {list(DUPLICATE_POLICIES)}")
+        self.policy = policy
+        self.student_keys = []
+        self.date_keys = []
+        self.other_labels = []
+        self._student_index = {}
+        self._date_index = {}
+        self._codes = np.full((256, 32), _UNSET, dtype=np.uint8)
+
+    def _positions(self, keys, index, ordered):
+        """Map keys to matrix positions, registering unseen keys"""
+        codes, uniques = pd.factorize(keys)
+        lookup = np.empty(len(uniques), dtype=np.int64)
+        for i, key in enumerate(uniques):
+            position = index.get(key)
+            if position is None:
+                position = index[key] = len(ordered)
+                ordered.append(key)
+            lookup[i] = position
+        return lookup[codes]
+
+    def _reserve(self, rows, cols):
+        """Grow the code matrix (doubling) to hold at least rows x cols"""
+        new_rows, new_cols = self._codes.shape
+        while new_rows < rows:
+            new_rows *= 2
+        while new_cols < cols:
+            new_cols *= 2
+        if (new_rows, new_cols) == self._codes.shape:
+            return
+        grown = np.full((new_rows, new_cols), _UNSET, dtype=np.uint8)
+        grown[:self._codes.shape[0], :self._codes.shape[1]] = self._codes
+        self._codes = grown
+
+    def add(self, names, dates, codes, rolls=None):
+        """Add one chunk of records (rows with a missing key are ignored, like pivot_table)"""
+        names = pd.Series(names).reset_index(drop=True)
+        dates = pd.Series(dates).reset_index(drop=True)
+        codes = np.asarray(codes)
+        valid = names.notna() & dates.notna()
+        if rolls is not None:
+            rolls = pd.Series(rolls).reset_index(drop=True)
+            valid &= rolls.notna()
+        valid = valid.to_numpy()
+
+        if rolls is not None:
+            student_keys = pd.MultiIndex.from_arrays([rolls[valid], names[valid]])
+        else:
+            student_keys = names[valid]
+        rows = self._positions(student_keys, self._student_index, self.student_keys)
+        cols = self._positions(dates[valid], self._date_index, self.date_keys)
+        codes = codes[valid]
+        if not len(rows):
+            return
+
+        self._reserve(len(self.student_keys), len(self.date_keys))
+
+        flat = rows * len(self.date_keys) + cols
+        if self.policy == BEST:
+            # Best record per (student, date) within the chunk, then only
+            # replace cells holding a worse status
+            order = np.lexsort((STATUS_RANK[codes], flat))
+            last = np.append(flat[order][1:] != flat[order][:-1], True)
+            keep = order[last]
+            rows, cols, codes = rows[keep], cols[keep], codes[keep]
+            update = _CELL_RANK[self._codes[rows, cols]] < STATUS_RANK[codes]
+        else:
+            # First record per (student, date) within the chunk, then only
+            # fill cells no earlier chunk has claimed
+            _, first = np.unique(flat, return_index=True)
+            rows, cols, codes = rows[first], cols[first], codes[first]
+            update = self._codes[rows, cols] == _UNSET
+        self._codes[rows[update], cols[update]] = codes[update]
+
+    def rename_dates(self, keys):
+        """Replace the date keys (one per column, all distinct); columns whose new key is missing are dropped"""
+        keep = np.flatnonzero(pd.notna(pd.Series(keys, dtype=object)).to_numpy())
+        codes = np.full_like(self._codes, _UNSET)
+        codes[:, :len(keep)] = self._codes[:, keep]
+        self._codes = codes
+        self.date_keys = [keys[i] for i in keep]
+        self._date_index = {key: position for position, key in enumerate(self.date_keys)}
+
+    def report(self):
+        """Build the report DataFrame from everything added so far"""
+        return self.matrix().to_frame()
+
+    def matrix(self):
+        """Build the AttendanceMatrix from everything added so far"""
+        has_roll = bool(self.student_keys) and isinstance(self.student_keys[0], tuple)
+        if has_roll:
+            student_order = _sorted_order(self.student_keys, ['Roll No', 'Student Name'])
+        else:
+            student_order = _sorted_order(self.student_keys, ['Student Name'])
+        # Dates in pivot_codes order: days chronologically, then any unparsed values
+        date_order = np.argsort(pd.factorize(pd.Series(self.date_keys), sort=True)[0], kind='stable')
+
+        codes = self._codes[:len(self.student_keys), :len(self.date_keys)]
+        codes = codes[student_order][:, date_order]
+        codes = np.where(codes == _UNSET, NO_DATA, codes).astype(np.uint8)
+
+        keys = [self.student_keys[i] for i in student_order]
+        if has_roll:
+            students = pd.DataFrame(keys, columns=['Roll No', 'Student Name'])
+        else:
+            students = pd.DataFrame({'Roll No': range(1, len(keys) + 1), 'Student Name': keys})
+        return AttendanceMatrix(students, date_labels([self.date_keys[i] for i in date_order]), codes,
+                                self.other_labels)
+
+
+def stream_attendance_matrix(source, name_col, date_col, status_col, roll_col=None,
+                             filename=None, chunk_rows=DEFAULT_CHUNK_ROWS, duplicates=FIRST):
+    """
+    Build an attendance report (an AttendanceMatrix) by streaming the
+    workbook in chunks: the same report as build_attendance_report for the
+    given column mapping, while only one chunk of raw rows is held at a time.
+
+    Chunks are pivoted on the raw date values and the distinct values are
+    parsed once at the end with report_dates, so the whole stream reads
+    dates in one layout, or keeps every value when any fails to parse,
+    exactly like a whole column. Only when several raw values fall on one
+    day (e.g. a text date and the same date typed as a date) is the
+    workbook read a second time, keyed by day.
+    """
+    accumulator = _stream_pivot(source, name_col, date_col, status_col, roll_col, filename, chunk_rows, duplicates)
+    raw = accumulator.date_keys
+    days, parsed = report_dates(pd.Series(raw, dtype=object))
+    if parsed:
+        days = list(days)
+        if pd.Series(days).dropna().duplicated().any():
+            _rewind(source)
+            day_of = dict(zip(raw, days))
+            accumulator = _stream_pivot(source, name_col, date_col, status_col, roll_col, filename, chunk_rows,
+                                        duplicates, dates=lambda values: values.map(day_of))
+        else:
+            accumulator.rename_dates(days)
+    _rewind(source)
+    return accumulator.matrix()
+
+
+def _stream_pivot(source, name_col, date_col, status_col, roll_col, filename, chunk_rows, duplicates, dates=None):
+    """Feed every chunk to a PivotAccumulator, keyed by the raw date values or by dates(values)"""
+    accumulator = PivotAccumulator(policy=duplicates)
+    numeric = None
+    for chunk in iter_excel_chunks(source, filename=filename, chunk_rows=chunk_rows):
+        if numeric is None:
+            numeric = is_numeric_status(chunk[status_col])
+        codes = status_codes(chunk[status_col], numeric=numeric, other_labels=accumulator.other_labels)
+        rolls = chunk[roll_col] if roll_col else None
+        keys = chunk[date_col] if dates is None else dates(chunk[date_col])
+        accumulator.add(chunk[name_col], keys, codes, rolls=rolls)
+    return accumulator
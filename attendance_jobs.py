@@ -0,0 +1,296 @@
+"""
+Background job queue for report generation.
+
+Submitting work returns a job ID straight away; the job runs in a worker
+pool (processes by default, so large uploads from several users don't
+compete for the app process) while the page polls status() for progress
+and fetches result() when it is done. Jobs report progress through the
+JobContext they are given, which is also where cancellation takes effect:
+a cancelled job stops at its next progress() call, which report_job makes
+for every file it reads and every block of rows it exports.
+
+report_job is the app's job: parse -> detect columns -> pivot -> export.
+"""
+import itertools
+import multiprocessing
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import CancelledError, ProcessPoolExecutor, ThreadPoolExecutor
+
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+
+FINISHED = (DONE, FAILED, CANCELLED)
+
+
+class JobCancelled(Exception):
+    """Raised inside a job when it has been cancelled"""
+
+
+class JobContext:
+    """Handed to a job function: reports progress and notices cancellation"""
+
+    def __init__(self, job_id, progress, cancelled):
+        self.job_id = job_id
+        self._progress = progress
+        self._cancelled = cancelled
+
+    @property
+    def cancelled(self):
+        return bool(self._cancelled.get(self.job_id))
+
+    def progress(self, fraction, message=''):
+        """Record progress (0..1) and stop the job if it was cancelled"""
+        if self.cancelled:
+            raise JobCancelled(self.job_id)
+        self._progress[self.job_id] = (float(fraction), message)
+
+
+def _run_job(func, job_id, progress, cancelled, args, kwargs):
+    """Worker entry point"""
+    context = JobContext(job_id, progress, cancelled)
+    context.progress(0.0, 'Started')
+    return func(context, *args, **kwargs)
+
+
+class _Job:
+    def __init__(self, job_id, label, future):
+        self.id = job_id
+        self.label = label
+        self.future = future
+        self.submitted = time.time()
+        self.finished = None
+
+
+class JobQueue:
+    """
+    Worker pool with job IDs, progress reporting and cancellation.
+
+    Job functions are called as func(context, *args, **kwargs) and must be
+    importable module-level functions when processes=True. The results of
+    at most `keep_finished` finished jobs are kept for fetching.
+    """
+
+    def __init__(self, workers=2, processes=True, keep_finished=32):
+        self.workers = workers
+        self.processes = processes
+        self.keep_finished = keep_finished
+        self._jobs = OrderedDict()
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._executor = None
+        self._manager = None
+        self._progress = None
+        self._cancelled = None
+
+    def _start(self):
+        if self._executor is not None:
+            return
+        if self.processes:
+            self._manager = multiprocessing.Manager()
+            self._progress = self._manager.dict()
+            self._cancelled = self._manager.dict()
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        else:
+            self._progress = {}
+            self._cancelled = {}
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='attendance-job')
+
+    def submit(self, func, *args, label='', **kwargs):
+        """Queue a job and return its ID"""
+        with self._lock:
+            self._start()
+            job_id = f"job-{next(self._ids)}"
+            future = self._executor.submit(_run_job, func, job_id, self._progress, self._cancelled, args, kwargs)
+            job = _Job(job_id, label, future)
+            future.add_done_callback(lambda _: setattr(job, 'finished', time.time()))
+            self._jobs[job_id] = job
+            self._evict()
+        return job_id
+
+    def _evict(self):
+        """Forget the oldest finished jobs beyond keep_finished"""
+        finished = [job_id for job_id, job in self._jobs.items() if job.future.done()]
+        for job_id in finished[:max(0, len(finished) - self.keep_finished)]:
+            self._forget(job_id)
+
+    def _forget(self, job_id):
+        self._jobs.pop(job_id, None)
+        self._progress.pop(job_id, None)
+        self._cancelled.pop(job_id, None)
+
+    def _state(self, job):
+        future = job.future
+        if future.cancelled():
+            return CANCELLED
+        if future.done():
+            error = future.exception()
+            if isinstance(error, JobCancelled):
+                return CANCELLED
+            return FAILED if error is not None else DONE
+        return RUNNING if job.id in self._progress else QUEUED
+
+    def status(self, job_id):
+        """
+        State of a job: a dict with id, label, state, progress (0..1),
+        message, seconds since submission (or until it finished) and error.
+        Returns None for unknown (or forgotten) job IDs.
+        """
+        job = self._jobs.get(job_id)
+        if job is None:
+            return None
+        state = self._state(job)
+        fraction, message = self._progress.get(job_id, (0.0, 'Waiting for a free worker'))
+        error = None
+        if state == DONE:
+            fraction, message = 1.0, 'Finished'
+        elif state == FAILED:
+            exception = job.future.exception()
+            error = f"{type(exception).__name__}: {exception}"
+        elif state == CANCELLED:
+            message = 'Cancelled'
+        return {
+            'id': job_id,
+            'label': job.label,
+            'state': state,
+            'progress': fraction,
+            'message': message,
+            'seconds': (job.finished or time.time()) - job.submitted,
+            'error': error,
+        }
+
+    def result(self, job_id):
+        """The job's return value (raises if it failed, was cancelled or is unknown)"""
+        job = self._jobs.get(job_id)
+        if job is None:
+            raise KeyError(f"Unknown job {job_id!r}")
+        try:
+            return job.future.result(timeout=0)
+        except CancelledError:
+            raise JobCancelled(job_id)
+
+    def cancel(self, job_id):
+        """Cancel a queued job, or ask a running one to stop at its next progress update"""
+        job = self._jobs.get(job_id)
+        if job is None or job.future.done():
+            return False
+        if not job.future.cancel():
+            self._cancelled[job_id] = True
+        return True
+
+    def forget(self, job_id):
+        """Drop a finished job and its result"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None and job.future.done():
+                self._forget(job_id)
+
+    def shutdown(self):
+        if self._executor is not None:
+            for job_id in list(self._jobs):
+                self.cancel(job_id)
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        if self._manager is not None:
+            self._manager.shutdown()
+            self._manager = None
+
+
+EXPORT_CHUNK_ROWS = 2000
+
+
+def _export_chunks(context, frame, start, end, chunk_rows):
+    """The report's rows in blocks, reporting progress (so noticing cancellation) before each"""
+    for first in range(0, len(frame), chunk_rows):
+        context.progress(start + (end - start) * first / len(frame),
+                         f"Writing the Excel report (row {first + 1:,} of {len(frame):,})")
+        yield frame.iloc[first:first + chunk_rows]
+
+
+def report_job(context, uploads, all_sheets=False, duplicates='first', shift=None, calendar=None):
+    """
+    Build a report in the background: parse, detect columns, pivot, export.
+
+    `uploads` is a list of (bytes, filename) pairs; a single upload is read
+    as in the foreground, several uploads (or all_sheets) are merged as in
+    attendance_merge. `calendar` is an optional
+    attendance_calendar.AttendanceCalendar. Returns a dict with the
+    AttendanceMatrix ('report'), the styled workbook bytes ('export'), the
+    detected 'columns', UI 'notes', per-sheet read times ('sheets') and the
+    job's profiling 'spans'.
+    """
+    # Imported here so the module stays light for the pool's workers
+    import io
+    import os
+
+    import pandas as pd
+
+    from attendance_core import build_report, detect_columns, missing_columns, read_workbook
+    from attendance_export import APP_STATUS_STYLES, column_widths, write_styled_chunks
+    from attendance_matrix import as_report_frame
+    from attendance_merge import merge_records, read_sheets, sheet_timings
+    from attendance_profile import Profiler, profiling, span
+    from attendance_summary import summarize_report
+
+    profiler = Profiler(memory=None)
+    with profiling(profiler):
+        if len(uploads) == 1 and not all_sheets:
+            # No merge, so duplicate records are kept exactly as in the foreground
+            data, filename = uploads[0]
+            context.progress(0.05, f"Reading {filename}")
+            started = time.perf_counter()
+            with span('read_excel') as record:
+                df = read_workbook(io.BytesIO(data), filename)
+                record['rows'] = len(df)
+            sheets = pd.DataFrame([{'file': os.path.basename(filename), 'sheet': 0, 'rows': len(df),
+                                    'seconds': time.perf_counter() - started, 'error': None}])
+            removed = 0
+        else:
+            results = []
+            with span('read_sheets') as record:
+                for position, upload in enumerate(uploads):
+                    context.progress(0.05 + 0.25 * position / len(uploads),
+                                     f"Reading file {position + 1} of {len(uploads)}")
+                    results.extend(read_sheets([upload], all_sheets=all_sheets, workers=1))
+                df, removed = merge_records(results)
+                record['rows'] = len(df)
+            sheets = sheet_timings(results)
+
+        context.progress(0.35, f"Detecting columns in {len(df):,} records")
+        columns = detect_columns(df)
+        if missing_columns(columns):
+            raise ValueError("Could not auto-detect the Name, Date and Status columns; "
+                             "turn off background processing to pick them by hand")
+
+        context.progress(0.45, "Building the attendance matrix")
+        report, notes = build_report(df, columns, duplicates, shift, calendar=calendar)
+
+        context.progress(0.7, f"Summarizing {len(report):,} students")
+        with span('summarize_report', rows=len(report)):
+            extra_sheets = summarize_report(report)
+
+        # create_excel_download's styled workbook, written in row blocks so a
+        # cancel takes effect during the export of a large report
+        with span('excel_export', rows=len(report)):
+            frame = as_report_frame(report)
+            output = io.BytesIO()
+            chunks = _export_chunks(context, frame, 0.75, 1.0, EXPORT_CHUNK_ROWS)
+            write_styled_chunks(chunks, output, list(frame.columns), column_widths(frame), APP_STATUS_STYLES,
+                                extra_sheets=extra_sheets)
+            export = output.getvalue()
+
+    context.progress(1.0, "Finished")
+    return {
+        'report': report,
+        'export': export,
+        'columns': {'name': columns['name'], 'roll': columns['punch_id'] or columns['roll'], 'date': columns['date'],
+                    'status': columns['status'], 'punch_mode': columns['punch_mode']},
+        'notes': notes,
+        'sheets': sheets,
+        'duplicates_removed': removed,
+        'spans': profiler.spans,
+    }
@@ -0,0 +1,86 @@
+"""
+Compact report model: an integer-coded attendance matrix.
+
+A report is held as one uint8 code per (student, date) (see
+attendance_status) plus the student table and date labels, instead of an
+object DataFrame of 'P'/'A'/'I'/'-' strings. 5,000 students x 365 days
+take under 2 MB this way versus tens of MB of boxed strings. to_frame()
+and from_frame() convert to and from the usual Roll No / Student Name /
+totals / dates DataFrame for display and export.
+"""
+import numpy as np
+import pandas as pd
+
+from attendance_status import status_labels
+from attendance_totals import REPORT_ID_COLUMNS, build_report, report_codes, report_date_columns
+
+
+class AttendanceMatrix:
+    """
+    Students x dates attendance codes with their row and column labels.
+
+    `students` has one 'Roll No' / 'Student Name' row per matrix row,
+    `dates` holds the date labels of the matrix columns and
+    `other_labels` the labels of codes from OTHER_CODE up (status texts
+    the report doesn't recognise, see attendance_status).
+    """
+
+    def __init__(self, students, dates, codes, other_labels=()):
+        codes = np.asarray(codes, dtype=np.uint8)
+        if codes.shape != (len(students), len(dates)):
+            raise ValueError(f"Code matrix shape {codes.shape} does not match "
+                             f"{len(students)} students x {len(dates)} dates")
+        self.students = students[REPORT_ID_COLUMNS].reset_index(drop=True)
+        self.dates = pd.Index(dates, dtype=object)
+        self.codes = codes
+        self.other_labels = tuple(other_labels)
+
+    @classmethod
+    def from_frame(cls, df):
+        """Encode a report DataFrame (totals columns are recomputed, not read)"""
+        date_columns = report_date_columns(df)
+        other_labels = []
+        codes = report_codes(df, date_columns, other_labels)
+        return cls(df[REPORT_ID_COLUMNS], date_columns, codes, other_labels)
+
+    def with_codes(self, codes):
+        """The same students, dates and labels with another code matrix"""
+        return AttendanceMatrix(self.students, self.dates, codes, self.other_labels)
+
+    def to_frame(self):
+        """The report DataFrame shown in the app and written to Excel"""
+        return build_report(self.students, self.dates, self.codes, self.other_labels)
+
+    def labels(self):
+        """The P/A/I/- (and unrecognised) labels as an object array (rows x dates)"""
+        return status_labels(self.codes, self.other_labels)
+
+    @property
+    def shape(self):
+        return self.codes.shape
+
+    def __len__(self):
+        return len(self.codes)
+
+    @property
+    def nbytes(self):
+        """Approximate memory footprint in bytes"""
+        students = int(self.students.memory_usage(index=True, deep=True).sum())
+        return self.codes.nbytes + students + int(self.dates.memory_usage(deep=True))
+
+    def __repr__(self):
+        return f"AttendanceMatrix({len(self.students)} students x {len(self.dates)} dates)"
+
+
+def as_report_frame(report):
+    """Accept either an AttendanceMatrix or a report DataFrame; return the DataFrame"""
+    if isinstance(report, AttendanceMatrix):
+        return report.to_frame()
+    return report
+
+
+def as_attendance_matrix(report):
+    """Accept either an AttendanceMatrix or a report DataFrame; return the matrix"""
+    if isinstance(report, AttendanceMatrix):
+        return report
+    return AttendanceMatrix.from_frame(report)
@@ -0,0 +1,162 @@
+"""
+Merge mode: read every sheet of several workbooks and union them.
+
+Branches send one workbook per device, sometimes with one sheet per month.
+read_sheets() parses the workbooks concurrently in a process pool
+(pandas' Excel readers are pure Python, so threads would mostly wait on
+the GIL), each one opened once by a single worker, and times each sheet. merge_records() unions long-format
+sheets into one dataset and drops records exported more than once;
+merge_wide_sheets() does the same for wide date-column sheets, one row per
+student.
+"""
+import io
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pandas as pd
+
+from attendance_ingest import excel_engine
+from attendance_schema import NON_DATE_HEADERS, find_header_date_columns, header_dates
+from attendance_xls import read_xls
+
+
+def _excel_file(data, filename):
+    """pd.ExcelFile over a path or raw bytes, with the engine picked from the name"""
+    source = io.BytesIO(data) if isinstance(data, (bytes, bytearray)) else data
+    engine = excel_engine(filename)
+    if engine is not None:
+        return pd.ExcelFile(source, engine=engine)
+    try:
+        return pd.ExcelFile(source, engine='openpyxl')
+    except Exception:
+        if hasattr(source, 'seek'):
+            source.seek(0)
+        return pd.ExcelFile(source, engine='xlrd')
+
+
+def sheet_names(data, filename):
+    """Names of the sheets of a workbook given as a path or raw bytes"""
+    with _excel_file(data, filename) as workbook:
+        return list(workbook.sheet_names)
+
+
+def _parse_sheet(workbook, data, filename, sheet):
+    """Parse one sheet of an open workbook (None for .xls data) and time it (never raises)"""
+    start = time.perf_counter()
+    result = {'file': os.path.basename(filename), 'sheet': sheet}
+    try:
+        frame = read_xls(data, sheet) if workbook is None else workbook.parse(sheet)
+        frame.columns = [col.strip() if isinstance(col, str) else col for col in frame.columns]
+        result.update(frame=frame, rows=len(frame), error=None)
+    except Exception as e:
+        result.update(frame=None, rows=0, error=f"{type(e).__name__}: {e}")
+    result['seconds'] = time.perf_counter() - start
+    return result
+
+
+def _parse_workbook(job):
+    """Worker entry point: parse the sheets of one workbook, opening it once (never raises)"""
+    data, filename, all_sheets = job
+    start = time.perf_counter()
+    try:
+        if excel_engine(filename) == 'xlrd':
+            sheets = sheet_names(data, filename) if all_sheets else [0]
+            return [_parse_sheet(None, data, filename, sheet) for sheet in sheets]
+        with _excel_file(data, filename) as workbook:
+            opened = time.perf_counter() - start
+            sheets = list(workbook.sheet_names) if all_sheets else [0]
+            results = [_parse_sheet(workbook, data, filename, sheet) for sheet in sheets]
+        # Opening the workbook is counted with its first sheet
+        results[0]['seconds'] += opened
+        return results
+    except Exception as e:
+        return [{'file': os.path.basename(filename), 'sheet': 0, 'frame': None, 'rows': 0,
+                 'error': f"{type(e).__name__}: {e}", 'seconds': time.perf_counter() - start}]
+
+
+def read_sheets(sources, all_sheets=True, workers=None, processes=True, executor=None):
+    """
+    Parse the sheets of several workbooks concurrently.
+
+    `sources` is a list of (data, filename) pairs where data is a path or
+    the file's bytes. Each workbook goes to one worker, which opens it once
+    for all of its sheets; with all_sheets=False only the first sheet is
+    read. `executor` runs the workbooks on an existing pool (e.g. one
+    shared by a server) instead of starting `workers` new ones. Returns one
+    result dict per sheet, in file and sheet order: file, sheet, frame,
+    rows, seconds and error (None on success). A workbook that can't be
+    opened gives a single failed result.
+    """
+    jobs = [(data, filename, all_sheets) for data, filename in sources]
+    if executor is not None:
+        return [result for results in executor.map(_parse_workbook, jobs) for result in results]
+
+    workers = min(workers or os.cpu_count() or 1, len(jobs))
+    if workers <= 1:
+        return [result for job in jobs for result in _parse_workbook(job)]
+    pool = ProcessPoolExecutor if processes else ThreadPoolExecutor
+    with pool(max_workers=workers) as executor:
+        return [result for results in executor.map(_parse_workbook, jobs) for result in results]
+
+
+def sheet_timings(results):
+    """Per-sheet parse report (file, sheet, rows, seconds, error) as a DataFrame"""
+    return pd.DataFrame([{key: result[key] for key in ['file', 'sheet', 'rows', 'seconds', 'error']}
+                         for result in results])
+
+
+def _frames(results):
+    """The parsed, non-empty sheets"""
+    return [result['frame'] for result in results if result['frame'] is not None and not result['frame'].empty]
+
+
+def merge_records(results):
+    """
+    Union long-format sheets (one attendance record per row).
+
+    Columns are aligned by header name; rows repeated across sheets or
+    files (overlapping exports) are kept once. Returns (records,
+    duplicates_removed).
+    """
+    frames = _frames(results)
+    if not frames:
+        raise ValueError("None of the sheets contained attendance records")
+    merged = pd.concat(frames, ignore_index=True, sort=False)
+    deduplicated = merged.drop_duplicates(ignore_index=True)
+    return deduplicated, len(merged) - len(deduplicated)
+
+
+def merge_wide_sheets(results, key_columns=('Roll', 'Name')):
+    """
+    Union wide date-column sheets into one row per student.
+
+    Students are matched on `key_columns` (those present). Where sheets
+    overlap, the first sheet with a value for a date wins. Date columns are
+    put in calendar order and the Present/Absent totals are recounted from
+    the merged dates. Returns (sheet, duplicates_removed) where the second
+    value counts student rows folded into an earlier one.
+    """
+    frames = _frames(results)
+    if not frames:
+        raise ValueError("None of the sheets contained attendance rows")
+    merged = pd.concat(frames, ignore_index=True, sort=False)
+    keys = [col for col in key_columns if col in merged.columns]
+    if not keys:
+        raise ValueError(f"Wide sheets need at least one of the columns {list(key_columns)} to be merged")
+
+    combined = merged.groupby(keys, sort=False, dropna=False).first().reset_index()
+
+    date_columns = find_header_date_columns(combined.columns)
+    parsed = header_dates(date_columns)
+    if parsed.notna().all():
+        date_columns = [date_columns[i] for i in parsed.sort_values(kind='stable').index]
+    other_columns = [col for col in combined.columns if col not in date_columns]
+    combined = combined[other_columns + date_columns]
+
+    statuses = combined[date_columns].astype(str).apply(lambda column: column.str.strip().str.upper())
+    combined['Present'] = statuses.isin(['P', 'PRESENT']).sum(axis=1)
+    combined['Absent'] = statuses.isin(['A', 'ABSENT']).sum(axis=1)
+    leading = [col for col in NON_DATE_HEADERS if col in combined.columns]
+    combined = combined[leading + [col for col in combined.columns if col not in leading]]
+    return combined, len(merged) - len(combined)
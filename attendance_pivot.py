@@ -0,0 +1,130 @@
+"""
+Scatter pivot of attendance records into the students x dates code matrix.
+
+Replaces `pivot_table(aggfunc='first')`: student and date keys are
+factorized into sorted integer codes and the status codes are written
+straight into a preallocated uint8 matrix, with no groupby-aggregate
+step. Axes come out in the same order as pivot_table's and records with a
+missing key are dropped, like pivot_table does.
+
+When a student has several records on one day, the duplicate policy
+decides which one fills the cell:
+- 'first': the first record wins (pivot_table's aggfunc='first')
+- 'best': the best status wins, P beats I beats A beats no data
+"""
+import numpy as np
+import pandas as pd
+
+from attendance_status import NO_DATA, STATUS_RANK
+
+FIRST = 'first'
+BEST = 'best'
+
+# Duplicate policies and how the app describes them
+DUPLICATE_POLICIES = {
+    FIRST: 'First record wins',
+    BEST: 'Best status wins (P > I > A)',
+}
+
+
+def _factorize_keys(keys):
+    """
+    Sorted integer codes for the rows of `keys` (a DataFrame of one or more
+    key columns) and the unique key rows in that order. Rows with a missing
+    key get code -1.
+    """
+    level_codes = [pd.factorize(keys[column], sort=True) for column in keys.columns]
+    missing = np.zeros(len(keys), dtype=bool)
+    for column_codes, _ in level_codes:
+        missing |= column_codes < 0
+    present = ~missing
+
+    # Usually every other key (the name) is determined by the first one (the
+    # roll number); then the first key's codes already give the sorted order
+    first_codes, first_uniques = level_codes[0]
+    representatives = []
+    for column_codes, _ in level_codes[1:]:
+        representative = np.full(len(first_uniques), -1, dtype=np.int64)
+        representative[first_codes[present]] = column_codes[present]
+        if not (representative[first_codes[present]] == column_codes[present]).all():
+            break
+        representatives.append(representative)
+    else:
+        used = np.bincount(first_codes[present], minlength=len(first_uniques)) > 0
+        remap = np.cumsum(used) - 1
+        combined = np.where(present, remap[first_codes], -1)
+        unique_rows = {keys.columns[0]: np.asarray(first_uniques)[used]}
+        for (_, uniques), representative, column in zip(level_codes[1:], representatives, keys.columns[1:]):
+            unique_rows[column] = np.asarray(uniques)[representative[used]]
+        return combined, pd.DataFrame(unique_rows)
+
+    # Otherwise combine the per-column codes into one int64 key; its sort
+    # order is the lexicographic order of the columns
+    codes = None
+    for column_codes, uniques in level_codes:
+        codes = column_codes.astype(np.int64) if codes is None else codes * len(uniques) + column_codes
+    codes[missing] = -1
+    combined, observed = pd.factorize(codes, sort=True)
+    if missing.any():
+        # -1 sorts first among the observed keys; drop it
+        combined = combined - 1
+        observed = observed[1:]
+
+    unique_rows = {}
+    remaining = np.asarray(observed)
+    for (_, uniques), column in reversed(list(zip(level_codes, keys.columns))):
+        unique_rows[column] = np.asarray(uniques)[remaining % len(uniques)]
+        remaining = remaining // len(uniques)
+    return combined, pd.DataFrame({column: unique_rows[column] for column in keys.columns})
+
+
+def pivot_codes(keys, dates, codes, policy=FIRST):
+    """
+    Pivot (student keys, date, status code) records into a code matrix.
+
+    `keys` is a DataFrame with the student key columns (e.g. Roll No and
+    Student Name), `dates` the date labels and `codes` the uint8 status
+    codes, all of the same length. Returns (students, date_labels, matrix)
+    where `students` has one row per matrix row and cells without a record
+    are NO_DATA.
+    """
+    if policy not in DUPLICATE_POLICIES:
+        raise ValueError(f"Unknown duplicate policy {policy!r}; expected one of {list(DUPLICATE_POLICIES)}")
+    keys = keys.reset_index(drop=True)
+    codes = np.asarray(codes, dtype=np.uint8)
+
+    rows, students = _factorize_keys(keys)
+    cols, date_labels = pd.factorize(pd.Series(dates).reset_index(drop=True), sort=True)
+    valid = (rows >= 0) & (cols >= 0)
+    if not valid.all():
+        rows, cols, codes = rows[valid], cols[valid], codes[valid]
+
+    # A date only seen on records with a missing student key is not a column,
+    # and a student only seen on records with a missing date is not a row
+    used_dates = np.bincount(cols, minlength=len(date_labels)) > 0
+    if not used_dates.all():
+        remap = np.cumsum(used_dates) - 1
+        cols = remap[cols]
+        date_labels = date_labels[used_dates]
+    used_students = np.bincount(rows, minlength=len(students)) > 0
+    if not used_students.all():
+        remap = np.cumsum(used_students) - 1
+        rows = remap[rows]
+        students = students[used_students].reset_index(drop=True)
+
+    matrix = np.full((len(students), len(date_labels)), NO_DATA, dtype=np.uint8)
+    flat = rows.astype(np.int64) * len(date_labels) + cols
+
+    if policy == BEST:
+        # One pass per status from worst to best: later passes overwrite
+        # earlier ones, and within a pass every write stores the same value
+        for code in sorted(np.unique(codes), key=STATUS_RANK.__getitem__):
+            matrix.flat[flat[codes == code]] = code
+    else:
+        # Lowest record position per cell, without sorting
+        first = np.full(matrix.size, len(flat), dtype=np.int64)
+        np.minimum.at(first, flat, np.arange(len(flat)))
+        filled = first < len(flat)
+        matrix.reshape(-1)[filled] = codes[first[filled]]
+
+    return students, list(date_labels), matrix
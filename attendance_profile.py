@@ -0,0 +1,172 @@
+"""
+Lightweight per-stage profiling for the app and the converter.
+
+Wrap a stage in `with span('pivot', rows=len(df)):` (or decorate a
+function with @profiled('stage')). While a Profiler is active (see
+`profiling()`), each span records its wall time, the rows it processed
+and the peak memory seen while it ran. Without an active profiler spans
+cost next to nothing.
+"""
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+_active = ContextVar('attendance_profiler', default=None)
+
+
+def current_rss():
+    """Resident set size of this process in bytes (None where unsupported)"""
+    try:
+        with open('/proc/self/statm') as handle:
+            return int(handle.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    # Lifetime high-water mark: KB on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class Profiler:
+    """
+    Collects the spans of one run (one app rerun or one converted file).
+
+    memory='rss' (default) samples the process RSS every few milliseconds
+    on a background thread and keeps each span's peak; memory='python'
+    uses tracemalloc for exact Python allocations (much slower);
+    memory=None records time and rows only.
+    """
+
+    def __init__(self, memory='rss', context=None, interval=0.005):
+        self.memory = memory
+        self.context = dict(context or {})
+        self.interval = interval
+        self.spans = []
+        self._stack = []
+        self._started_tracing = False
+        self._sampler = None
+        self._stop = threading.Event()
+
+    def _memory_now(self):
+        if self.memory == 'python':
+            return tracemalloc.get_traced_memory()[1] if tracemalloc.is_tracing() else None
+        if self.memory == 'rss':
+            return current_rss()
+        return None
+
+    def _note_memory(self, value):
+        """Raise the peak of every open span to `value`"""
+        if value is None:
+            return
+        for record in list(self._stack):
+            if value > record.get('_peak', 0):
+                record['_peak'] = value
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            self._note_memory(current_rss())
+
+    def start(self):
+        if self.memory == 'python' and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        elif self.memory == 'rss' and self._sampler is None:
+            self._stop.clear()
+            self._sampler = threading.Thread(target=self._sample, name='attendance-profiler', daemon=True)
+            self._sampler.start()
+
+    def stop(self):
+        if self._sampler is not None:
+            self._stop.set()
+            self._sampler.join()
+            self._sampler = None
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    @contextmanager
+    def span(self, stage, rows=None):
+        """Time a stage; the yielded dict can be updated (e.g. span['rows'] = n)"""
+        record = {'stage': stage, 'depth': len(self._stack), 'rows': rows}
+        if self.memory == 'python' and tracemalloc.is_tracing():
+            # The open spans' peaks so far must survive the reset for this span
+            self._note_memory(tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+        self._stack.append(record)
+        self.spans.append(record)
+        self._note_memory(self._memory_now())
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record['seconds'] = time.perf_counter() - start
+            self._note_memory(self._memory_now())
+            self._stack.pop()
+            peak = record.pop('_peak', None)
+            if self.memory is not None:
+                record['peak_mb'] = peak / 2**20 if peak is not None else None
+
+    def records(self):
+        """Spans in start order, each with the profiler's context merged in"""
+        return [dict(self.context, **record) for record in self.spans]
+
+    def table(self):
+        """Spans as a DataFrame for display (rows/s where rows are known)"""
+        import pandas as pd
+
+        frame = pd.DataFrame(self.spans, columns=['stage', 'depth', 'seconds', 'rows', 'peak_mb'])
+        frame['stage'] = ['  ' * depth + stage for stage, depth in zip(frame['stage'], frame['depth'])]
+        rows = pd.to_numeric(frame['rows'], errors='coerce')
+        frame['rows/s'] = (rows / frame['seconds'].clip(lower=1e-9)).round()
+        if self.memory is None:
+            frame = frame.drop(columns=['peak_mb'])
+        return frame.drop(columns=['depth'])
+
+
+@contextmanager
+def profiling(profiler):
+    """Make `profiler` the active one for spans opened in this context"""
+    token = _active.set(profiler)
+    profiler.start()
+    try:
+        yield profiler
+    finally:
+        profiler.stop()
+        _active.reset(token)
+
+
+def active_profiler():
+    return _active.get()
+
+
+@contextmanager
+def span(stage, rows=None):
+    """Record a stage on the active profiler (no-op when none is active)"""
+    profiler = _active.get()
+    if profiler is None:
+        yield {}
+        return
+    with profiler.span(stage, rows) as record:
+        yield record
+
+
+def profiled(stage):
+    """Decorator form of span(); rows are taken from a result with len() when possible"""
+    def decorate(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(stage) as record:
+                result = func(*args, **kwargs)
+                if record.get('rows') is None and hasattr(result, '__len__'):
+                    record['rows'] = len(result)
+                return result
+        return wrapper
+    return decorate
@@ -0,0 +1,168 @@
+"""
+Raw punch-log parsing for ZKTeco device exports.
+
+Device exports such as may-july7.xls hold one row per fingerprint/card
+punch (name, employee number, timestamp) rather than a status column.
+summarize_punches groups them per employee and day in one vectorized
+pass over sorted int64 timestamps and derives first-in, last-out, worked
+hours, late-arrival / early-leave flags and a P/I status; punch_matrix
+turns that into the usual Roll No / Student Name / totals / dates report.
+"""
+from datetime import time
+
+import numpy as np
+import pandas as pd
+
+from attendance_dates import REPORT_DATE_FORMAT, parse_dates
+from attendance_status import ABSENT, INCOMPLETE, PRESENT, status_labels
+from attendance_matrix import AttendanceMatrix
+
+DEFAULT_SHIFT_START = time(9, 0)
+DEFAULT_SHIFT_END = time(17, 0)
+DEFAULT_GRACE_MINUTES = 10
+
+# Employee-number headers used by ZKTeco and similar attendance software
+PUNCH_ID_COLUMNS = ['No.', 'AC-No.', 'Enroll No', 'EnNo', 'User ID', 'Employee ID', 'Emp No', 'ID']
+
+NS_PER_DAY = 24 * 60 * 60 * 10**9
+
+
+def _offset_ns(value):
+    """Time of day ('09:00' or datetime.time) as nanoseconds after midnight"""
+    if isinstance(value, str):
+        value = time.fromisoformat(value)
+    return int(pd.Timedelta(hours=value.hour, minutes=value.minute, seconds=value.second).value)
+
+
+def parse_punch_times(values):
+    """Parse punch timestamps; unparseable values become NaT"""
+    # Logs repeat few distinct timestamps per second, each is parsed once
+    return parse_dates(values)
+
+
+def looks_like_punch_log(values, sample_size=50):
+    """True when a column holds timestamps with a time of day (one row per punch)"""
+    sample = pd.Series(values).dropna().head(sample_size)
+    if sample.empty:
+        return False
+    times = parse_dates(sample)
+    if times.notna().mean() < 0.8:
+        return False
+    return bool((times.dropna() != times.dropna().dt.normalize()).any())
+
+
+def find_punch_id_column(columns):
+    """Return the employee-number column of a punch log, if any"""
+    lookup = {str(col).strip().lower(): col for col in columns}
+    for candidate in PUNCH_ID_COLUMNS:
+        if candidate.lower() in lookup:
+            return lookup[candidate.lower()]
+    return None
+
+
+def summarize_punches(df, name_col, time_col, id_col=None, shift_start=DEFAULT_SHIFT_START,
+                      shift_end=DEFAULT_SHIFT_END, grace_minutes=DEFAULT_GRACE_MINUTES, min_hours=None,
+                      calendar=None):
+    """
+    Collapse a punch log to one row per employee and day.
+
+    A day with at least two punches is Present ('P'), a single punch is
+    Incomplete ('I'). With `min_hours`, days worked shorter than that are
+    also Incomplete. Late means the first punch came after shift_start
+    plus the grace period; early leave means the last punch of a
+    multi-punch day came before shift_end. With a `calendar`
+    (attendance_calendar) each employee's own shift is used instead.
+    """
+    times = parse_punch_times(df[time_col].reset_index(drop=True))
+    names = df[name_col].reset_index(drop=True)
+    valid = times.notna() & names.notna()
+    ids = None
+    if id_col is not None:
+        ids = df[id_col].reset_index(drop=True)
+        valid &= ids.notna()
+    valid = valid.to_numpy()
+
+    if ids is not None:
+        employee_keys = pd.MultiIndex.from_arrays([ids[valid], names[valid]])
+    else:
+        employee_keys = pd.Index(names[valid])
+    employee_codes, employees = pd.factorize(employee_keys, sort=True)
+
+    stamps = times[valid].to_numpy(dtype='datetime64[ns]').view('int64')
+    days = stamps // NS_PER_DAY * NS_PER_DAY
+    day_codes, day_values = pd.factorize(days, sort=True)
+
+    # Sort by employee, day, time; each run of equal (employee, day) is one group
+    order = np.lexsort((stamps, day_codes, employee_codes))
+    group_keys = employee_codes[order].astype(np.int64) * len(day_values) + day_codes[order]
+    stamps = stamps[order]
+    starts = np.flatnonzero(np.r_[True, group_keys[1:] != group_keys[:-1]])[:len(order)]
+    ends = np.append(starts[1:], len(order))[:len(starts)]
+
+    first_in = stamps[starts]
+    last_out = stamps[ends - 1]
+    punches = ends - starts
+    day_start = days[order][starts]
+    worked_hours = (last_out - first_in) / 3.6e12
+
+    group_employee = employee_codes[order][starts]
+    if calendar is not None:
+        rolls = employees.get_level_values(0) if ids is not None else None
+        names = employees.get_level_values(1) if ids is not None else employees
+        start_ns, end_ns, grace_ns = calendar.shift_arrays(rolls, names, shift_start, shift_end, grace_minutes)
+        late_after = (start_ns + grace_ns)[group_employee]
+        leave_before = end_ns[group_employee]
+    else:
+        late_after = _offset_ns(shift_start) + grace_minutes * 60 * 10**9
+        leave_before = _offset_ns(shift_end)
+    late = first_in - day_start > late_after
+    early_leave = (punches >= 2) & (last_out - day_start < leave_before)
+    status = np.where(punches >= 2, PRESENT, INCOMPLETE).astype(np.uint8)
+    if min_hours is not None:
+        status[(punches >= 2) & (worked_hours < min_hours)] = INCOMPLETE
+
+    if ids is not None:
+        roll_numbers = employees.get_level_values(0)[group_employee]
+        employee_names = employees.get_level_values(1)[group_employee]
+    else:
+        roll_numbers = group_employee + 1
+        employee_names = employees[group_employee]
+
+    return pd.DataFrame({
+        'Roll No': np.asarray(roll_numbers),
+        'Student Name': np.asarray(employee_names),
+        'Date': pd.to_datetime(day_start),
+        'First In': pd.to_datetime(first_in),
+        'Last Out': pd.to_datetime(last_out),
+        'Punches': punches,
+        'Worked Hours': np.round(worked_hours, 2),
+        'Late': late,
+        'Early Leave': early_leave,
+        'Status': status_labels(status),
+        '_employee': group_employee,
+        '_status_code': status,
+    })
+
+
+def punch_matrix(daily):
+    """
+    Turn summarize_punches output into the standard attendance report, as
+    an AttendanceMatrix.
+
+    Days on which an employee has no punch (but someone else does) are
+    marked Absent.
+    """
+    employees = daily[['_employee', 'Roll No', 'Student Name']].drop_duplicates('_employee').sort_values('_employee')
+    day_codes, day_values = pd.factorize(daily['Date'], sort=True)
+    row_positions = pd.Index(employees['_employee']).get_indexer(daily['_employee'])
+
+    codes = np.full((len(employees), len(day_values)), ABSENT, dtype=np.uint8)
+    codes[row_positions, day_codes] = daily['_status_code'].to_numpy()
+
+    date_labels = pd.DatetimeIndex(day_values).strftime(REPORT_DATE_FORMAT)
+    return AttendanceMatrix(employees, date_labels, codes)
+
+
+def daily_summary(daily):
+    """The per-day table without the internal helper columns"""
+    return daily.drop(columns=['_employee', '_status_code'])
@@ -0,0 +1,206 @@
+"""
+Single-pass column detection for attendance uploads.
+
+Each column is profiled once from a bounded random sample (share of
+date-like, time-of-day, status-token, numeric and text values) and the
+header name is matched against the usual hints. Roles (name, roll, date,
+status, time) are then assigned from those scores. Results are cached per
+header signature, so repeat uploads of the same device format skip
+detection entirely.
+"""
+import hashlib
+from datetime import time
+
+import numpy as np
+import pandas as pd
+
+from attendance_cache import LRUCache
+from attendance_dates import parse_dates
+from attendance_status import TEXT_STATUS_CODES
+
+DEFAULT_SAMPLE_SIZE = 200
+
+ROLES = ['name', 'roll', 'date', 'status', 'time']
+
+# Header words that hint at a role
+HEADER_HINTS = {
+    'name': ['name'],
+    'roll': ['roll'],
+    'date': ['date', 'time'],
+    'status': ['status', 'present', 'absent', 'attendance'],
+    'time': ['time'],
+}
+
+# Header names that are never daily attendance columns on a wide sheet
+NON_DATE_HEADERS = ['Roll', 'Name', 'Present', 'Absent']
+
+STATUS_TOKENS = set(TEXT_STATUS_CODES) - {'-'}
+
+# Minimum sample share for a column to count as dates / statuses
+MIN_SHARE = 0.8
+
+_schema_cache = LRUCache(max_bytes=8 * 1024 * 1024, max_entries=256)
+
+
+def header_signature(columns):
+    """Stable digest of a header row (names and order)"""
+    return hashlib.blake2b(repr([str(col) for col in columns]).encode(), digest_size=16).hexdigest()
+
+
+def _sample(values, sample_size, seed=0):
+    """Bounded random sample of the non-missing values of a column"""
+    values = pd.Series(values).dropna()
+    if len(values) > sample_size:
+        values = values.sample(sample_size, random_state=seed)
+    return values
+
+
+def profile_column(values, sample_size=DEFAULT_SAMPLE_SIZE, seed=0):
+    """
+    Profile a column from a random sample of at most `sample_size` values.
+
+    Returns the share of sampled values that are dates, dates with a time
+    of day, bare times, status tokens, numbers and free text, plus the
+    share of distinct values.
+    """
+    sample = _sample(values, sample_size, seed)
+    count = len(sample)
+    if not count:
+        return {'count': 0, 'date': 0.0, 'datetime': 0.0, 'time': 0.0,
+                'status': 0.0, 'numeric': 0.0, 'text': 0.0, 'unique': 0.0}
+
+    uniques = pd.Series(pd.unique(sample), dtype=object)
+    counts = sample.value_counts().reindex(uniques).to_numpy()
+    upper = uniques.astype(str).str.strip().str.upper()
+
+    dates = parse_dates(uniques)
+    is_date = dates.notna().to_numpy()
+    has_clock = is_date & (dates != dates.dt.normalize()).to_numpy()
+    is_time = uniques.map(lambda value: isinstance(value, time)).to_numpy()
+    is_status = upper.isin(STATUS_TOKENS).to_numpy()
+    is_numeric = uniques.map(lambda value: isinstance(value, (int, float, np.number)) and not isinstance(value, bool)).to_numpy()
+    is_numeric |= upper.str.replace('.', '', regex=False).str.isdigit().to_numpy()
+    is_text = uniques.map(lambda value: isinstance(value, str)).to_numpy() & ~is_numeric & ~is_date
+
+    def share(mask):
+        return float(counts[mask].sum() / count)
+
+    return {
+        'count': count,
+        'date': share(is_date),
+        'datetime': share(has_clock),
+        'time': share(is_time),
+        'status': share(is_status),
+        'numeric': share(is_numeric),
+        'text': share(is_text),
+        'unique': len(uniques) / count,
+    }
+
+
+def _header_hint(col, role):
+    col_lower = str(col).lower()
+    if role == 'time' and 'date' in col_lower:
+        return False
+    return any(word in col_lower for word in HEADER_HINTS[role])
+
+
+def score_column(col, profile):
+    """Score how well one column fits each role (0 means "not a candidate")"""
+    scores = dict.fromkeys(ROLES, 0.0)
+
+    if _header_hint(col, 'name'):
+        scores['name'] = 2 + profile['text']
+    elif profile['text'] >= 0.5 and profile['status'] < 0.5:
+        scores['name'] = profile['text'] * (0.5 + 0.5 * profile['unique'])
+
+    if _header_hint(col, 'roll'):
+        scores['roll'] = 2 + profile['numeric']
+
+    if profile['date'] >= MIN_SHARE or (_header_hint(col, 'date') and profile['date'] > 0):
+        scores['date'] = profile['date'] + (1 if _header_hint(col, 'date') else 0)
+
+    if _header_hint(col, 'status') and not _header_hint(col, 'date'):
+        scores['status'] = 2 + profile['status']
+    elif profile['status'] >= MIN_SHARE and profile['date'] < 0.5:
+        scores['status'] = profile['status']
+
+    if _header_hint(col, 'time'):
+        scores['time'] = 1 + max(profile['time'], profile['datetime'])
+    elif profile['time'] >= MIN_SHARE:
+        scores['time'] = profile['time']
+
+    return scores
+
+
+def assign_roles(scores):
+    """
+    Assign each role the best-scoring column not already taken.
+
+    `scores` maps column -> role scores; roles are filled in ROLES order
+    and ties go to the leftmost column.
+    """
+    schema = dict.fromkeys(ROLES)
+    taken = set()
+    for role in ROLES:
+        best, best_score = None, 0.0
+        for col, col_scores in scores.items():
+            if col in taken:
+                continue
+            if col_scores[role] > best_score:
+                best, best_score = col, col_scores[role]
+        if best is not None:
+            schema[role] = best
+            taken.add(best)
+    return schema
+
+
+def infer_schema(df, sample_size=DEFAULT_SAMPLE_SIZE, seed=0):
+    """Profile every column once and return {'name', 'roll', 'date', 'status', 'time', 'profiles'}"""
+    profiles = {col: profile_column(df[col], sample_size, seed) for col in df.columns}
+    schema = assign_roles({col: score_column(col, profile) for col, profile in profiles.items()})
+    schema['profiles'] = profiles
+    return schema
+
+
+def detect_schema(df, sample_size=DEFAULT_SAMPLE_SIZE, use_cache=True):
+    """
+    infer_schema, cached per header signature.
+
+    Returns (schema, cached) where `cached` tells whether detection was
+    skipped because the same header layout was seen before.
+    """
+    key = (header_signature(df.columns), sample_size)
+    if use_cache:
+        schema = _schema_cache.get(key)
+        if schema is not None and all(col in df.columns for col in _role_columns(schema)):
+            return schema, True
+    schema = infer_schema(df, sample_size)
+    if use_cache:
+        _schema_cache.put(key, schema)
+    return schema, False
+
+
+def _role_columns(schema):
+    return [schema[role] for role in ROLES if schema.get(role) is not None]
+
+
+def header_dates(columns):
+    """
+    Parse every header at once; returns a Series of Timestamps (NaT for
+    headers that are not dates). Numbers are never read as dates.
+    """
+    columns = pd.Series(list(columns), dtype=object)
+    return parse_dates(columns)
+
+
+def find_header_date_columns(columns):
+    """Columns of a wide sheet whose header is a date (or looks like one)"""
+    columns = list(columns)
+    parsed = header_dates(columns).notna().to_numpy()
+    date_columns = []
+    for col, is_date in zip(columns, parsed):
+        if col in NON_DATE_HEADERS:
+            continue
+        if is_date or any(char in str(col) for char in ['/', '-']):
+            date_columns.append(col)
+    return date_columns
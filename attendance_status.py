@@ -0,0 +1,174 @@
+"""
+Status normalization for attendance data.
+
+Raw status values (numbers, Present/Absent, TRUE/FALSE, 1/0, blanks/NaN)
+are mapped to compact integer codes. Numeric columns are handled with
+NumPy masks and everything else goes through a lookup table built from
+the column's unique values, so each distinct value is inspected once
+instead of once per row.
+
+Status texts that are not recognised (e.g. 'LATE', 'HALF DAY') keep their
+own label: they get codes from OTHER_CODE up, in the order they are first
+seen, and each report carries their labels (its `other_labels`). They
+count as neither present nor absent.
+"""
+import numpy as np
+import pandas as pd
+
+# Integer codes for attendance cells. 0 is "no data" so a freshly
+# allocated code matrix starts out empty.
+NO_DATA = 0
+PRESENT = 1
+ABSENT = 2
+INCOMPLETE = 3
+# Days off, set by the calendar rules in attendance_calendar
+LEAVE = 4
+HOLIDAY = 5
+WEEKEND = 6
+
+# Display label for each code (indexed by code)
+STATUS_LABELS = np.array(['-', 'P', 'A', 'I', 'L', 'H', 'W'], dtype=object)
+
+# First code of the unrecognised status labels; 255 is kept free for
+# "unset" cells while a pivot is being built
+OTHER_CODE = len(STATUS_LABELS)
+MAX_OTHER_LABELS = 255 - OTHER_CODE
+
+# How good each code is when duplicates compete (indexed by code):
+# P beats I beats a day off (L, H, W) beats A beats an unrecognised label
+# beats no data; among unrecognised labels the later-seen one wins
+STATUS_RANK = np.zeros(256, dtype=np.int16)
+STATUS_RANK[OTHER_CODE:] = np.arange(1, 256 - OTHER_CODE + 1)
+STATUS_RANK[:OTHER_CODE] = [0, 256, 250, 255, 254, 253, 252]
+
+# Text values recognised when the column is not numeric
+TEXT_STATUS_CODES = {
+    'P': PRESENT,
+    'PRESENT': PRESENT,
+    'TRUE': PRESENT,
+    '1': PRESENT,
+    'A': ABSENT,
+    'ABSENT': ABSENT,
+    'FALSE': ABSENT,
+    '0': ABSENT,
+    'I': INCOMPLETE,
+    'INCOMPLETE': INCOMPLETE,
+    'L': LEAVE,
+    'LEAVE': LEAVE,
+    'H': HOLIDAY,
+    'HOLIDAY': HOLIDAY,
+    'W': WEEKEND,
+    'WEEKEND': WEEKEND,
+    '-': NO_DATA,
+}
+
+# Values meaning "no status": Absent in numeric columns, no data in text columns
+MISSING_TOKENS = {'NAN', '', '-', 'NONE'}
+
+
+def _looks_numeric(text):
+    """Check if an upper-cased value reads as a number (e.g. a student ID)"""
+    return text.replace('.', '').replace('-', '').isdigit()
+
+
+def is_numeric_status(values, sample_size=10):
+    """
+    Decide whether a status column holds numbers rather than P/A text.
+
+    Only the first `sample_size` values are inspected, matching how the
+    report generator has always made this decision.
+    """
+    sample = pd.Series(values).iloc[:sample_size]
+    for value in sample:
+        text = str(value).upper()
+        if not (_looks_numeric(text) or text == 'NAN'):
+            return False
+    return True
+
+
+def _numeric_codes(raw):
+    """Vectorized codes for a numeric-dtype column in numeric mode"""
+    if raw.dtype.kind in 'iu':
+        return np.full(len(raw), PRESENT, dtype=np.uint8)
+
+    # A float only reads as digits when str() does not switch to
+    # scientific notation (|x| >= 1e16 or 0 < |x| < 1e-4)
+    magnitude = np.abs(raw)
+    with np.errstate(invalid='ignore'):
+        is_number = (magnitude == 0) | ((magnitude >= 1e-4) & (magnitude < 1e16))
+    return np.where(is_number, PRESENT, ABSENT).astype(np.uint8)
+
+
+def _other_code(text, other_labels):
+    """Code of an unrecognised status label, registering it in other_labels"""
+    if text not in other_labels:
+        if len(other_labels) >= MAX_OTHER_LABELS:
+            raise ValueError(f"More than {MAX_OTHER_LABELS} different unrecognised status values; "
+                             "is the right column selected as Status?")
+        other_labels.append(text)
+    return OTHER_CODE + other_labels.index(text)
+
+
+def _code_for_value(value, numeric, other_labels):
+    """Code for a single distinct (non-null) value"""
+    text = str(value).strip().upper()
+    if numeric:
+        if text in MISSING_TOKENS or not _looks_numeric(text):
+            return ABSENT
+        return PRESENT
+    if text in MISSING_TOKENS:
+        return NO_DATA
+    code = TEXT_STATUS_CODES.get(text)
+    return _other_code(text, other_labels) if code is None else code
+
+
+def status_codes(values, numeric=None, other_labels=None):
+    """
+    Map raw status values to uint8 attendance codes.
+
+    In numeric mode any number counts as Present and blanks as Absent
+    (exports that put an ID in the status column). Otherwise text values
+    are matched against TEXT_STATUS_CODES and blanks become NO_DATA;
+    other texts are kept as their upper-cased label, appended to the
+    `other_labels` list (pass the same list for every chunk of a report)
+    and coded OTHER_CODE + their position in it.
+    """
+    series = values if isinstance(values, pd.Series) else pd.Series(values)
+    if numeric is None:
+        numeric = is_numeric_status(series)
+    if other_labels is None:
+        other_labels = []
+
+    raw = series.to_numpy()
+    if raw.dtype.kind in 'iuf' and numeric:
+        return _numeric_codes(raw)
+    if raw.dtype.kind == 'b' and not numeric:
+        return np.where(raw, PRESENT, ABSENT).astype(np.uint8)
+
+    # Build a lookup table over the distinct values only; NaN/None get
+    # factorized to -1, which indexes the extra slot at the end
+    codes, uniques = pd.factorize(raw)
+    table = np.empty(len(uniques) + 1, dtype=np.uint8)
+    for i, value in enumerate(uniques):
+        table[i] = _code_for_value(value, numeric, other_labels)
+    table[-1] = ABSENT if numeric else NO_DATA
+    return table[codes]
+
+
+def label_table(other_labels=()):
+    """Label of every code: STATUS_LABELS followed by the unrecognised labels"""
+    return np.append(STATUS_LABELS, np.asarray(other_labels, dtype=object))
+
+
+def status_labels(codes, other_labels=()):
+    """Convert attendance codes back to their P/A/I/L/H/W/- (or unrecognised) labels"""
+    return label_table(other_labels).take(codes)
+
+
+def normalize_status(values, numeric=None):
+    """Return the status values as a categorical Series of P/A/I/L/H/W/- and unrecognised labels"""
+    series = values if isinstance(values, pd.Series) else pd.Series(values)
+    other_labels = []
+    codes = status_codes(series, numeric=numeric, other_labels=other_labels)
+    categorical = pd.Categorical.from_codes(codes, categories=label_table(other_labels))
+    return pd.Series(categorical, index=series.index, name=series.name)
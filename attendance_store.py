@@ -0,0 +1,263 @@
+"""
+On-disk history of attendance records, stored as month-partitioned Parquet.
+
+Uploads are normalized to one row per record (employee, name, timestamp,
+status) and appended to `<root>/month=YYYY-MM/records.parquet`. A record
+for an (employee, timestamp) already stored replaces the stored one, so a
+corrected re-upload wins. Reports for
+any date range are then built from the store without re-reading Excel.
+Raw device punches are kept as punches (status PUNCH) and turned into
+daily P/I/A only when a report is built, so shift settings still apply.
+
+Each month is rewritten under a lock file in its partition, through a
+temporary file of its own, so sessions saving at the same time don't lose
+each other's records.
+
+Parquet support comes from pyarrow, which Streamlit already depends on.
+"""
+import glob
+import os
+import tempfile
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+from attendance_calendar import apply_calendar
+from attendance_dates import parse_dates
+from attendance_ingest import PivotAccumulator
+from attendance_punches import parse_punch_times, summarize_punches
+from attendance_status import ABSENT, NO_DATA, OTHER_CODE, status_codes
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+DEFAULT_STORE_DIR = os.environ.get('ATTENDANCE_STORE_DIR', 'attendance_store')
+
+STORE_COLUMNS = ['employee', 'name', 'timestamp', 'status']
+DEDUPE_COLUMNS = ['employee', 'timestamp']
+
+# Status of a raw device punch (its daily status is derived at report time)
+PUNCH = 255
+
+
+def _as_text(values):
+    """Identifiers as strings; whole floats (e.g. 12.0 from Excel) lose the '.0'"""
+    values = pd.Series(values).reset_index(drop=True)
+    if pd.api.types.is_float_dtype(values) and (values.dropna() % 1 == 0).all():
+        values = values.astype('Int64')
+    return values.astype(str)
+
+
+@contextmanager
+def _locked(path):
+    """Hold an exclusive lock on the file `path` (created if missing), across processes"""
+    with open(path, 'a+b') as handle:
+        if fcntl is not None:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+        else:
+            handle.seek(0)
+            msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+            else:
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _records(source, employee, names, timestamps, status):
+    """
+    (records, rejected): the normalized records and the rows of `source`
+    that could not be stored (no ID, name or readable date/time, or a
+    status the store has no code for)
+    """
+    records = pd.DataFrame({
+        'employee': pd.Series(employee).reset_index(drop=True),
+        'name': pd.Series(names).reset_index(drop=True),
+        'timestamp': pd.Series(timestamps).reset_index(drop=True),
+        'status': np.asarray(status, dtype=np.uint8),
+    })
+    complete = (records['employee'].notna() & records['name'].notna() & records['timestamp'].notna()).to_numpy()
+    complete &= (records['status'] < OTHER_CODE).to_numpy() | (records['status'] == PUNCH).to_numpy()
+    records = records[complete]
+    records['employee'] = _as_text(records['employee'])
+    records['name'] = records['name'].astype(str).to_numpy()
+    return records.reset_index(drop=True)[STORE_COLUMNS], source[~complete]
+
+
+def punch_records(df, name_col, time_col, id_col=None):
+    """
+    Normalize a raw punch log (one row per punch) for the store.
+    Returns (records, rejected rows of `df`).
+    """
+    employee = df[id_col] if id_col else df[name_col]
+    return _records(df, employee, df[name_col], parse_punch_times(df[time_col]),
+                    np.full(len(df), PUNCH, dtype=np.uint8))
+
+
+def status_records(df, name_col, date_col, status_col, roll_col=None):
+    """
+    Normalize Name / Date / Status records for the store (timestamp = the day).
+    Returns (records, rejected rows of `df`); rows with an unrecognised
+    status are rejected, as the store only keeps the standard codes.
+    """
+    employee = df[roll_col] if roll_col else df[name_col]
+    dates = parse_dates(df[date_col])
+    return _records(df, employee, df[name_col], dates.dt.normalize(), status_codes(df[status_col]))
+
+
+class AttendanceStore:
+    """Month-partitioned Parquet store of normalized attendance records"""
+
+    def __init__(self, root=DEFAULT_STORE_DIR):
+        self.root = root
+
+    def _path(self, month):
+        return os.path.join(self.root, f'month={month}', 'records.parquet')
+
+    def version(self):
+        """
+        Changes whenever records are saved: each stored month with its
+        file's inode, size and modification time (every save replaces the file)
+        """
+        stats = [(month, os.stat(self._path(month))) for month in self.months()]
+        return tuple((month, stat.st_ino, stat.st_size, stat.st_mtime_ns) for month, stat in stats)
+
+    def months(self):
+        """Stored months as 'YYYY-MM' strings, oldest first"""
+        paths = glob.glob(os.path.join(self.root, 'month=*', 'records.parquet'))
+        return sorted(os.path.basename(os.path.dirname(path))[len('month='):] for path in paths)
+
+    def __bool__(self):
+        return bool(self.months())
+
+    def _read_month(self, month):
+        path = self._path(month)
+        if not os.path.exists(path):
+            return pd.DataFrame({col: pd.Series(dtype=dtype) for col, dtype in
+                                 zip(STORE_COLUMNS, [object, object, 'datetime64[ns]', np.uint8])})
+        return pd.read_parquet(path)
+
+    def append(self, records):
+        """
+        Add normalized records. A record for an (employee, timestamp) pair
+        already stored replaces it (the last one wins within `records` too).
+        Each touched month is read, merged and rewritten atomically while
+        holding that month's lock.
+
+        Returns (added, updated, unchanged) record counts: new pairs, stored
+        records whose name or status changed, and records already stored as
+        they are.
+        """
+        added = updated = 0
+        months = records['timestamp'].dt.strftime('%Y-%m')
+        for month, new in records.groupby(months.to_numpy(), sort=True):
+            path = self._path(month)
+            folder = os.path.dirname(path)
+            os.makedirs(folder, exist_ok=True)
+            with _locked(os.path.join(folder, '.lock')):
+                existing = self._read_month(month)
+                new = new.drop_duplicates(DEDUPE_COLUMNS, keep='last')
+                stored = new.merge(existing, on=DEDUPE_COLUMNS, suffixes=('', '_stored'))
+                changed = int(((stored['name'] != stored['name_stored'])
+                               | (stored['status'] != stored['status_stored'])).sum())
+                added += len(new) - len(stored)
+                updated += changed
+                if len(new) == len(stored) and not changed:
+                    continue
+
+                merged = pd.concat([existing, new], ignore_index=True)
+                merged = merged.drop_duplicates(DEDUPE_COLUMNS, keep='last')
+
+                merged = merged.sort_values('timestamp', kind='stable')
+                handle, temporary = tempfile.mkstemp(prefix='records.', suffix='.tmp', dir=folder)
+                os.close(handle)
+                try:
+                    merged.to_parquet(temporary, index=False)
+                    os.replace(temporary, path)
+                except BaseException:
+                    os.remove(temporary)
+                    raise
+        return added, updated, len(records) - added - updated
+
+    def read(self, start=None, end=None):
+        """Records with start <= day <= end (either bound may be None)"""
+        start = pd.Timestamp(start) if start is not None else None
+        end = pd.Timestamp(end) + pd.Timedelta(days=1) if end is not None else None
+        months = [
+            month for month in self.months()
+            if (start is None or month >= start.strftime('%Y-%m'))
+            and (end is None or month <= end.strftime('%Y-%m'))
+        ]
+        frames = [self._read_month(month) for month in months]
+        if not frames:
+            return self._read_month(None)
+        records = pd.concat(frames, ignore_index=True)
+        mask = np.ones(len(records), dtype=bool)
+        if start is not None:
+            mask &= (records['timestamp'] >= start).to_numpy()
+        if end is not None:
+            mask &= (records['timestamp'] < end).to_numpy()
+        return records[mask].reset_index(drop=True)
+
+    def date_range(self):
+        """(first, last) stored day, or (None, None) for an empty store"""
+        months = self.months()
+        if not months:
+            return None, None
+        first = self._read_month(months[0])['timestamp'].min()
+        last = self._read_month(months[-1])['timestamp'].max()
+        return first.normalize(), last.normalize()
+
+    def matrix(self, start=None, end=None, shift=None, calendar=None):
+        """
+        Build the report for a date range as an AttendanceMatrix.
+
+        Punches are summarized per day with `shift` (summarize_punches
+        keyword arguments). When the range holds only punches, days
+        without a punch are Absent, as in punch_matrix. A `calendar`
+        (attendance_calendar) marks weekends, holidays and leave.
+        """
+        records = self.read(start, end)
+        punches = records[records['status'] == PUNCH]
+        statuses = records[records['status'] != PUNCH]
+
+        daily = [pd.DataFrame({
+            'employee': statuses['employee'],
+            'name': statuses['name'],
+            'date': statuses['timestamp'].dt.normalize(),
+            'code': statuses['status'],
+        })]
+        if len(punches):
+            summary = summarize_punches(punches, 'name', 'timestamp', id_col='employee', calendar=calendar,
+                                        **(shift or {}))
+            daily.append(pd.DataFrame({
+                'employee': summary['Roll No'],
+                'name': summary['Student Name'],
+                'date': summary['Date'],
+                'code': summary['_status_code'],
+            }))
+        daily = pd.concat(daily, ignore_index=True)
+
+        has_ids = bool((daily['employee'] != daily['name']).any())
+        try:
+            # Numeric roll numbers / device IDs sort and display as numbers
+            daily['employee'] = pd.to_numeric(daily['employee'])
+        except (ValueError, TypeError):
+            pass
+        accumulator = PivotAccumulator()
+        accumulator.add(daily['name'], daily['date'], daily['code'].to_numpy(np.uint8),
+                        rolls=daily['employee'] if has_ids else None)
+        matrix = accumulator.matrix()
+
+        codes = matrix.codes
+        if statuses.empty:
+            codes = np.where(codes == NO_DATA, ABSENT, codes).astype(np.uint8)
+        matrix = matrix.with_codes(codes)
+        return apply_calendar(matrix, calendar) if calendar is not None else matrix
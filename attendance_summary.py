@@ -0,0 +1,118 @@
+"""
+Pre-aggregated summary and analytics tables for an attendance report.
+
+Everything is derived from the integer-coded matrix (see attendance_matrix)
+in whole-array operations: attendance_totals.status_counts gives every
+student's and every date's count per status, week and month rollups are
+sums of the per-date counts, and the longest absence streak of every
+student comes from running sums along the date axis. Counts are turned
+into absent days and attendance % by attendance_totals.totals_table, as
+for the report totals. Days off (leave, holidays, weekends) neither
+extend nor break a streak; 'A' and '-' count as absent, as in the report
+totals.
+"""
+import numpy as np
+import pandas as pd
+
+from attendance_dates import REPORT_DATE_FORMAT, report_label_days
+from attendance_matrix import as_attendance_matrix
+from attendance_status import ABSENT, INCOMPLETE, NO_DATA, PRESENT
+from attendance_totals import COUNT_SLOTS, status_counts, totals_table
+
+# Students attending less than this share of their counted days are chronic absentees
+CHRONIC_ATTENDANCE_PERCENT = 90.0
+
+# Summary tables in the order they are shown and exported
+SUMMARY_SHEETS = ['Student Summary', 'Daily Rates', 'Weekly Rollup', 'Monthly Rollup', 'Chronic Absentees']
+
+# Summary names of the totals_table columns
+_COUNT_COLUMNS = {
+    'Present Days': 'Present',
+    'Absent Days': 'Absent',
+    'No Data Days': 'No Data',
+    'Incomplete Days': 'Incomplete',
+    'Leave Days': 'Leave',
+    'Holiday Days': 'Holiday',
+    'Weekend Days': 'Weekend',
+}
+
+
+def _count_table(counts):
+    """totals_table of status counts, with the summary's column names"""
+    return totals_table(counts).rename(columns=_COUNT_COLUMNS)
+
+
+def absence_streaks(codes):
+    """
+    Longest run of absent days per row and the column where it ends
+    (-1 for rows with no absence). Days off are skipped over.
+    """
+    codes = np.asarray(codes)
+    rows, days = codes.shape
+    if not days:
+        return np.zeros(rows, dtype=np.int32), np.full(rows, -1)
+    absent = (codes == ABSENT) | (codes == NO_DATA)
+    attended = (codes == PRESENT) | (codes == INCOMPLETE)
+    # Absent days so far, with a leading 0 column for "before the first date"
+    absent_so_far = np.zeros((rows, days + 1), dtype=np.int32)
+    np.cumsum(absent, axis=1, out=absent_so_far[:, 1:])
+    # Last attended column at or before each column (-1 = none yet)
+    last_attended = np.maximum.accumulate(np.where(attended, np.arange(days), -1), axis=1)
+    run = absent_so_far[:, 1:] - np.take_along_axis(absent_so_far, last_attended + 1, axis=1)
+    end = run.argmax(axis=1)
+    longest = run[np.arange(rows), end]
+    return longest, np.where(longest > 0, end, -1)
+
+
+def _period_rollup(daily_counts, days, period, label_format, label):
+    """Sum the per-date status counts of the dates falling in each week or month"""
+    parsed = days.notna().to_numpy()
+    starts = days[parsed].dt.to_period(period).dt.start_time.to_numpy()
+    periods, groups = np.unique(starts, return_inverse=True)
+    counts = np.zeros((len(periods), COUNT_SLOTS), dtype=np.int64)
+    np.add.at(counts, groups, daily_counts[parsed])
+    rollup = _count_table(counts)
+    rollup.insert(0, 'Dates', np.bincount(groups, minlength=len(periods)))
+    rollup.insert(0, label, pd.DatetimeIndex(periods).strftime(label_format))
+    return rollup
+
+
+def summarize_report(report, chronic_below=CHRONIC_ATTENDANCE_PERCENT):
+    """
+    Summary tables for a report (AttendanceMatrix or report DataFrame),
+    keyed by SUMMARY_SHEETS name:
+
+    - 'Student Summary': per-student counts, attendance % and longest absence streak
+    - 'Daily Rates': per-date counts and attendance rate
+    - 'Weekly Rollup' / 'Monthly Rollup': the daily counts summed per week
+      (starting Monday) and per month; empty when the dates don't parse
+    - 'Chronic Absentees': students below `chronic_below` % attendance,
+      lowest first
+    """
+    matrix = as_attendance_matrix(report)
+    codes = matrix.codes
+    dates = list(matrix.dates)
+
+    students = matrix.students.copy()
+    student_counts = _count_table(status_counts(codes, axis=1))
+    longest, end = absence_streaks(codes)
+    students = pd.concat([students, student_counts], axis=1)
+    students['Longest Absence Streak'] = longest
+    date_array = np.array(dates + [''], dtype=object)
+    students['Streak Ends'] = date_array[end]
+
+    daily_counts = status_counts(codes, axis=0)
+    daily = _count_table(daily_counts)
+    daily.insert(0, 'Date', dates)
+
+    days = report_label_days(dates)
+    weekly = _period_rollup(daily_counts, days, 'W-SUN', REPORT_DATE_FORMAT, 'Week Of')
+    monthly = _period_rollup(daily_counts, days, 'M', '%b %Y', 'Month')
+
+    counted = students['Total Days'] > 0
+    chronic = students[counted & (students['Attendance %'] < chronic_below)]
+    chronic = chronic.sort_values(['Attendance %', 'Longest Absence Streak'], ascending=[True, False], kind='stable')
+    chronic = chronic[['Roll No', 'Student Name', 'Present', 'Absent', 'Total Days', 'Attendance %',
+                       'Longest Absence Streak', 'Streak Ends']].reset_index(drop=True)
+
+    return dict(zip(SUMMARY_SHEETS, [students, daily, weekly, monthly, chronic]))
@@ -0,0 +1,134 @@
+"""
+Per-student attendance totals.
+
+All totals are computed on the integer-coded attendance matrix (see
+attendance_status) with one `(matrix == code).sum(axis=1)` reduction per
+status, instead of looping over rows and date columns in Python. The
+step from those counts to totals (totals_table) also serves the per-date
+and per-period tables of attendance_summary, so absent days and the
+attendance percentage are defined, and rounded, in one place.
+"""
+import numpy as np
+import pandas as pd
+
+from attendance_status import (ABSENT, HOLIDAY, INCOMPLETE, LEAVE, NO_DATA, OTHER_CODE, PRESENT, WEEKEND,
+                               status_codes, status_labels)
+
+# Non-date columns of a report DataFrame
+REPORT_ID_COLUMNS = ['Roll No', 'Student Name']
+REPORT_TOTAL_COLUMNS = ['Total Present', 'Total Absent']
+
+# Decimals kept in 'Attendance %'
+ATTENDANCE_DECIMALS = 2
+
+# Columns of status_counts: one per code, unrecognised labels share the last
+COUNT_SLOTS = OTHER_CODE + 1
+
+
+def report_date_columns(df):
+    """Return the attendance (date) columns of a report DataFrame"""
+    return [col for col in df.columns if col not in REPORT_ID_COLUMNS + REPORT_TOTAL_COLUMNS]
+
+
+def report_codes(df, date_columns=None, other_labels=None):
+    """
+    Encode the P/A/I/L/H/W/- cells of a report as a uint8 matrix (rows x
+    dates); other labels are registered in `other_labels` (see status_codes).
+    """
+    if date_columns is None:
+        date_columns = report_date_columns(df)
+    cells = df[date_columns].to_numpy(dtype=object).ravel()
+    codes = status_codes(pd.Series(cells, dtype=object), numeric=False, other_labels=other_labels)
+    return codes.reshape(len(df), len(date_columns))
+
+
+def status_counts(codes, axis=1):
+    """
+    Count every status along `axis` of an attendance code matrix: per row
+    (axis=1) or per date column (axis=0). Returns an int64 array with one
+    row per row/column and COUNT_SLOTS columns indexed by code.
+    """
+    codes = np.asarray(codes)
+    counts = [(codes == code).sum(axis=axis) for code in range(OTHER_CODE)]
+    counts.append((codes >= OTHER_CODE).sum(axis=axis))
+    return np.stack(counts, axis=1).astype(np.int64)
+
+
+def totals_table(counts):
+    """
+    Totals from status counts (see status_counts), one row per counted
+    row, date or period.
+
+    'Absent Days' includes both 'A' and '-' (no data), as in the report
+    totals; 'Attendance %' is present days over present + absent days.
+    Leave, holidays, weekends and unrecognised labels count as neither.
+    """
+    counts = np.asarray(counts)
+    present = counts[:, PRESENT]
+    no_data = counts[:, NO_DATA]
+    absent_days = counts[:, ABSENT] + no_data
+    total_days = present + absent_days
+    percentage = np.zeros(len(counts), dtype=float)
+    np.divide(present * 100, total_days, out=percentage, where=total_days > 0)
+
+    return pd.DataFrame({
+        'Present Days': present,
+        'Absent Days': absent_days,
+        'No Data Days': no_data,
+        'Incomplete Days': counts[:, INCOMPLETE],
+        'Leave Days': counts[:, LEAVE],
+        'Holiday Days': counts[:, HOLIDAY],
+        'Weekend Days': counts[:, WEEKEND],
+        'Total Days': total_days,
+        'Attendance %': percentage.round(ATTENDANCE_DECIMALS),
+    })
+
+
+def compute_totals(codes):
+    """Count statuses per row of an attendance code matrix (see totals_table)"""
+    return totals_table(status_counts(codes))
+
+
+def edited_row_positions(edited_rows):
+    """Row positions touched in a st.data_editor 'edited_rows' state"""
+    return sorted(int(row) for row in edited_rows)
+
+
+def update_report_totals(df, rows, date_columns=None):
+    """
+    Recalculate 'Total Present' / 'Total Absent' in place for the given
+    row positions only (e.g. the rows changed in the editor).
+
+    Returns how much the overall (present, absent) sums changed, so
+    report-wide metrics can be adjusted without re-summing every row.
+    """
+    rows = np.asarray(rows, dtype=np.int64)
+    if not len(rows):
+        return 0, 0
+    if date_columns is None:
+        date_columns = report_date_columns(df)
+    totals = compute_totals(report_codes(df.iloc[rows], date_columns))
+
+    deltas = []
+    for column, total in [('Total Present', 'Present Days'), ('Total Absent', 'Absent Days')]:
+        position = df.columns.get_loc(column)
+        new_values = totals[total].to_numpy()
+        deltas.append(int((new_values - df.iloc[rows, position].to_numpy(dtype=np.int64)).sum()))
+        df.iloc[rows, position] = new_values
+    return tuple(deltas)
+
+
+def build_report(students, date_labels, codes, other_labels=()):
+    """
+    Assemble a report DataFrame from an attendance code matrix.
+
+    `students` has one 'Roll No' / 'Student Name' row per matrix row,
+    `date_labels` names the matrix columns and `other_labels` holds the
+    report's unrecognised status labels.
+    """
+    report = students[REPORT_ID_COLUMNS].reset_index(drop=True)
+    totals = compute_totals(codes)
+    report['Total Present'] = totals['Present Days'].to_numpy()
+    report['Total Absent'] = totals['Absent Days'].to_numpy()
+    attendance = pd.DataFrame(status_labels(codes, other_labels), columns=list(date_labels))
+    return pd.concat([report, attendance], axis=1)
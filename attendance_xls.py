@@ -0,0 +1,376 @@
+"""
+Fast reader for legacy BIFF .xls exports from ZKTeco software.
+
+ZKTeco writes BIFF2 worksheets (e.g. may-july7.xls): a flat stream of
+small cell records. read_xls() walks that stream once, collecting only
+cell, format and codepage records, decodes all labels in one call and
+builds each column as a typed NumPy array (numbers, dates decoded in bulk
+from Excel serials, text). Anything else (BIFF5/8 workbooks inside an
+OLE2 container, formulas) goes through xlrd opened on demand, with its
+cells also converted column-wise.
+
+The result matches pd.read_excel(engine='xlrd'): first row as header,
+pandas' default NA strings, numeric text and TRUE/FALSE text converted
+like pandas' parser does.
+"""
+import codecs
+import io
+import os
+import struct
+
+import numpy as np
+import pandas as pd
+
+from attendance_ingest import _header_names
+
+# Cell kinds in the decoded cell grid
+EMPTY = 0
+NUMBER = 1
+DATE = 2
+TEXT = 3
+BOOLEAN = 4
+
+# pandas' default na_values for text cells
+NA_STRINGS = frozenset([
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+    '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null',
+])
+TRUE_STRINGS = frozenset(['True', 'TRUE', 'true'])
+FALSE_STRINGS = frozenset(['False', 'FALSE', 'false'])
+
+# Excel's day zero for the 1900 and 1904 date systems
+EPOCHS = {0: np.datetime64('1899-12-30', 'ms'), 1: np.datetime64('1904-01-01', 'ms')}
+
+# A BIFF2 file is a single worksheet; this is the name xlrd gives it
+BIFF2_SHEET_NAME = 'Sheet 1'
+
+OLE2_SIGNATURE = b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1'
+
+# BIFF2 record types
+_BOF2 = 0x0009
+_BOF8 = 0x0809
+_EOF = 0x000A
+_BLANK = 0x0001
+_INTEGER = 0x0002
+_NUMBER = 0x0003
+_LABEL = 0x0004
+_BOOLERR = 0x0005
+_FORMAT = 0x001E
+_DATEMODE = 0x0022
+_CODEPAGE = 0x0042
+_XF = 0x0043
+_IXFE = 0x0044
+
+# Cell records this reader does not decode (formulas, BIFF3+ cells): use xlrd
+_UNSUPPORTED = {0x0006, 0x0007, 0x0206, 0x0406, 0x0201, 0x0203, 0x0204, 0x0205, 0x027E, 0x00BD, 0x00BE, 0x00FD, 0x00D6}
+
+# Packed layouts of the fixed-size cell records (after the 4-byte header)
+_CELL = [('row', '<u2'), ('col', '<u2'), ('attr', 'V3')]
+_RECORD_DTYPES = {
+    _BLANK: np.dtype(_CELL),
+    _INTEGER: np.dtype(_CELL + [('value', '<u2')]),
+    _NUMBER: np.dtype(_CELL + [('value', '<f8')]),
+    _BOOLERR: np.dtype(_CELL + [('value', 'u1'), ('error', 'u1')]),
+}
+
+_CODEPAGES = {367: 'ascii', 10000: 'mac_roman', 32768: 'mac_roman', 32769: 'cp1252'}
+
+
+class _Fallback(Exception):
+    """The stream needs the general xlrd path"""
+
+
+def is_date_format(fmt):
+    """Whether a number format string displays a date or time (xlrd's heuristic, simplified)"""
+    text = []
+    quoted = escaped = bracket = False
+    for char in fmt:
+        if escaped:
+            escaped = False
+        elif quoted:
+            quoted = char != '"'
+        elif bracket:
+            bracket = char != ']'
+        elif char == '"':
+            quoted = True
+        elif char in '\\_*':
+            escaped = True
+        elif char == '[':
+            bracket = True
+        else:
+            text.append(char.lower())
+    text = ''.join(text)
+    if text.replace('general', '') != text:
+        return False
+    dates = sum(text.count(char) for char in 'ymdhs')
+    numbers = sum(text.count(char) for char in '0#?')
+    return dates > numbers
+
+
+def _gather(data, offsets, dtype):
+    """Read fixed-size records starting at `offsets` into a structured array"""
+    offsets = np.asarray(offsets, dtype=np.int64)
+    if not len(offsets):
+        return np.empty(0, dtype=dtype)
+    raw = np.frombuffer(data, dtype=np.uint8)
+    return raw[offsets[:, None] + np.arange(dtype.itemsize)].copy().view(dtype).ravel()
+
+
+def _decode_labels(data, offsets, encoding):
+    """
+    Text of the LABEL records at `offsets`: all payloads are gathered into
+    one NUL-separated buffer and decoded with a single call
+    """
+    if not len(offsets):
+        return []
+    raw = np.frombuffer(data, dtype=np.uint8)
+    lengths = raw[offsets + 7].astype(np.int64)
+    starts = offsets + 8
+    # Each payload plus one byte that becomes the separator
+    spans = lengths + 1
+    ends = np.cumsum(spans)
+    index = np.arange(ends[-1]) + np.repeat(starts - (ends - spans), spans)
+    buffer = raw[np.minimum(index, len(raw) - 1)]
+    buffer[ends - 1] = 0
+    texts = buffer[:-1].tobytes().decode(encoding).split('\x00')
+    if len(texts) != len(offsets):
+        # A label containing NUL itself
+        texts = [data[start:start + size].decode(encoding) for start, size in zip(starts.tolist(), lengths.tolist())]
+    return texts
+
+
+def _format_keys(attrs, xf_formats):
+    """Number-format index of each cell from its 3 attribute bytes"""
+    attrs = np.frombuffer(attrs.tobytes(), dtype=np.uint8).reshape(-1, 3)
+    if xf_formats is None:
+        # BIFF 2.0: the format index sits in the second attribute byte
+        return attrs[:, 1] & 0x3F
+    xf = (attrs[:, 0] & 0x3F).astype(np.int64)
+    return np.asarray(xf_formats, dtype=np.int64)[np.clip(xf, 0, len(xf_formats) - 1)]
+
+
+def _is_biff2(data):
+    """A bare BIFF2 worksheet stream: BOF 0x0009, or the 0x0809 BOF with version 0 that ZKTeco writes"""
+    if len(data) < 8 or data.startswith(OLE2_SIGNATURE):
+        return False
+    code, _, version = struct.unpack_from('<HHH', data)
+    return code == _BOF2 or (code == _BOF8 and version == 0)
+
+
+def _read_biff2(data):
+    """Decode a BIFF2 worksheet stream into cell grids (kinds, numbers, texts) and its datemode"""
+    offsets = {code: [] for code in (_BLANK, _INTEGER, _NUMBER, _BOOLERR)}
+    labels = []
+    formats = []
+    xf_formats = []
+    ixfe_cells = False
+    datemode = 0
+    encoding = 'iso-8859-1'  # what xlrd assumes without a CODEPAGE record
+
+    unpack = struct.Struct('<HH').unpack_from
+    position = 0
+    end = len(data)
+    while position + 4 <= end:
+        code, length = unpack(data, position)
+        body = position + 4
+        position = body + length
+        if code == _LABEL:
+            labels.append(body)
+        elif code in offsets:
+            offsets[code].append(body)
+        elif code == _EOF:
+            break
+        elif code in _UNSUPPORTED:
+            raise _Fallback(f"record 0x{code:04X}")
+        elif code == _FORMAT:
+            formats.append(data[body + 1:body + 1 + data[body]])
+        elif code == _XF:
+            xf_formats.append(data[body + 2] & 0x3F)
+        elif code == _IXFE:
+            ixfe_cells = True
+        elif code == _DATEMODE:
+            datemode = struct.unpack_from('<H', data, body)[0]
+        elif code == _CODEPAGE:
+            codepage = struct.unpack_from('<H', data, body)[0]
+            encoding = _CODEPAGES.get(codepage, f'cp{codepage}')
+            try:
+                codecs.lookup(encoding)
+            except LookupError:
+                raise _Fallback(f"codepage {codepage}")
+    if ixfe_cells:
+        # Cells taking their XF from IXFE records are rare; xlrd tracks them
+        raise _Fallback("IXFE records")
+
+    date_formats = np.array([is_date_format(fmt.decode(encoding, 'replace')) for fmt in formats] + [False])
+    xf_formats = xf_formats or None
+
+    cells = {code: _gather(data, offsets[code], dtype) for code, dtype in _RECORD_DTYPES.items()}
+    label_offsets = np.asarray(labels, dtype=np.int64)
+    label_cells = _gather(data, label_offsets, np.dtype(_CELL))
+    texts = _decode_labels(data, label_offsets, encoding)
+
+    all_rows = [cells[code]['row'] for code in cells] + [label_cells['row']]
+    all_cols = [cells[code]['col'] for code in cells] + [label_cells['col']]
+    nrows = int(max((rows.max() + 1 for rows in all_rows if len(rows)), default=0))
+    ncols = int(max((cols.max() + 1 for cols in all_cols if len(cols)), default=0))
+
+    kinds = np.zeros((nrows, ncols), dtype=np.int8)
+    numbers = np.full((nrows, ncols), np.nan)
+    strings = np.full((nrows, ncols), None, dtype=object)
+
+    for code in (_INTEGER, _NUMBER):
+        records = cells[code]
+        is_date = date_formats[np.minimum(_format_keys(records['attr'], xf_formats), len(date_formats) - 1)]
+        kinds[records['row'], records['col']] = np.where(is_date, DATE, NUMBER)
+        numbers[records['row'], records['col']] = records['value']
+    booleans = cells[_BOOLERR]
+    values = booleans[booleans['error'] == 0]
+    kinds[values['row'], values['col']] = BOOLEAN
+    numbers[values['row'], values['col']] = values['value']
+    if len(texts):
+        kinds[label_cells['row'], label_cells['col']] = TEXT
+        strings[label_cells['row'], label_cells['col']] = np.array(texts, dtype=object)
+    return kinds, numbers, strings, datemode
+
+
+def _read_with_xlrd(data, sheet):
+    """Cell grids through xlrd (any BIFF version), read column by column"""
+    import xlrd
+
+    book = xlrd.open_workbook(file_contents=data, on_demand=True, logfile=io.StringIO())
+    try:
+        worksheet = book.sheet_by_name(sheet) if isinstance(sheet, str) else book.sheet_by_index(sheet)
+        kinds = np.zeros((worksheet.nrows, worksheet.ncols), dtype=np.int8)
+        numbers = np.full(kinds.shape, np.nan)
+        strings = np.full(kinds.shape, None, dtype=object)
+        xlrd_kinds = np.zeros(8, dtype=np.int8)
+        xlrd_kinds[[xlrd.XL_CELL_NUMBER, xlrd.XL_CELL_DATE, xlrd.XL_CELL_TEXT, xlrd.XL_CELL_BOOLEAN]] = \
+            [NUMBER, DATE, TEXT, BOOLEAN]
+        for col in range(worksheet.ncols):
+            column_kinds = xlrd_kinds[np.asarray(worksheet.col_types(col), dtype=np.int64)]
+            values = np.array(worksheet.col_values(col), dtype=object)
+            numeric = (column_kinds == NUMBER) | (column_kinds == DATE) | (column_kinds == BOOLEAN)
+            kinds[:, col] = column_kinds
+            numbers[numeric, col] = values[numeric].astype(np.float64)
+            strings[column_kinds == TEXT, col] = values[column_kinds == TEXT]
+        return kinds, numbers, strings, book.datemode
+    finally:
+        book.release_resources()
+
+
+def _excel_dates(serials, datemode):
+    """Excel serial day numbers -> datetime64 (millisecond rounding, like xlrd)"""
+    missing = np.isnan(serials)
+    serials = np.where(missing, 0.0, serials)
+    days = np.floor(serials)
+    millis = days.astype(np.int64) * 86_400_000 + np.round((serials - days) * 86_400_000).astype(np.int64)
+    dates = (EPOCHS[datemode] + millis.astype('timedelta64[ms]')).astype('datetime64[ns]')
+    dates[missing] = np.datetime64('NaT')
+    return dates
+
+
+def _scalar(kind, number, text, datemode):
+    """One cell as the Python value xlrd/pandas would give"""
+    if kind == TEXT:
+        return np.nan if text in NA_STRINGS else text
+    if kind == BOOLEAN:
+        return bool(number)
+    if kind == DATE and number < 1:
+        # Time-only cells come out of xlrd as datetime.time
+        return pd.Timestamp(_excel_dates(np.array([number]), datemode)[0]).time()
+    if kind == DATE:
+        return pd.Timestamp(_excel_dates(np.array([number]), datemode)[0]).to_pydatetime()
+    if kind == NUMBER:
+        return int(number) if number == int(number) else number
+    return np.nan
+
+
+def _column(kinds, numbers, texts, datemode):
+    """Build one typed column from its cell kinds and values"""
+    present = kinds != EMPTY
+    if not present.any():
+        return np.full(len(kinds), np.nan)
+    missing = not present.all()
+    filled = kinds[present]
+
+    if (filled == NUMBER).all():
+        if not missing and np.array_equal(numbers, np.floor(numbers)) and np.abs(numbers).max(initial=0) < 2**63:
+            return numbers.astype(np.int64)
+        return numbers
+    if (filled == DATE).all() and (numbers[present] >= 1).all():
+        return _excel_dates(numbers, datemode)
+    if (filled == BOOLEAN).all() and not missing:
+        return numbers.astype(bool)
+    if (filled == TEXT).all():
+        values = texts.copy()
+        values[~present] = np.nan
+        return _infer_text(values, present)
+    values = np.array([_scalar(kind, number, text, datemode)
+                       for kind, number, text in zip(kinds, numbers, texts)], dtype=object)
+    return _infer_text(values, np.zeros(len(values), dtype=bool))
+
+
+def _infer_text(values, text):
+    """
+    pandas' parser inference for object columns: NA strings (in the cells
+    flagged by `text`) become NaN, then numbers, then TRUE/FALSE
+    """
+    if text.any():
+        na = np.zeros(len(values), dtype=bool)
+        na[text] = [value in NA_STRINGS for value in values[text]]
+        values[na] = np.nan
+    valid = pd.notna(values)
+    if not valid.any():
+        return np.full(len(values), np.nan)
+    try:
+        return pd.to_numeric(values)
+    except (ValueError, TypeError):
+        pass
+    if valid.all() and all(value in TRUE_STRINGS or value in FALSE_STRINGS for value in values):
+        return np.array([value in TRUE_STRINGS for value in values])
+    return values
+
+
+def _source_bytes(source):
+    if isinstance(source, (bytes, bytearray)):
+        return bytes(source)
+    if hasattr(source, 'read'):
+        if hasattr(source, 'seek'):
+            source.seek(0)
+        data = source.read()
+        if hasattr(source, 'seek'):
+            source.seek(0)
+        return data
+    with open(os.fspath(source), 'rb') as handle:
+        return handle.read()
+
+
+def read_xls(source, sheet=0):
+    """
+    Read one sheet of a legacy .xls file into a DataFrame.
+
+    `source` is a path, raw bytes or a file-like object; `sheet` an index
+    or a sheet name. Same result as pd.read_excel(source, engine='xlrd').
+    """
+    data = _source_bytes(source)
+    grid = None
+    if sheet in (0, None, BIFF2_SHEET_NAME) and _is_biff2(data):
+        try:
+            grid = _read_biff2(data)
+        except _Fallback:
+            grid = None
+    if grid is None:
+        grid = _read_with_xlrd(data, 0 if sheet is None else sheet)
+    kinds, numbers, strings, datemode = grid
+
+    if not len(kinds):
+        return pd.DataFrame()
+    header = [text if kind == TEXT else None if kind == EMPTY else _scalar(kind, number, text, datemode)
+              for kind, number, text in zip(kinds[0], numbers[0], strings[0])]
+    columns = _header_names(header)
+
+    body_kinds, body_numbers, body_strings = kinds[1:], numbers[1:], strings[1:]
+    return pd.DataFrame({
+        name: _column(body_kinds[:, col], body_numbers[:, col], body_strings[:, col], datemode)
+        for col, name in enumerate(columns)
+    })
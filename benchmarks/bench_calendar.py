@@ -0,0 +1,108 @@
+"""
+Benchmark the calendar status engine (attendance_calendar) on a full year
+for thousands of employees: building the rule index and classifying
+every employee-day, against a per-cell Python reference on a small
+report (which must give the same codes).
+
+Run from the repository root:
+    python benchmarks/bench_calendar.py [employees] [days]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from attendance_calendar import AttendanceCalendar, apply_calendar, employee_key
+from attendance_matrix import AttendanceMatrix
+from attendance_status import ABSENT, HOLIDAY, LEAVE, NO_DATA, WEEKEND
+
+START_DATE = '2025-01-01'
+
+
+def make_report(employees, days, seed=0):
+    """Random P/A/I/- report for `employees` over `days` consecutive days"""
+    rng = np.random.default_rng(seed)
+    students = pd.DataFrame({'Roll No': np.arange(1, employees + 1),
+                             'Student Name': [f"Employee {i:05d}" for i in range(1, employees + 1)]})
+    dates = pd.date_range(START_DATE, periods=days).strftime('%m/%d/%Y')
+    codes = rng.choice(np.array([0, 1, 2, 3], dtype=np.uint8), size=(employees, days), p=[0.1, 0.6, 0.2, 0.1])
+    return AttendanceMatrix(students, dates, codes)
+
+
+def make_calendar(employees, days, seed=0):
+    """Fixed holidays, a Friday weekend for some employees and one leave period per 3 employees"""
+    rng = np.random.default_rng(seed)
+    start = np.datetime64(START_DATE)
+    rules = [{'rule': 'weekend', 'value': 'Saturday Sunday'},
+             {'rule': 'workday', 'start': str(start + 33)}]
+    for offset in range(0, days, 37):
+        rules.append({'rule': 'holiday', 'start': str(start + offset), 'value': 'Holiday'})
+    for employee in range(1, employees + 1, 10):
+        rules.append({'rule': 'weekend', 'employee': employee, 'value': 'Friday Saturday'})
+    for employee in range(1, employees + 1, 3):
+        first = int(rng.integers(0, days))
+        rules.append({'rule': 'leave', 'employee': employee, 'start': str(start + first),
+                      'end': str(start + min(days - 1, first + int(rng.integers(0, 10))))})
+    return AttendanceCalendar.from_rules(rules)
+
+
+def reference_codes(matrix, calendar):
+    """Classify cell by cell in Python (what the engine replaces)"""
+    codes = matrix.codes.copy()
+    days = [pd.Timestamp(label).date() for label in matrix.dates]
+    for row, roll in enumerate(matrix.students['Roll No']):
+        key = employee_key(roll)
+        weekend = calendar.employee_weekends.get(key, calendar.weekend)
+        for col, day in enumerate(days):
+            if codes[row, col] not in (ABSENT, NO_DATA):
+                continue
+            day64 = np.datetime64(day)
+            if day64 in calendar.holidays:
+                codes[row, col] = HOLIDAY
+            elif day.weekday() in weekend and day64 not in calendar.workdays:
+                codes[row, col] = WEEKEND
+            elif any(k == key and first <= day64 <= last for k, first, last in calendar.leave):
+                codes[row, col] = LEAVE
+    return codes
+
+
+def time_call(func, repeat=3):
+    """Best-of-N wall time in seconds and the last result"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    employees = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000
+    days = int(sys.argv[2]) if len(sys.argv) > 2 else 365
+
+    small = make_report(300, 90, seed=1)
+    small_calendar = make_calendar(300, 90, seed=1)
+    reference_seconds, expected = time_call(lambda: reference_codes(small, small_calendar), repeat=1)
+    engine_small, actual = time_call(lambda: apply_calendar(small, small_calendar).codes)
+    if not np.array_equal(expected, actual):
+        raise SystemExit("the calendar engine disagrees with the per-cell reference")
+
+    report = make_report(employees, days)
+    calendar = make_calendar(employees, days)
+    seconds, result = time_call(lambda: apply_calendar(report, calendar))
+    cells = employees * days
+    counts = np.bincount(result.codes.ravel(), minlength=7)
+
+    print(f"Calendar engine benchmark ({employees:,} employees x {days} days, {cells:,} employee-days)")
+    print(f"  per-cell reference, 300 x 90:  {reference_seconds:.3f}s   engine: {engine_small:.4f}s "
+          f"({reference_seconds / engine_small:.0f}x)")
+    print(f"  engine, {employees:,} x {days}:  {seconds:.3f}s   {cells / seconds:,.0f} employee-days/s")
+    print(f"  leave {counts[LEAVE]:,}, holiday {counts[HOLIDAY]:,}, weekend {counts[WEEKEND]:,} cells")
+
+
+if __name__ == "__main__":
+    main()
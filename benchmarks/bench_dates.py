@@ -0,0 +1,72 @@
+"""
+Benchmark date parsing on a device-sized log: pd.to_datetime with
+per-call format inference (and strftime on every row for the report's
+date labels) vs attendance_dates, which infers the format once from a
+sample and parses each distinct value once.
+
+Both must give the same timestamps and the same per-row date labels.
+
+Run from the repository root:
+    python benchmarks/bench_dates.py [employees] [days]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from attendance_dates import REPORT_DATE_FORMAT, date_labels, parse_dates, report_dates
+from synthetic import make_punch_log
+
+
+def legacy_labels(values):
+    """The report's date labels as previously built in process_attendance_data"""
+    return pd.to_datetime(values).dt.strftime('%m/%d/%Y')
+
+
+def bulk_labels(values):
+    """Day keys as the pivot sees them, labelled once per distinct day"""
+    days, _ = report_dates(values)
+    codes, uniques = pd.factorize(days)
+    return np.asarray(date_labels(uniques), dtype=object)[codes]
+
+
+def time_call(func, repeat=3):
+    """Best-of-N wall time in seconds and the last result"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    employees = int(sys.argv[1]) if len(sys.argv) > 1 else 1_500
+    days = int(sys.argv[2]) if len(sys.argv) > 2 else 90
+    log = make_punch_log(employees, days)
+    stamps = pd.Series(log['Time'].dt.strftime('%m/%d/%Y %I:%M:%S %p'), dtype=object)
+    dates = pd.Series(log['Time'].dt.strftime(REPORT_DATE_FORMAT), dtype=object)
+    rows = len(log)
+
+    cases = [
+        ("date column -> labels", lambda: legacy_labels(dates), lambda: bulk_labels(dates)),
+        ("punch timestamps", lambda: pd.to_datetime(stamps), lambda: parse_dates(stamps)),
+    ]
+    print(f"Date parsing benchmark ({rows:,} rows, {employees:,} employees x {days} days)")
+    print(f"{'case':<24}{'previous':>10}{'bulk':>10}{'rows/s':>14}{'speedup':>10}")
+    for name, legacy, bulk in cases:
+        legacy_seconds, expected = time_call(legacy)
+        bulk_seconds, actual = time_call(bulk)
+        if not np.array_equal(np.asarray(expected), np.asarray(actual)):
+            raise SystemExit(f"{name}: bulk parsing gives different results")
+        print(f"{name:<24}{legacy_seconds:>10.3f}{bulk_seconds:>10.3f}{rows / bulk_seconds:>14,.0f}"
+              f"{legacy_seconds / bulk_seconds:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
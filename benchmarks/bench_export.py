@@ -0,0 +1,54 @@
+"""
+Benchmark the styled Excel export: classic cell-by-cell openpyxl styling
+vs the streaming writer in attendance_export.
+
+Run from the repository root:
+    python benchmarks/bench_export.py [rows ...]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from attendance_core import create_excel_download
+
+DATE_COLUMNS = 30
+
+
+def make_report(rows, seed=0):
+    """Synthetic report shaped like process_attendance_data output"""
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        'Roll No': np.arange(1, rows + 1),
+        'Student Name': [f'Employee {i}' for i in range(rows)],
+        'Total Present': rng.integers(0, DATE_COLUMNS, rows),
+        'Total Absent': rng.integers(0, DATE_COLUMNS, rows),
+    })
+    statuses = rng.choice(np.array(['P', 'A', 'I', '-'], dtype=object), size=(rows, DATE_COLUMNS))
+    dates = pd.date_range('2025-05-01', periods=DATE_COLUMNS).strftime('%m/%d/%Y')
+    return pd.concat([df, pd.DataFrame(statuses, columns=dates)], axis=1)
+
+
+def time_export(df, fast):
+    start = time.perf_counter()
+    output = create_excel_download(df, 'attendance_report.xlsx', fast=fast)
+    return time.perf_counter() - start, len(output.getvalue())
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1_000, 10_000, 50_000]
+    print(f"Styled export benchmark ({DATE_COLUMNS} date columns)")
+    print(f"{'rows':>8}{'classic s':>12}{'streaming s':>14}{'speedup':>10}{'size KB':>10}")
+    for rows in sizes:
+        df = make_report(rows)
+        classic, _ = time_export(df, fast=False)
+        streaming, size = time_export(df, fast=True)
+        print(f"{rows:>8,}{classic:>12.2f}{streaming:>14.2f}{classic / streaming:>9.1f}x{size / 1024:>10,.0f}")
+
+
+if __name__ == "__main__":
+    main()
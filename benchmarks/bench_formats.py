@@ -0,0 +1,63 @@
+"""
+Benchmark the report export formats: the styled workbook against the
+plain .xlsx, CSV and Parquet writers in attendance_export. Every plain
+file is read back and must hold the same values as the report.
+
+Run from the repository root:
+    python benchmarks/bench_formats.py [rows ...]
+"""
+import io
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from attendance_export import EXPORT_FORMATS, write_report
+from bench_export import DATE_COLUMNS, make_report
+
+READERS = {
+    'xlsx': pd.read_excel,
+    'csv': pd.read_csv,
+    'parquet': pd.read_parquet,
+}
+
+
+def time_format(df, fmt, repeat=3):
+    """Best-of-N seconds and the bytes of the last run"""
+    best = float('inf')
+    for _ in range(repeat):
+        output = io.BytesIO()
+        start = time.perf_counter()
+        write_report(df, output, fmt)
+        best = min(best, time.perf_counter() - start)
+    return best, output.getvalue()
+
+
+def check_round_trip(df, fmt, data):
+    back = READERS[fmt](io.BytesIO(data))
+    if not back.astype(str).equals(df.astype(str)):
+        raise SystemExit(f"the {fmt} export does not read back as the report")
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1_000, 10_000, 50_000]
+    formats = list(EXPORT_FORMATS)
+    print(f"Export format benchmark ({DATE_COLUMNS} date columns, seconds and KB)")
+    print(f"{'rows':>8}" + ''.join(f"{fmt + ' s':>12}{'KB':>8}" for fmt in formats))
+    for rows in sizes:
+        df = make_report(rows)
+        line = f"{rows:>8,}"
+        for fmt in formats:
+            seconds, data = time_format(df, fmt, repeat=1 if fmt == 'styled' else 3)
+            if fmt in READERS and rows <= 10_000:
+                check_round_trip(df, fmt, data)
+            line += f"{seconds:>12.3f}{len(data) / 1024:>8,.0f}"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Benchmark report memory: object DataFrame of 'P'/'A'/'I'/'-' strings vs
+the uint8 AttendanceMatrix, plus the cost of converting between them.
+
+Run from the repository root:
+    python benchmarks/bench_matrix.py [students] [days]
+"""
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from attendance_matrix import AttendanceMatrix
+
+
+def make_matrix(students, days, seed=0):
+    """Synthetic matrix with a realistic status mix"""
+    rng = np.random.default_rng(seed)
+    codes = rng.choice(np.arange(4, dtype=np.uint8), size=(students, days), p=[0.05, 0.75, 0.15, 0.05])
+    table = pd.DataFrame({
+        'Roll No': np.arange(1, students + 1),
+        'Student Name': [f'Employee {i}' for i in range(students)],
+    })
+    dates = pd.date_range('2025-01-01', periods=days).strftime('%m/%d/%Y')
+    return AttendanceMatrix(table, dates, codes)
+
+
+def traced(build):
+    """Run build() and return (result, seconds, peak traced bytes)"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build()
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, seconds, peak
+
+
+def main():
+    students = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000
+    days = int(sys.argv[2]) if len(sys.argv) > 2 else 365
+    matrix = make_matrix(students, days)
+
+    frame, to_seconds, to_peak = traced(matrix.to_frame)
+    frame_bytes = int(frame.memory_usage(index=True, deep=True).sum())
+    _, from_seconds, from_peak = traced(lambda: AttendanceMatrix.from_frame(frame))
+
+    print(f"Report memory ({students:,} students x {days} days)")
+    print(f"{'':<24}{'MB':>10}")
+    print(f"{'object DataFrame':<24}{frame_bytes / 2**20:>10.1f}")
+    print(f"{'AttendanceMatrix':<24}{matrix.nbytes / 2**20:>10.1f}")
+    print(f"{'  of which codes':<24}{matrix.codes.nbytes / 2**20:>10.1f}")
+    print(f"reduction: {frame_bytes / matrix.nbytes:.0f}x")
+    print(f"to_frame:   {to_seconds:.2f}s (peak {to_peak / 2**20:.0f} MB)")
+    print(f"from_frame: {from_seconds:.2f}s (peak {from_peak / 2**20:.0f} MB)")
+
+
+if __name__ == "__main__":
+    main()
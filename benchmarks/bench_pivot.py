@@ -0,0 +1,82 @@
+"""
+Benchmark the report pivot: pivot_table(aggfunc='first') vs the factorized
+scatter in attendance_pivot ('first' and 'best' duplicate policies).
+
+Run from the repository root:
+    python benchmarks/bench_pivot.py [students] [days] [duplicate share]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from attendance_pivot import BEST, FIRST, pivot_codes
+from attendance_status import NO_DATA
+
+
+def make_records(students, days, duplicates=0.05, seed=0):
+    """Shuffled (Roll No, Student Name, Date, Code) records, some (student, day) pairs twice"""
+    rng = np.random.default_rng(seed)
+    student = np.repeat(np.arange(students), days)
+    day = np.tile(np.arange(days), students)
+    extra = rng.random(len(student)) < duplicates
+    student = np.concatenate([student, student[extra]])
+    day = np.concatenate([day, day[extra]])
+    order = rng.permutation(len(student))
+    student, day = student[order], day[order]
+    dates = pd.date_range('2025-01-01', periods=days).strftime('%m/%d/%Y').to_numpy()
+    return pd.DataFrame({
+        'Roll No': student + 1,
+        'Student Name': np.array([f'Employee {i:05d}' for i in range(students)], dtype=object)[student],
+        'Date': dates[day],
+        'Code': rng.choice(np.arange(4, dtype=np.uint8), size=len(student), p=[0.05, 0.75, 0.15, 0.05]),
+    })
+
+
+def legacy_pivot(records):
+    """The pivot previously done in build_attendance_report"""
+    pivot = records.pivot_table(index=['Roll No', 'Student Name'], columns='Date', values='Code', aggfunc='first')
+    return pivot.fillna(NO_DATA).to_numpy().astype(np.uint8)
+
+
+def scatter_pivot(records, policy):
+    _, _, codes = pivot_codes(records[['Roll No', 'Student Name']], records['Date'], records['Code'], policy=policy)
+    return codes
+
+
+def time_call(func, repeat=3):
+    """Best-of-N wall time in seconds and the last result"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    students = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000
+    days = int(sys.argv[2]) if len(sys.argv) > 2 else 90
+    duplicates = float(sys.argv[3]) if len(sys.argv) > 3 else 0.05
+    records = make_records(students, days, duplicates)
+    rows = len(records)
+
+    legacy, expected = time_call(lambda: legacy_pivot(records))
+    first, actual = time_call(lambda: scatter_pivot(records, FIRST))
+    best, _ = time_call(lambda: scatter_pivot(records, BEST))
+    if not np.array_equal(expected, actual):
+        raise SystemExit("scatter pivot ('first') does not match pivot_table")
+
+    print(f"Pivot benchmark ({rows:,} records, {students:,} students x {days} days, {duplicates:.0%} duplicates)")
+    print(f"{'method':<28}{'seconds':>10}{'records/s':>14}{'speedup':>10}")
+    for name, seconds in [("pivot_table(aggfunc='first')", legacy), ("scatter, first wins", first),
+                          ("scatter, best wins", best)]:
+        print(f"{name:<28}{seconds:>10.3f}{rows / seconds:>14,.0f}{legacy / seconds:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
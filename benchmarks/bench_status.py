@@ -0,0 +1,78 @@
+"""
+Benchmark status normalization: the old per-row apply vs attendance_status.
+
+Run from the repository root:
+    python benchmarks/bench_status.py [rows]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from attendance_status import is_numeric_status, status_codes, status_labels
+
+
+def legacy_normalize(values):
+    """The string round-trip previously done in process_attendance_data"""
+    values = values.astype(str).str.upper()
+    sample_values = values.dropna().head(10).tolist()
+    is_numeric = all(val.replace('.', '').replace('-', '').isdigit() or val == 'NAN' for val in sample_values)
+    if is_numeric:
+        return values.apply(lambda x: 'P' if x not in ['NAN', '', '-', 'NONE', 'nan'] and str(x).replace('.', '').replace('-', '').isdigit() else 'A')
+    return values.replace({
+        'PRESENT': 'P',
+        'ABSENT': 'A',
+        'INCOMPLETE': 'I',
+        'TRUE': 'P',
+        'FALSE': 'A',
+        '1': 'P',
+        '0': 'A'
+    })
+
+
+def vectorized_normalize(values):
+    """The lookup-table path used by process_attendance_data now"""
+    return status_labels(status_codes(values, numeric=is_numeric_status(values)))
+
+
+def make_datasets(rows, seed=0):
+    """Text, numeric-ID and numeric-with-gaps status columns"""
+    rng = np.random.default_rng(seed)
+    text = rng.choice(['Present', 'Absent', 'P', 'A', 'Incomplete', 'TRUE', 'FALSE', None], size=rows)
+    ids = rng.integers(1, 5000, size=rows)
+    ids_with_gaps = ids.astype(float)
+    ids_with_gaps[rng.random(rows) < 0.1] = np.nan
+    ids_with_gaps[:10] = 1.0  # keep the detection sample numeric
+    return {
+        'text': pd.Series(text, dtype=object),
+        'numeric ids': pd.Series(ids),
+        'numeric ids + NaN': pd.Series(ids_with_gaps),
+    }
+
+
+def time_call(func, values, repeat=3):
+    """Best-of-N wall time in seconds"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(values)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    print(f"Status normalization benchmark ({rows:,} rows)")
+    print(f"{'dataset':<20}{'legacy rows/s':>16}{'vectorized rows/s':>20}{'speedup':>10}")
+    for name, values in make_datasets(rows).items():
+        legacy = time_call(legacy_normalize, values)
+        vectorized = time_call(vectorized_normalize, values)
+        print(f"{name:<20}{rows / legacy:>16,.0f}{rows / vectorized:>20,.0f}{legacy / vectorized:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,326 @@
+"""
+Reproducible end-to-end benchmark suite on synthetic ZKTeco-shaped files.
+
+For every size (employees x days x punches/day) and format (.xlsx, .xls)
+it generates seeded datasets, then times:
+- process_attendance_file on a wide date-column sheet
+- read_excel + process_attendance_data (Streamlit calls stubbed) on a punch log
+- create_excel_download and style_dataframe (rendered to HTML) on the report
+
+Each stage reports best-of-N seconds, rows/s, peak RSS and the nested
+profiling spans of its best run. Results are saved as JSON so runs can be
+compared across commits.
+
+Run from the repository root:
+    python benchmarks/bench_suite.py [--size 500x31x4 ...] [--repeat 3] [-o results.json]
+    python benchmarks/bench_suite.py --compare old.json      (print speedups vs an earlier run)
+"""
+import argparse
+import contextlib
+import gc
+import io
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+from datetime import datetime
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# Streamlit warns about running outside `streamlit run`; keep the output clean
+logging.disable(logging.WARNING)
+
+import streamlit_app
+from attendance_converter import process_attendance_file
+from attendance_profile import Profiler, profiling, span
+from synthetic import fits_xls, make_punch_log, make_wide_sheet, write_dataset
+
+PRESETS = {
+    'small': (50, 31, 2),
+    'medium': (500, 31, 4),
+    'large': (2000, 90, 4),
+}
+DEFAULT_SIZES = ['small', 'medium']
+FORMATS = ['xlsx', 'xls']
+
+
+class _Block:
+    """Stands in for any Streamlit element: callable, a context manager and chainable"""
+
+    def __call__(self, *args, **kwargs):
+        return self
+
+    def __getattr__(self, name):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class StreamlitStub(_Block):
+    """
+    Replaces `st` inside streamlit_app: widgets return their defaults,
+    buttons are never clicked and everything else is a no-op.
+    """
+
+    def __init__(self):
+        self.session_state = {}
+
+    def columns(self, spec, **kwargs):
+        return [_Block() for _ in range(spec if isinstance(spec, int) else len(spec))]
+
+    def button(self, *args, **kwargs):
+        return False
+
+    def selectbox(self, label, options, index=0, **kwargs):
+        return list(options)[index]
+
+    def radio(self, label, options, index=0, **kwargs):
+        return list(options)[index]
+
+    def time_input(self, label, value=None, **kwargs):
+        return value
+
+    def number_input(self, label, min_value=None, max_value=None, value=None, **kwargs):
+        return value
+
+    def file_uploader(self, *args, **kwargs):
+        return None
+
+
+def parse_size(text):
+    """'medium' or 'EMPLOYEESxDAYS[xPUNCHES]' -> (employees, days, punches_per_day)"""
+    if text in PRESETS:
+        return PRESETS[text]
+    parts = [int(part) for part in text.lower().split('x')]
+    if len(parts) == 2:
+        parts.append(4)
+    if len(parts) != 3 or min(parts) < 1:
+        raise argparse.ArgumentTypeError(f"size must be a preset ({', '.join(PRESETS)}) or EMPLOYEESxDAYSxPUNCHES")
+    return tuple(parts)
+
+
+def xls_available():
+    try:
+        import xlwt  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def measure(func, rows, repeat):
+    """
+    Run func() `repeat` times under a Profiler; return the last result and
+    the best run's seconds, rows/s and nested spans, with the peak RSS of all runs
+    """
+    best = None
+    stages = []
+    peak = 0.0
+    result = None
+    for _ in range(repeat):
+        gc.collect()
+        profiler = Profiler()
+        with profiling(profiler):
+            with span('benchmark', rows=rows) as record:
+                result = func()
+        peak = max(peak, record.get('peak_mb') or 0.0)
+        if best is None or record['seconds'] < best['seconds']:
+            best = record
+            stages = [{'stage': s['stage'], 'depth': s['depth'] - 1, 'seconds': s['seconds'], 'rows': s['rows']}
+                      for s in profiler.spans[1:]]
+    seconds = best['seconds']
+    return result, {
+        'seconds': seconds,
+        'rows_per_s': rows / max(seconds, 1e-9),
+        'peak_rss_mb': peak,
+        'stages': stages,
+    }
+
+
+def bench_wide(path, employees, repeat, workdir):
+    """process_attendance_file on a wide sheet"""
+    output = os.path.join(workdir, 'wide_report.xlsx')
+
+    def convert():
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = process_attendance_file(path, output)
+        if result is None:
+            raise RuntimeError(f"process_attendance_file failed on {os.path.basename(path)}")
+        return result
+
+    _, stats = measure(convert, employees, repeat)
+    return [dict(stats, stage='process_attendance_file')]
+
+
+def bench_punches(path, punch_rows, repeat):
+    """read + process_attendance_data on a punch log, then export and styling of its report"""
+    extension = path.rsplit('.', 1)[-1]
+    engine = 'xlrd' if extension == 'xls' else 'openpyxl'
+    df, read_stats = measure(lambda: pd.read_excel(path, engine=engine), punch_rows, repeat)
+
+    def process():
+        with mock.patch.object(streamlit_app, 'st', StreamlitStub()):
+            report = streamlit_app.process_attendance_data(df)
+        if report is df or 'Roll No' not in report.columns:
+            raise RuntimeError(f"process_attendance_data did not build a report from {os.path.basename(path)}")
+        return report
+
+    report, process_stats = measure(process, punch_rows, repeat)
+    _, export_stats = measure(lambda: streamlit_app.create_excel_download(report, 'attendance_report.xlsx'),
+                              len(report), repeat)
+    _, style_stats = measure(lambda: streamlit_app.style_dataframe(report).to_html(), len(report), repeat)
+    return [
+        dict(read_stats, stage='read_excel'),
+        dict(process_stats, stage='process_attendance_data'),
+        dict(export_stats, stage='create_excel_download'),
+        dict(style_stats, stage='style_dataframe'),
+    ]
+
+
+def run_suite(sizes, formats, repeat, seed, workdir):
+    """Generate the datasets and run every stage; returns the result records"""
+    results = []
+    for employees, days, punches_per_day in sizes:
+        datasets = {
+            'wide': make_wide_sheet(employees, days, seed=seed),
+            'punch_log': make_punch_log(employees, days, punches_per_day, seed=seed),
+        }
+        for fmt in formats:
+            for kind, frame in datasets.items():
+                case = {
+                    'dataset': kind, 'format': fmt, 'employees': employees, 'days': days,
+                    'punches_per_day': punches_per_day if kind == 'punch_log' else None,
+                    'input_rows': len(frame),
+                }
+                label = f"{kind} {employees}x{days}x{punches_per_day} .{fmt}"
+                if fmt == 'xls' and not fits_xls(frame):
+                    print(f"  skip  {label}: {len(frame):,} rows x {len(frame.columns)} columns exceed the .xls limits")
+                    continue
+                path = write_dataset(frame, os.path.join(workdir, f"{kind}_{employees}x{days}x{punches_per_day}.{fmt}"))
+                case['input_bytes'] = os.path.getsize(path)
+                try:
+                    if kind == 'wide':
+                        stages = bench_wide(path, len(frame), repeat, workdir)
+                    else:
+                        stages = bench_punches(path, len(frame), repeat)
+                except Exception as e:
+                    print(f"  FAIL  {label}: {type(e).__name__}: {e}")
+                    results.append(dict(case, stage=None, error=f"{type(e).__name__}: {e}"))
+                    continue
+                for stats in stages:
+                    print(f"  {label:<32}{stats['stage']:<26}{stats['seconds']:>9.3f}s"
+                          f"{stats['rows_per_s']:>14,.0f} rows/s{stats['peak_rss_mb']:>9.0f} MB")
+                    results.append(dict(case, **stats))
+    return results
+
+
+def git_revision():
+    """Short commit hash of the tree being measured ('+dirty' with local changes)"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                                text=True, check=True).stdout.strip()
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=ROOT,
+                               capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return commit + ('+dirty' if dirty else '')
+
+
+def environment():
+    import openpyxl
+    import streamlit
+
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'openpyxl': openpyxl.__version__,
+        'streamlit': streamlit.__version__,
+    }
+
+
+def result_key(record):
+    return (record['dataset'], record['format'], record['employees'], record['days'],
+            record['punches_per_day'], record['stage'])
+
+
+def compare(old_path, results):
+    """Print per-stage speedups of `results` against an earlier JSON run"""
+    with open(old_path) as handle:
+        old = json.load(handle)
+    baseline = {result_key(r): r for r in old['results'] if r.get('stage')}
+    print(f"\nCompared with {old.get('commit') or old_path}:")
+    print(f"{'case':<40}{'stage':<26}{'old s':>9}{'new s':>9}{'speedup':>9}")
+    for record in results:
+        before = baseline.get(result_key(record)) if record.get('stage') else None
+        if before is None:
+            continue
+        case = f"{record['dataset']} {record['employees']}x{record['days']} .{record['format']}"
+        print(f"{case:<40}{record['stage']:<26}{before['seconds']:>9.3f}{record['seconds']:>9.3f}"
+              f"{before['seconds'] / max(record['seconds'], 1e-9):>8.2f}x")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="End-to-end attendance benchmark on synthetic data.")
+    parser.add_argument("--size", action="append", type=parse_size, default=None,
+                        help=f"Preset ({', '.join(PRESETS)}) or EMPLOYEESxDAYSxPUNCHES; repeatable "
+                             f"(default: {' '.join(DEFAULT_SIZES)})")
+    parser.add_argument("--format", action="append", choices=FORMATS, default=None,
+                        help="Input file format; repeatable (default: xlsx, plus xls when xlwt is installed)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per stage; the best is reported (default: 3)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the synthetic data (default: 0)")
+    parser.add_argument("-o", "--output", default=None,
+                        help="JSON results file (default: benchmarks/results/bench_<commit>_<time>.json)")
+    parser.add_argument("--compare", default=None, metavar="JSON", help="Earlier results file to compare against")
+    args = parser.parse_args(argv)
+
+    if args.repeat < 1:
+        parser.error("--repeat must be at least 1")
+    sizes = args.size or [PRESETS[name] for name in DEFAULT_SIZES]
+    formats = args.format or FORMATS
+    if 'xls' in formats and not xls_available():
+        print("xlwt is not installed; skipping .xls inputs (pip install xlwt to include them)")
+        formats = [fmt for fmt in formats if fmt != 'xls']
+
+    commit = git_revision()
+    started = datetime.now()
+    print(f"Attendance benchmark suite (commit {commit or 'unknown'}, best of {args.repeat}, seed {args.seed})")
+    with tempfile.TemporaryDirectory(prefix='attendance_bench_') as workdir:
+        results = run_suite(sizes, formats, args.repeat, args.seed, workdir)
+
+    run = {
+        'commit': commit,
+        'started': started.isoformat(timespec='seconds'),
+        'repeat': args.repeat,
+        'seed': args.seed,
+        'environment': environment(),
+        'results': results,
+    }
+    output = args.output or os.path.join(
+        ROOT, 'benchmarks', 'results', f"bench_{commit or 'unknown'}_{started:%Y%m%d_%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as handle:
+        json.dump(run, handle, indent=2, default=str)
+    print(f"\nResults saved to {output}")
+
+    if args.compare:
+        compare(args.compare, results)
+    return 1 if any('error' in r for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
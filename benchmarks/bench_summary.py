@@ -0,0 +1,81 @@
+"""
+Benchmark the summary tables (attendance_summary.summarize_report) against
+the row-by-row statistics loop they replace, which walked
+report_df.iterrows() for per-student counts and absence streaks. The
+loop runs on a smaller report and must give the same student summary.
+
+Run from the repository root:
+    python benchmarks/bench_summary.py [employees] [days]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from attendance_summary import summarize_report
+from attendance_totals import report_date_columns
+from bench_calendar import make_report
+
+
+def loop_statistics(report_df):
+    """Per-student counts and longest absence streak, one row and one cell at a time"""
+    date_columns = report_date_columns(report_df)
+    rows = []
+    for _, row in report_df.iterrows():
+        present = absent = streak = longest = 0
+        for col in date_columns:
+            value = row[col]
+            if value in ('P', 'I'):
+                present += value == 'P'
+                streak = 0
+            elif value in ('A', '-'):
+                absent += 1
+                streak += 1
+                longest = max(longest, streak)
+        total = present + absent
+        rows.append({'Roll No': row['Roll No'], 'Present': present, 'Absent': absent,
+                     'Attendance %': round(present * 100 / total, 2) if total else 0.0,
+                     'Longest Absence Streak': longest})
+    return pd.DataFrame(rows)
+
+
+def time_call(func, repeat=3):
+    """Best-of-N wall time in seconds and the last result"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    employees = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000
+    days = int(sys.argv[2]) if len(sys.argv) > 2 else 365
+
+    small = make_report(2_000, 180, seed=1).to_frame()
+    loop_seconds, expected = time_call(lambda: loop_statistics(small), repeat=1)
+    small_seconds, summary = time_call(lambda: summarize_report(small))
+    actual = summary['Student Summary'][expected.columns]
+    if not np.array_equal(actual.to_numpy(dtype=float), expected.to_numpy(dtype=float)):
+        raise SystemExit("summarize_report disagrees with the row-by-row statistics")
+
+    report = make_report(employees, days)
+    seconds, tables = time_call(lambda: summarize_report(report))
+    frame_seconds, _ = time_call(lambda: summarize_report(report.to_frame()), repeat=1)
+
+    print(f"Summary benchmark ({employees:,} employees x {days} days)")
+    print(f"  row loop, 2,000 x 180:  {loop_seconds:.3f}s   summarize_report: {small_seconds:.4f}s "
+          f"({loop_seconds / small_seconds:.0f}x)")
+    print(f"  summarize_report, {employees:,} x {days}:  {seconds:.3f}s from the matrix, "
+          f"{frame_seconds:.3f}s from the report DataFrame")
+    print("  " + ", ".join(f"{name} {len(table):,} rows" for name, table in tables.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Benchmark the wide-sheet conversion (process_attendance_file's core step):
+the previous per-row iterrows loop vs the whole-frame categorical mapping
+in attendance_core.convert_attendance_rows.
+
+Both must produce the same report, down to the worksheet XML written by
+the styled export.
+
+Run from the repository root:
+    python benchmarks/bench_wide.py [students] [dates]
+"""
+import io
+import os
+import sys
+import time
+import zipfile
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from attendance_core import convert_attendance_rows, find_date_columns
+from attendance_export import CONVERTER_STATUS_STYLES, write_styled_report
+from synthetic import make_wide_sheet
+
+
+def legacy_convert(df, date_columns):
+    """The iterrows conversion previously done in attendance_converter"""
+    report_data = []
+    for index, row in df.iterrows():
+        student_data = {
+            'Roll No': row.get('Roll', ''),
+            'Student Name': row.get('Name', ''),
+            'Total Present': row.get('Present', 0),
+            'Total Absent': row.get('Absent', 0)
+        }
+        for date_col in date_columns:
+            attendance_value = row.get(date_col, '')
+            if str(attendance_value).upper() in ['P', 'PRESENT']:
+                student_data[date_col] = 'P'
+            elif str(attendance_value).upper() in ['A', 'ABSENT']:
+                student_data[date_col] = 'A'
+            elif str(attendance_value).upper() in ['I', 'INCOMPLETE']:
+                student_data[date_col] = 'I'
+            else:
+                student_data[date_col] = str(attendance_value)
+        report_data.append(student_data)
+    return pd.DataFrame(report_data)
+
+
+def sheet_xml(report):
+    """The worksheet XML of the styled export (the workbook zip also holds timestamps)"""
+    output = io.BytesIO()
+    write_styled_report(report, output, CONVERTER_STATUS_STYLES)
+    with zipfile.ZipFile(output) as workbook:
+        return workbook.read('xl/worksheets/sheet1.xml')
+
+
+def time_call(func, repeat=3):
+    """Best-of-N wall time in seconds and the last result"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    students = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000
+    dates = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    sheet = make_wide_sheet(students, dates)
+    date_columns = find_date_columns(sheet.columns)
+    cells = students * len(date_columns)
+
+    legacy, expected = time_call(lambda: legacy_convert(sheet, date_columns))
+    vectorized, actual = time_call(lambda: convert_attendance_rows(sheet, date_columns))
+    pd.testing.assert_frame_equal(actual, expected, check_exact=True)
+    if sheet_xml(actual) != sheet_xml(expected):
+        raise SystemExit("the vectorized report writes a different worksheet")
+
+    print(f"Wide conversion benchmark ({students:,} students x {len(date_columns)} dates, {cells:,} cells)")
+    print(f"{'method':<28}{'seconds':>10}{'cells/s':>14}{'speedup':>10}")
+    for name, seconds in [("iterrows (previous)", legacy), ("categorical mapping", vectorized)]:
+        print(f"{name:<28}{seconds:>10.3f}{cells / seconds:>14,.0f}{legacy / seconds:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
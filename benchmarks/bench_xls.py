@@ -0,0 +1,89 @@
+"""
+Benchmark legacy .xls decoding: pd.read_excel(engine='xlrd') vs read_xls.
+
+Times both readers on ZKTeco-style BIFF2 punch logs (the bundled
+may-july7.xls export and seeded synthetic ones of growing size) and, with
+xlwt installed, on a BIFF8 workbook, which read_xls reads through xlrd.
+Both readers must return the same DataFrame.
+
+Run from the repository root:
+    python benchmarks/bench_xls.py [file.xls ...] [--repeat 5]
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from attendance_xls import read_xls
+from synthetic import make_punch_log, write_biff2, write_xls
+
+SAMPLE = os.path.join(ROOT, 'may-july7.xls')
+
+# (employees, days, punches/day) of the synthetic punch logs
+SIZES = [(40, 31, 2), (120, 31, 4)]
+
+
+def time_call(func, repeat):
+    """Best-of-N wall time in seconds and the last result"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def read_with_pandas(path):
+    # xlrd prints a note about the missing CODEPAGE record of device exports
+    with contextlib.redirect_stdout(io.StringIO()):
+        return pd.read_excel(path, engine='xlrd')
+
+
+def datasets(files, workdir):
+    """(label, path) of every file to benchmark"""
+    cases = [(os.path.basename(path), path) for path in files]
+    for employees, days, punches in SIZES:
+        frame = make_punch_log(employees, days, punches)
+        path = os.path.join(workdir, f'biff2_{employees}x{days}x{punches}.xls')
+        write_biff2(frame, path)
+        cases.append((f'BIFF2 punch log {len(frame):,} rows', path))
+    try:
+        import xlwt  # noqa: F401
+    except ImportError:
+        print("xlwt is not installed; skipping the BIFF8 case")
+    else:
+        frame = make_punch_log(*SIZES[0])
+        path = os.path.join(workdir, 'biff8_punch_log.xls')
+        write_xls(frame, path)
+        cases.append((f'BIFF8 punch log {len(frame):,} rows', path))
+    return cases
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare pd.read_excel(engine='xlrd') with read_xls.")
+    parser.add_argument("files", nargs="*", help=f"Extra .xls files (default: {os.path.basename(SAMPLE)})")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per reader; the best is reported (default: 5)")
+    args = parser.parse_args(argv)
+
+    files = args.files or ([SAMPLE] if os.path.exists(SAMPLE) else [])
+    print(f"Legacy .xls read benchmark (best of {args.repeat})")
+    print(f"{'file':<32}{'rows':>8}{'read_excel s':>14}{'read_xls s':>12}{'speedup':>9}")
+    with tempfile.TemporaryDirectory(prefix='attendance_xls_') as workdir:
+        for label, path in datasets(files, workdir):
+            legacy, expected = time_call(lambda: read_with_pandas(path), args.repeat)
+            fast, actual = time_call(lambda: read_xls(path), args.repeat)
+            pd.testing.assert_frame_equal(actual, expected)
+            print(f"{label:<32}{len(actual):>8,}{legacy:>14.3f}{fast:>12.3f}{legacy / fast:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
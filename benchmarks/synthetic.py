@@ -0,0 +1,163 @@
+"""
+Seeded synthetic datasets shaped like ZKTeco exports, for the benchmarks.
+
+Two layouts are generated at any size (employees x days x punches/day):
+- punch logs: one row per device punch ('AC-No.', 'Name', 'Time'), the
+  long format process_attendance_data turns into a report
+- wide sheets: one row per employee with a P/A/I column per date, the
+  layout attendance_converter.process_attendance_file expects
+
+Both can be written as .xlsx (openpyxl), legacy .xls (xlwt, optional) or
+ZKTeco-style BIFF2 .xls (write_biff2).
+The same seed always gives the same data.
+"""
+import numpy as np
+import pandas as pd
+
+START_DATE = '2025-05-01'
+
+# Share of employee-days that are absent / have a single punch (incomplete)
+ABSENT_RATE = 0.12
+INCOMPLETE_RATE = 0.05
+
+# Punches fall between 07:30 and 19:30
+FIRST_PUNCH_MINUTE = 7 * 60 + 30
+LAST_PUNCH_MINUTE = 19 * 60 + 30
+
+# Legacy BIFF sheet limits
+XLS_MAX_ROWS = 65536
+XLS_MAX_COLUMNS = 256
+# xlrd reads at most this many rows from a BIFF2 worksheet
+BIFF2_MAX_ROWS = 16384
+
+
+def employee_table(employees):
+    """Employee numbers and names"""
+    return pd.DataFrame({
+        'AC-No.': np.arange(1001, 1001 + employees),
+        'Name': [f'Employee {i:05d}' for i in range(employees)],
+    })
+
+
+def _day_kinds(rng, employees, days):
+    """Per employee-day: 0 = absent, 1 = incomplete (one punch), 2 = present"""
+    draw = rng.random((employees, days))
+    kinds = np.full((employees, days), 2, dtype=np.int8)
+    kinds[draw < ABSENT_RATE + INCOMPLETE_RATE] = 1
+    kinds[draw < ABSENT_RATE] = 0
+    return kinds
+
+
+def make_punch_log(employees, days, punches_per_day=4, seed=0):
+    """Long-format punch log, sorted by employee and time"""
+    rng = np.random.default_rng(seed)
+    people = employee_table(employees)
+    kinds = _day_kinds(rng, employees, days)
+    counts = np.where(kinds == 2, max(punches_per_day, 2), kinds).ravel()
+
+    employee = np.repeat(np.arange(employees), days)
+    day = np.tile(np.arange(days), employees)
+    employee = np.repeat(employee, counts)
+    day = np.repeat(day, counts)
+    minutes = rng.integers(FIRST_PUNCH_MINUTE, LAST_PUNCH_MINUTE, size=len(day))
+    seconds = rng.integers(0, 60, size=len(day))
+
+    times = (pd.Timestamp(START_DATE)
+             + pd.to_timedelta(day, unit='D')
+             + pd.to_timedelta(minutes * 60 + seconds, unit='s'))
+    log = pd.DataFrame({
+        'AC-No.': people['AC-No.'].to_numpy()[employee],
+        'Name': people['Name'].to_numpy()[employee],
+        'Time': times,
+    })
+    return log.sort_values(['AC-No.', 'Time'], kind='stable', ignore_index=True)
+
+
+def make_wide_sheet(employees, days, seed=0):
+    """Wide sheet: Roll, Name, Present, Absent and one status column per date"""
+    rng = np.random.default_rng(seed)
+    kinds = _day_kinds(rng, employees, days)
+    labels = np.array(['A', 'I', 'P'], dtype=object)[kinds]
+    people = employee_table(employees)
+    sheet = pd.DataFrame({
+        'Roll': people['AC-No.'],
+        'Name': people['Name'],
+        'Present': (kinds == 2).sum(axis=1),
+        'Absent': (kinds == 0).sum(axis=1),
+    })
+    dates = pd.date_range(START_DATE, periods=days).strftime('%m/%d/%Y')
+    return pd.concat([sheet, pd.DataFrame(labels, columns=dates)], axis=1)
+
+
+def fits_xls(df):
+    """Whether a frame (plus its header row) fits on one BIFF sheet"""
+    return len(df) + 1 <= XLS_MAX_ROWS and len(df.columns) <= XLS_MAX_COLUMNS
+
+
+def write_xlsx(df, path):
+    df.to_excel(path, index=False, engine='openpyxl')
+
+
+def write_xls(df, path):
+    """Write a legacy .xls (pandas dropped its xlwt writer, so xlwt is used directly)"""
+    import xlwt
+
+    if not fits_xls(df):
+        raise ValueError(f"{len(df):,} rows x {len(df.columns)} columns do not fit on an .xls sheet")
+    workbook = xlwt.Workbook()
+    sheet = workbook.add_sheet('Sheet1')
+    timestamp = xlwt.easyxf(num_format_str='M/D/YYYY h:mm:ss')
+    for col, name in enumerate(df.columns):
+        sheet.write(0, col, str(name))
+    for col, name in enumerate(df.columns):
+        values = df[name]
+        if pd.api.types.is_datetime64_any_dtype(values):
+            for row, value in enumerate(values.dt.to_pydatetime(), start=1):
+                sheet.write(row, col, value, timestamp)
+        else:
+            for row, value in enumerate(values.tolist(), start=1):
+                sheet.write(row, col, value)
+    workbook.save(path)
+
+
+def write_biff2(df, path):
+    """
+    Write a BIFF2 .xls the way ZKTeco software does: a bare worksheet
+    stream (no OLE2 container) with every cell stored as a text label
+    """
+    import struct
+
+    if len(df) + 1 > BIFF2_MAX_ROWS or len(df.columns) > XLS_MAX_COLUMNS:
+        raise ValueError(f"{len(df):,} rows x {len(df.columns)} columns do not fit on a BIFF2 sheet")
+
+    def record(code, payload):
+        return struct.pack('<HH', code, len(payload)) + payload
+
+    def label(row, col, text):
+        data = str(text).encode('latin-1', 'replace')[:255]
+        return record(0x0004, struct.pack('<HHBBBB', row, col, 0, 0, 0, len(data)) + data)
+
+    columns = {}
+    for name in df.columns:
+        values = df[name]
+        if pd.api.types.is_datetime64_any_dtype(values):
+            values = values.dt.strftime('%m/%d/%Y %I:%M:%S %p')
+        columns[name] = values.fillna('').astype(str).tolist()
+
+    parts = [record(0x0809, b'\x00\x00\x10\x00\x00\x00'), record(0x001E, b'\x07General'),
+             record(0x0043, b'\x00\x00\x00\x00')]
+    parts.extend(label(0, col, name) for col, name in enumerate(df.columns))
+    for col, values in enumerate(columns.values()):
+        parts.extend(label(row, col, value) for row, value in enumerate(values, start=1) if value != '')
+    parts.append(record(0x000A, b''))
+    with open(path, 'wb') as handle:
+        handle.write(b''.join(parts))
+
+
+WRITERS = {'xlsx': write_xlsx, 'xls': write_xls}
+
+
+def write_dataset(df, path):
+    """Write a dataset in the format given by the path's extension"""
+    WRITERS[path.rsplit('.', 1)[-1].lower()](df, path)
+    return path
@@ -1,11 +1,182 @@
 import streamlit as st
 import pandas as pd
-import io
+import numpy as np
+import time
 from datetime import datetime
 import base64
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+import json
+import os
 
-def process_attendance_data(df):
-    """Process the uploaded attendance dataframe"""
+from attendance_totals import edited_row_positions, update_report_totals
+from attendance_summary import CHRONIC_ATTENDANCE_PERCENT, summarize_report
+from attendance_ingest import iter_excel_chunks, read_excel_head
+from attendance_matrix import as_report_frame
+from attendance_merge import merge_records, read_sheets, sheet_timings
+from attendance_pivot import DUPLICATE_POLICIES, FIRST
+from attendance_store import AttendanceStore, punch_records, status_records
+from attendance_punches import DEFAULT_GRACE_MINUTES, DEFAULT_SHIFT_END, DEFAULT_SHIFT_START
+from attendance_profile import Profiler, active_profiler, profiled, profiling, span
+from attendance_cache import LRUCache, content_hash, frame_fingerprint
+from attendance_calendar import WEEKDAYS, load_calendar
+from attendance_core import build_report, create_excel_download, create_report_download, detect_columns, read_workbook
+from attendance_export import DEFAULT_FORMAT, EXPORT_FORMATS
+from attendance_jobs import CANCELLED, FAILED, QUEUED, RUNNING, JobQueue, report_job
+
+# Cache budgets, shared by every session of this server process
+PARSED_CACHE_BYTES = 512 * 1024 * 1024
+REPORT_CACHE_BYTES = 256 * 1024 * 1024
+EXPORT_CACHE_BYTES = 128 * 1024 * 1024
+
+# Preview pages and search results kept around for paging back and forth
+PREVIEW_CACHE_PAGES = 64
+
+# Background report jobs: worker processes shared by all sessions, and how
+# often a waiting page checks on its job
+JOB_WORKERS = max(1, (os.cpu_count() or 2) // 2)
+JOB_POLL_SECONDS = 1.0
+
+# Worker processes that parse merged uploads, one workbook each, shared by all sessions
+MERGE_WORKERS = 2
+
+# Rows without a readable date/name/ID listed after saving to history
+REJECTED_ROWS_SHOWN = 200
+
+# Report preview defaults: rows per page and how many dates are shown at once
+PREVIEW_PAGE_SIZES = [25, 50, 100, 200]
+PREVIEW_MAX_DATES = 31
+
+@st.cache_resource
+def get_caches():
+    """LRU caches for parsed uploads, processed reports, export bytes and preview pages"""
+    return {
+        'parsed': LRUCache(PARSED_CACHE_BYTES),
+        'report': LRUCache(REPORT_CACHE_BYTES),
+        'export': LRUCache(EXPORT_CACHE_BYTES),
+        'preview': LRUCache(EXPORT_CACHE_BYTES, max_entries=PREVIEW_CACHE_PAGES),
+    }
+
+@st.cache_resource
+def get_job_queue():
+    """Worker pool for background report generation, shared by every session"""
+    return JobQueue(workers=JOB_WORKERS)
+
+@st.cache_resource
+def get_merge_pool():
+    """Worker pool for parsing merged uploads, shared by every session"""
+    return ProcessPoolExecutor(max_workers=MERGE_WORKERS)
+
+def shift_settings():
+    """Shift start/end and grace period used to judge punch logs"""
+    with st.expander("⏱️ **Shift Settings**", expanded=False):
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            shift_start = st.time_input("Shift start", DEFAULT_SHIFT_START)
+        with col2:
+            shift_end = st.time_input("Shift end", DEFAULT_SHIFT_END)
+        with col3:
+            grace_minutes = st.number_input("Grace period (minutes)", min_value=0, max_value=240,
+                                            value=DEFAULT_GRACE_MINUTES)
+    return {'shift_start': shift_start, 'shift_end': shift_end, 'grace_minutes': int(grace_minutes)}
+
+def calendar_settings():
+    """Optional weekend / holiday / leave / shift calendar (see attendance_calendar)"""
+    with st.expander("📅 **Calendar (weekends, holidays, leave)**", expanded=False):
+        upload = st.file_uploader("Calendar file", type=['csv', 'yaml', 'yml'], key='calendar_file',
+                                  help="One rule per row: rule, employee, start, end, value "
+                                       "(weekend, holiday, workday, leave or shift)")
+        if upload is None:
+            st.caption("Upload a CSV or YAML calendar to mark weekends (W), holidays (H) and leave (L) "
+                       "and to judge punch logs against each employee's shift.")
+            return None
+        try:
+            calendar = get_caches()['parsed'].get_or_compute(('calendar', content_hash(upload.getvalue())),
+                                                             lambda: load_calendar(upload))
+        except ValueError as e:
+            st.error(f"❌ **Calendar not used:** {str(e)}")
+            return None
+        weekend = ', '.join(WEEKDAYS[day].title() for day in sorted(calendar.weekend)) or 'none'
+        st.caption(f"📅 Weekend: {weekend} · {len(calendar.holidays)} holiday(s), "
+                   f"{len(calendar.leave)} leave period(s), {len(calendar.shifts)} employee shift(s)")
+        return calendar
+
+def process_store_data(store, date_range=None):
+    """Build the report for a date range straight from the history store"""
+    start, end = date_range if date_range else (None, None)
+    shift = shift_settings()
+    calendar = calendar_settings()
+    
+    try:
+        key = ('store', store.version(), str(start), str(end), tuple(sorted(shift.items())),
+               calendar.signature if calendar else None)
+        with span('store_report'):
+            report = get_caches()['report'].get_or_compute(key, lambda: store.matrix(start, end, shift, calendar))
+        if not len(report):
+            st.warning("⚠️ No stored records in the selected date range")
+            return None
+        st.success(f"✅ **Report built from history:** {len(report)} people × {len(report.dates)} days")
+        with span('report_frame', rows=len(report)):
+            return report.to_frame()
+    except Exception as e:
+        st.error(f"❌ **Error reading history store:** {str(e)}")
+        return None
+
+def render_store_save(df, stream_source, cache_key, name_col, date_col, status_col, roll_col,
+                      punch_mode=False, punch_id_col=None):
+    """Offer to append the upload's normalized records to the history store"""
+    saved = st.session_state.setdefault('store_saved', {})
+    if cache_key in saved:
+        show_saved_records(*saved[cache_key])
+        return
+    
+    if not st.button("🗄️ Save records to history", help="Keep these records for multi-month reports without re-uploading"):
+        return
+    
+    def records(frame):
+        if punch_mode:
+            return punch_records(frame, name_col, date_col, punch_id_col)
+        return status_records(frame, name_col, date_col, status_col, roll_col)
+    
+    store = AttendanceStore()
+    counts = np.zeros(3, dtype=np.int64)
+    rejected = []
+    with st.spinner("🗄️ Saving records to history..."):
+        frames = iter_excel_chunks(stream_source, filename=stream_source.name) if stream_source is not None else [df]
+        for frame in frames:
+            normalized, dropped = records(frame)
+            counts += store.append(normalized)
+            rejected.append(dropped)
+        if stream_source is not None:
+            stream_source.seek(0)
+    rejected = pd.concat(rejected, ignore_index=True)
+    saved[cache_key] = (*counts.tolist(), len(rejected), rejected.head(REJECTED_ROWS_SHOWN))
+    show_saved_records(*saved[cache_key])
+
+def show_saved_records(added, updated, unchanged, rejected_count, rejected):
+    """Outcome of saving to the history store, including the rows that could not be saved"""
+    st.caption(f"🗄️ Saved to history: {added:,} new records, {updated:,} corrected "
+               f"({unchanged:,} already stored)")
+    if rejected_count:
+        st.warning(f"⚠️ {rejected_count:,} row(s) were not saved because their date/time, name or ID "
+                   "could not be read or their status is not recognised")
+        with st.expander(f"Rows not saved (first {len(rejected):,})", expanded=False):
+            st.dataframe(rejected, use_container_width=True)
+
+def process_attendance_data(df, stream_source=None, cache_key=None, date_range=None):
+    """Process the uploaded attendance dataframe
+    
+    `df` may also be an AttendanceStore, in which case the report for
+    `date_range` (start, end) is built from the stored history instead.
+    
+    When `stream_source` is given, `df` is only the first chunk of the file
+    (used for column detection) and the report is built by streaming the
+    whole workbook through attendance_ingest. `cache_key` (the upload's
+    content hash) lets reruns reuse the report for the same column mapping.
+    """
+    
+    if isinstance(df, AttendanceStore):
+        return process_store_data(df, date_range)
     
     # Show a clean preview first
     st.info("📋 **Analyzing your data structure...**")
@@ -15,56 +186,16 @@ def process_attendance_data(df):
         st.write("**Sample data (first 5 rows):**")
         st.dataframe(df.head())
     
-    # Try to identify the structure of the data
-    name_col = None
-    roll_col = None
-    date_col = None
-    status_col = None
-    time_col = None
-    
-    # Find column names (case insensitive)
-    for col in df.columns:
-        col_lower = str(col).lower()
-        if 'name' in col_lower and not name_col:
-            name_col = col
-        elif 'roll' in col_lower and not roll_col:
-            roll_col = col
-        elif ('date' in col_lower or 'time' in col_lower or 
-              any(char in str(col) for char in ['/', '-', '2024', '2025'])) and not date_col:
-            date_col = col
-        elif ('status' in col_lower or 'present' in col_lower or 
-              'absent' in col_lower or 'attendance' in col_lower) and not status_col:
-            status_col = col
-        elif 'time' in col_lower and 'date' not in col_lower and not time_col:
-            time_col = col
-    
-    # Smart fallback detection
-    if not name_col and len(df.columns) >= 2:
-        # Look for text columns that could be names
-        for col in df.columns:
-            if df[col].dtype == 'object' and not name_col:
-                name_col = col
-                break
-    
-    if not date_col:
-        # Look for date-like data in columns
-        for col in df.columns:
-            if col not in [name_col, roll_col]:
-                try:
-                    pd.to_datetime(df[col].iloc[0], errors='raise')
-                    date_col = col
-                    break
-                except:
-                    continue
-    
-    if not status_col:
-        # Look for status-like data
-        for col in df.columns:
-            if col not in [name_col, roll_col, date_col, time_col]:
-                sample_values = df[col].astype(str).str.upper().unique()[:10]  # Check first 10 unique values
-                if any(val in ['P', 'A', 'PRESENT', 'ABSENT', '1', '0'] for val in sample_values):
-                    status_col = col
-                    break
+    # Profile a sample of every column once and score name/roll/date/status/time
+    # candidates; the result is reused for uploads with the same header row
+    columns = detect_columns(df)
+    name_col = columns['name']
+    roll_col = columns['roll']
+    date_col = columns['date']
+    status_col = columns['status']
+    time_col = columns['time']
+    punch_mode = columns['punch_mode']
+    punch_id_col = columns['punch_id']
     
     # Show detected columns
     with st.expander("🎯 **Column Detection Results**", expanded=True):
@@ -76,11 +207,19 @@ def process_attendance_data(df):
             st.write(f"• **Date:** {date_col or '❌ Not found'}")
         with col2:
             st.write("📊 **Data Columns:**")
-            st.write(f"• **Status:** {status_col or '❌ Not found'}")
+            st.write(f"• **Status:** {status_col or ('⏱️ From punch times' if punch_mode else '❌ Not found')}")
             st.write(f"• **Time:** {time_col or '❌ Optional'}")
+        if columns['cached']:
+            st.caption("⚡ Known file layout - column detection reused from an earlier upload")
+    
+    shift = None
+    if punch_mode:
+        st.info("⏱️ **Punch log detected:** each row is one device punch, so daily status is derived from first-in / last-out times (2+ punches = P, 1 punch = I, none = A).")
+        
+        shift = shift_settings()
     
     # Manual column selection if auto-detection fails
-    if not all([name_col, date_col, status_col]):
+    elif not all([name_col, date_col, status_col]):
         st.warning("⚠️ **Could not auto-detect all required columns. Please help us identify them:**")
         
         col1, col2, col3 = st.columns(3)
@@ -94,99 +233,70 @@ def process_attendance_data(df):
             status_col = st.selectbox("✅ Select Status Column:", df.columns,
                                     index=list(df.columns).index(status_col) if status_col else 2)
     
+    duplicates = FIRST
+    if not punch_mode:
+        duplicates = st.radio("📑 **When a student has several records on one day:**", list(DUPLICATE_POLICIES),
+                              format_func=DUPLICATE_POLICIES.get, horizontal=True)
+    
+    calendar = calendar_settings()
+    
     try:
         # Create pivot table: Names as rows, Dates as columns, Status as values
         st.info("🔄 **Processing your data into attendance report format...**")
         
-        df_clean = df.copy()
-        
-        # Convert date column to proper date format
-        try:
-            df_clean[date_col] = pd.to_datetime(df_clean[date_col]).dt.strftime('%m/%d/%Y')
-        except:
-            st.warning("⚠️ Could not parse dates, keeping original format")
-        
-        # Standardize status values - handle numeric values as well
-        df_clean[status_col] = df_clean[status_col].astype(str).str.upper()
+        if roll_col not in df.columns:
+            roll_col = None
+        columns.update(name=name_col, roll=roll_col, date=date_col, status=status_col)
         
-        # Check if values are numeric (likely student IDs) - convert to P if present, A if missing
-        sample_values = df_clean[status_col].dropna().head(10).tolist()
-        is_numeric = all(val.replace('.', '').replace('-', '').isdigit() or val == 'NAN' for val in sample_values)
+        def build():
+            return build_report(df, columns, duplicates, shift, stream_source, calendar)
         
-        st.info(f"🔍 **Data Type Detection:** {'Numeric values detected (treating numbers as Present)' if is_numeric else 'Text values detected'}")
-        
-        if is_numeric:
-            # If numeric values, treat any number as Present, NaN/empty as Absent
-            df_clean[status_col] = df_clean[status_col].apply(lambda x: 'P' if x not in ['NAN', '', '-', 'NONE', 'nan'] and str(x).replace('.', '').replace('-', '').isdigit() else 'A')
+        if cache_key is not None:
+            # Reuse the report while the file and the column mapping are unchanged
+            key = (cache_key, name_col, date_col, status_col, roll_col, stream_source is not None,
+                   tuple(sorted(shift.items())) if shift else None, duplicates,
+                   calendar.signature if calendar else None)
+            report, notes = get_caches()['report'].get_or_compute(key, build)
         else:
-            # Standard text-based conversion
-            df_clean[status_col] = df_clean[status_col].replace({
-                'PRESENT': 'P',
-                'ABSENT': 'A',
-                'INCOMPLETE': 'I',
-                'TRUE': 'P',
-                'FALSE': 'A',
-                '1': 'P',
-                '0': 'A'
-            })
+            report, notes = build()
         
-        # Show conversion sample
-        with st.expander("🔄 **Status Conversion Preview**", expanded=False):
-            conversion_sample = pd.DataFrame({
-                'Original': df[status_col].head(10),
-                'Converted': df_clean[status_col].head(10)
-            })
-            st.dataframe(conversion_sample)
+        # The compact matrix is what gets cached; the app works on its DataFrame view
+        with span('report_frame', rows=len(report)):
+            pivot_df = report.to_frame()
         
-        # Use just the status column (P/A only)
-        value_col = status_col
+        render_store_save(df, stream_source, cache_key, name_col, date_col, status_col, roll_col,
+                          punch_mode, punch_id_col)
         
-        # Create pivot table
-        index_cols = [roll_col, name_col] if roll_col and roll_col in df_clean.columns else [name_col]
+        if notes is None:
+            st.success("✅ **Data processed successfully!** (streamed in chunks)")
+            return pivot_df
         
-        pivot_df = df_clean.pivot_table(
-            index=index_cols,
-            columns=date_col,
-            values=value_col,
-            aggfunc='first'  # Take first value if duplicates
-        ).reset_index()
-        
-        # Flatten column names
-        pivot_df.columns.name = None
-        
-        # Rename the first columns
-        if roll_col and roll_col in pivot_df.columns:
-            pivot_df = pivot_df.rename(columns={roll_col: 'Roll No', name_col: 'Student Name'})
-        else:
-            pivot_df = pivot_df.rename(columns={name_col: 'Student Name'})
-            # Add a roll number column
-            pivot_df.insert(0, 'Roll No', range(1, len(pivot_df) + 1))
-        
-        # Calculate totals
-        date_columns = [col for col in pivot_df.columns if col not in ['Roll No', 'Student Name']]
-        
-        # Reorder columns first
-        base_cols = ['Roll No', 'Student Name', 'Total Present', 'Total Absent']
-        pivot_df = pivot_df[base_cols[:-2] + date_columns]  # Don't include Total columns yet
-        
-        # Fill NaN values with '-'
-        pivot_df = pivot_df.fillna('-')
+        if 'daily' in notes:
+            daily = notes['daily']
+            with st.expander("⏱️ **Daily Punch Summary**", expanded=False):
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    st.metric("Employee-days", len(daily))
+                with col2:
+                    st.metric("Late arrivals", int(daily['Late'].sum()))
+                with col3:
+                    st.metric("Early leaves", int(daily['Early Leave'].sum()))
+                st.dataframe(daily, use_container_width=True)
+            st.success("✅ **Punch log processed successfully!**")
+            return pivot_df
         
-        # Now calculate totals after filling NaN values
-        pivot_df['Total Present'] = 0
-        pivot_df['Total Absent'] = 0
+        if not notes['dates_parsed']:
+            st.warning("⚠️ Could not parse dates, keeping original format")
         
-        for col in date_columns:
-            # Count P as present
-            pivot_df['Total Present'] += (pivot_df[col] == 'P').astype(int)
-            # Count A as absent  
-            pivot_df['Total Absent'] += (pivot_df[col] == 'A').astype(int)
-            # Also count '-' (missing data) as absent
-            pivot_df['Total Absent'] += (pivot_df[col] == '-').astype(int)
+        st.info(f"🔍 **Data Type Detection:** {'Numeric values detected (treating numbers as Present)' if notes['is_numeric'] else 'Text values detected'}")
         
-        # Reorder columns with totals
-        base_cols = ['Roll No', 'Student Name', 'Total Present', 'Total Absent']
-        pivot_df = pivot_df[base_cols + date_columns]
+        # Show conversion sample
+        other_statuses = notes['other_statuses']
+        if other_statuses:
+            st.warning(f"⚠️ **Unrecognised status values kept as they are** (counted as neither present nor "
+                       f"absent): {', '.join(other_statuses)}")
+        with st.expander("🔄 **Status Conversion Preview**", expanded=bool(other_statuses)):
+            st.dataframe(notes['conversion_sample'])
         
         st.success("✅ **Data processed successfully!**")
         return pivot_df
@@ -214,80 +324,361 @@ def process_attendance_data(df):
         
         return df
 
+# Cell CSS per attendance status (the preview's color coding)
+STATUS_CSS = {
+    'P': 'background-color: #d4edda; color: #155724; font-weight: bold; text-align: center; border: 1px solid #c3e6cb',
+    'A': 'background-color: #f8d7da; color: #721c24; font-weight: bold; text-align: center; border: 1px solid #f5c6cb',
+    'I': 'background-color: #fff3cd; color: #856404; font-weight: bold; text-align: center; border: 1px solid #ffeaa7',
+    'L': 'background-color: #cfe2ff; color: #084298; font-weight: bold; text-align: center; border: 1px solid #b6d4fe',
+    'H': 'background-color: #e2d9f3; color: #432874; font-weight: bold; text-align: center; border: 1px solid #c5b3e6',
+    'W': 'background-color: #d1ecf1; color: #0c5460; font-weight: bold; text-align: center; border: 1px solid #bee5eb',
+    '-': 'background-color: #e2e3e5; color: #383d41; font-weight: bold; text-align: center; border: 1px solid #d1d3d4',
+}
+
 def style_dataframe(df):
     """Apply styling to the dataframe for better visualization"""
-    
     def color_attendance(val):
-        if val == 'P':
-            return 'background-color: #d4edda; color: #155724; font-weight: bold; text-align: center; border: 1px solid #c3e6cb'
-        elif val == 'A':
-            return 'background-color: #f8d7da; color: #721c24; font-weight: bold; text-align: center; border: 1px solid #f5c6cb'
-        elif val == 'I':
-            return 'background-color: #fff3cd; color: #856404; font-weight: bold; text-align: center; border: 1px solid #ffeaa7'
-        elif val == '-':
-            return 'background-color: #e2e3e5; color: #383d41; font-weight: bold; text-align: center; border: 1px solid #d1d3d4'
+        if isinstance(val, str):
+            return STATUS_CSS.get(val, '')
         return ''
     
     # Apply styling to attendance columns (skip first 4 columns: Roll No, Name, Total Present, Total Absent)
     styled_df = df.style.applymap(color_attendance)
     return styled_df
 
-def create_excel_download(df, filename):
-    """Create Excel file for download"""
-    output = io.BytesIO()
+def matching_rows(df, search=''):
+    """Row positions of a report whose Roll No / Student Name contain `search` (case-insensitive)"""
+    needle = search.strip().lower()
+    if not needle:
+        return np.arange(len(df))
+    matches = (df['Student Name'].astype(str).str.lower().str.contains(needle, regex=False) |
+               df['Roll No'].astype(str).str.lower().str.contains(needle, regex=False))
+    return np.flatnonzero(matches.to_numpy())
+
+def report_page(df, positions, page=1, page_size=50, dates=None):
+    """Slice one preview page out of the matching_rows `positions` of a report (no Streamlit calls)
     
-    with pd.ExcelWriter(output, engine='openpyxl') as writer:
-        df.to_excel(writer, sheet_name='Attendance Report', index=False)
-        
-        # Get worksheet for formatting
-        worksheet = writer.sheets['Attendance Report']
-        
-        # Auto-adjust column widths
-        for column in worksheet.columns:
-            max_length = 0
-            column_letter = column[0].column_letter
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            adjusted_width = min(max_length + 2, 20)
-            worksheet.column_dimensions[column_letter].width = adjusted_width
-        
-        # Apply formatting
-        from openpyxl.styles import Font, PatternFill, Alignment
-        
-        # Header formatting
-        header_font = Font(bold=True, color="FFFFFF")
-        header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-        
-        for cell in worksheet[1]:
-            cell.font = header_font
-            cell.fill = header_fill
-            cell.alignment = Alignment(horizontal='center', vertical='center')
-        
-        # Color code attendance with softer, eye-friendly colors
-        for row in worksheet.iter_rows(min_row=2, max_row=worksheet.max_row):
-            for cell in row:
-                if cell.value == 'P':
-                    cell.fill = PatternFill(start_color="d4edda", end_color="d4edda", fill_type="solid")
-                    cell.font = Font(color="155724", bold=True)
-                elif cell.value == 'A':
-                    cell.fill = PatternFill(start_color="f8d7da", end_color="f8d7da", fill_type="solid")
-                    cell.font = Font(color="721c24", bold=True)
-                elif cell.value == 'I':
-                    cell.fill = PatternFill(start_color="fff3cd", end_color="fff3cd", fill_type="solid")
-                    cell.font = Font(color="856404", bold=True)
-                elif cell.value == '-':
-                    cell.fill = PatternFill(start_color="e2e3e5", end_color="e2e3e5", fill_type="solid")
-                    cell.font = Font(color="383d41", bold=True)
-                
-                if cell.column > 4:  # Attendance columns
-                    cell.alignment = Alignment(horizontal='center', vertical='center')
+    `dates` optionally limits the date columns shown.
+    """
+    start = (page - 1) * page_size
+    columns = list(df.columns) if dates is None else list(df.columns[:4]) + list(dates)
+    return df.iloc[positions[start:start + page_size]][columns]
+
+def render_report_preview(report_df, fingerprint):
+    """Paged, searchable color-coded preview
+    
+    Only the visible page (and date window) is styled, so large reports
+    never go through a full-table Styler. Search results and page
+    DataFrames are cached; the page is styled on every render.
+    """
+    date_columns = list(report_df.columns[4:])
+    
+    col1, col2, col3 = st.columns([3, 1, 1])
+    with col1:
+        search = st.text_input("🔎 Search by name or roll number", key="preview_search")
+    with col2:
+        page_size = st.selectbox("Rows per page", PREVIEW_PAGE_SIZES, index=1, key="preview_page_size")
+    
+    dates = None
+    if len(date_columns) > PREVIEW_MAX_DATES:
+        first, last = st.select_slider(
+            "📅 Dates shown",
+            options=date_columns,
+            value=(date_columns[0], date_columns[PREVIEW_MAX_DATES - 1]),
+            key="preview_dates"
+        )
+        dates = date_columns[date_columns.index(first):date_columns.index(last) + 1]
+    
+    needle = search.strip().lower()
+    positions = get_caches()['preview'].get_or_compute(('search', fingerprint, needle),
+                                                       lambda: matching_rows(report_df, needle))
+    matches = len(positions)
+    pages = max(1, -(-matches // page_size))
+    if st.session_state.get("preview_page", 1) > pages:
+        st.session_state["preview_page"] = pages
+    with col3:
+        page = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, step=1, key="preview_page")
+    
+    key = ('page', fingerprint, needle, int(page), page_size, tuple(dates) if dates else None)
+    page_df = get_caches()['preview'].get_or_compute(
+        key, lambda: report_page(report_df, positions, int(page), page_size, dates))
+    with span('style_preview', rows=len(page_df)):
+        styled_page = style_dataframe(page_df)
+    st.dataframe(styled_page, use_container_width=True, height=min(400, 38 + 35 * page_size))
+    
+    first_row = (int(page) - 1) * page_size + 1 if matches else 0
+    last_row = min(int(page) * page_size, matches)
+    filtered = f" (filtered from {len(report_df):,})" if search else ""
+    st.caption(f"Showing students {first_row:,}-{last_row:,} of {matches:,}{filtered}. "
+               "The downloaded workbook is fully color-coded.")
+
+def cached_excel_download(df, fingerprint=None, fmt=DEFAULT_FORMAT):
+    """Export bytes for a report, reused until the report's contents change
     
-    output.seek(0)
-    return output
+    `fmt` is one of attendance_export.EXPORT_FORMATS (the color-coded
+    workbook by default). Returns (data, seconds, cached) where `seconds` is
+    how long the file took to build and `cached` tells whether this call reused it.
+    """
+    df = as_report_frame(df)
+    if fingerprint is None:
+        fingerprint = frame_fingerprint(df)
+    
+    def build():
+        start = time.perf_counter()
+        if fmt == 'styled':
+            with span('excel_export', rows=len(df)):
+                data = create_excel_download(df, "attendance_report.xlsx").getvalue()
+        else:
+            with span(f'{fmt}_export', rows=len(df)):
+                data = create_report_download(df, fmt).getvalue()
+        return data, time.perf_counter() - start
+    
+    export_cache = get_caches()['export']
+    key = fingerprint if fmt == 'styled' else (fingerprint, fmt)
+    cached = key in export_cache
+    data, seconds = export_cache.get_or_compute(key, build)
+    return data, seconds, cached
+
+def render_download_section(report_df, fingerprint=None):
+    """Download controls: the file is only built when the user asks for it"""
+    if fingerprint is None:
+        fingerprint = frame_fingerprint(report_df)
+    fmt = st.selectbox("Export format", list(EXPORT_FORMATS), format_func=lambda name: EXPORT_FORMATS[name].label,
+                       help="Plain Excel, CSV and Parquet hold the same values without colors and "
+                            "are much faster to build for large reports")
+    export_format = EXPORT_FORMATS[fmt]
+    export = st.session_state.get('excel_export')
+    
+    # Drop a prepared file once the report it was built from (or the format) has changed
+    if export is not None and (export['fingerprint'] != fingerprint or export['format'] != fmt):
+        export = None
+        st.session_state.pop('excel_export', None)
+    
+    if export is None:
+        if st.button(f"📦 Prepare {export_format.label} Report", use_container_width=True,
+                     help="Build the export file for the current report"):
+            with st.spinner(f"📦 Building your {export_format.label} report..."):
+                data, seconds, cached = cached_excel_download(report_df, fingerprint, fmt)
+            export = {'fingerprint': fingerprint, 'format': fmt, 'data': data, 'seconds': seconds, 'cached': cached}
+            st.session_state['excel_export'] = export
+        else:
+            st.caption("The file is generated on demand and reused until the report changes.")
+            return
+    
+    st.download_button(
+        label=f"📥 Download Attendance Report ({export_format.label})",
+        data=export['data'],
+        file_name=f"attendance_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}{export_format.suffix}",
+        mime=export_format.mime,
+        help=f"Download the attendance report as {export_format.label}",
+        use_container_width=True
+    )
+    st.caption(f"⏱️ {export_format.label} export built in {export['seconds']:.2f}s"
+               f"{' (reused from cache)' if export['cached'] else ''} · {len(export['data']) / 1024:,.0f} KB")
+
+@profiled('read_excel')
+def read_uploaded_file(uploaded_file, low_memory=False):
+    """Read an uploaded Excel file with proper engine detection"""
+    if low_memory:
+        # Only the first chunk is loaded here; the report is streamed later
+        return read_excel_head(uploaded_file, filename=uploaded_file.name)
+    
+    return read_workbook(uploaded_file, uploaded_file.name)
+
+def read_merged_uploads(uploaded_files, all_sheets=True):
+    """Parse the sheets of several uploads in parallel and merge their records
+    
+    Returns (records, per-sheet timings, duplicate records removed); raises when no sheet could be read.
+    """
+    with span('read_sheets') as record:
+        results = read_sheets([(f.getvalue(), f.name) for f in uploaded_files], all_sheets=all_sheets,
+                              executor=get_merge_pool())
+        record['rows'] = sum(result['rows'] for result in results)
+    with span('merge_sheets') as record:
+        df, duplicates = merge_records(results)
+        record['rows'] = len(df)
+    return df, sheet_timings(results), duplicates
+
+def render_performance(profiler):
+    """Per-stage timings of this run (stages served from cache don't appear)"""
+    with st.expander("⏱️ **Performance**", expanded=True):
+        if not profiler.spans:
+            st.caption("No processing stage ran on this run (nothing to process, or everything came from cache).")
+            return
+        st.dataframe(profiler.table(), use_container_width=True, hide_index=True)
+        total = sum(record['seconds'] for record in profiler.spans if record['depth'] == 0)
+        st.caption(f"Total measured: {total:.2f}s. peak_mb is the highest resident memory (RSS) of the app process seen during each stage.")
+
+def render_report(report_df):
+    """Statistics, preview or editor, download and per-student statistics for a report"""
+    # Only show results if processing was successful
+    if report_df is None or len(report_df) == 0:
+        return
+    
+    report_fingerprint = frame_fingerprint(report_df)
+    
+    # Display statistics
+    st.markdown("### 📊 **Report Statistics**")
+    
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        st.metric(
+            label="👥 Total Students",
+            value=len(report_df)
+        )
+    
+    with col2:
+        if 'Total Present' in report_df.columns:
+            total_present = report_df['Total Present'].sum()
+            st.metric(
+                label="✅ Total Present",
+                value=int(total_present)
+            )
+        else:
+            st.metric(label="✅ Total Present", value="N/A")
+    
+    with col3:
+        if 'Total Absent' in report_df.columns:
+            total_absent = report_df['Total Absent'].sum()
+            st.metric(
+                label="❌ Total Absent (incl. No Data)",
+                value=int(total_absent)
+            )
+        else:
+            st.metric(label="❌ Total Absent (incl. No Data)", value="N/A")
+    
+    with col4:
+        date_columns = [col for col in report_df.columns if col not in ['Roll No', 'Student Name', 'Total Present', 'Total Absent']]
+        st.metric(
+            label="📅 Date Columns",
+            value=len(date_columns)
+        )
+    
+    st.markdown("---")
+    
+    # Display processed report
+    st.markdown("### 📋 **Attendance Report Preview**")
+    st.markdown("**Legend:** 🟢 **P** = Present | 🔴 **A** = Absent | 🟡 **I** = Incomplete | ⚫ **-** = No Data"
+                " | 🔵 **L** = Leave | 🟣 **H** = Holiday | ⚪ **W** = Weekend")
+    st.markdown("**Note:** Both 'A' (Absent) and '-' (No Data) are counted as absent in totals; "
+                "leave, holidays and weekends are not counted.")
+    
+    # Add editing option
+    edit_mode = st.toggle("✏️ **Enable Editing Mode**", value=False, help="Turn on to edit attendance data manually")
+    
+    if edit_mode:
+        st.info("📝 **Editing Mode Active:** You can now edit the attendance data directly. Changes will be reflected in the download.")
+        
+        # Create editable dataframe
+        # Configure columns for better editing experience
+        date_columns = [col for col in report_df.columns if col not in ['Roll No', 'Student Name', 'Total Present', 'Total Absent']]
+        column_config = {
+            "Roll No": st.column_config.NumberColumn(
+                "Roll No",
+                help="Student roll number",
+                disabled=True,
+                width="small"
+            ),
+            "Student Name": st.column_config.TextColumn(
+                "Student Name",
+                help="Student name",
+                disabled=True,
+                width="medium"
+            ),
+            "Total Present": st.column_config.NumberColumn(
+                "Total Present",
+                help="Total present days (auto-calculated)",
+                disabled=True,
+                width="small"
+            ),
+            "Total Absent": st.column_config.NumberColumn(
+                "Total Absent (incl. No Data)", 
+                help="Total absent days including 'No Data' entries (auto-calculated)",
+                disabled=True,
+                width="small"
+            )
+        }
+        
+        # Add selectbox configuration for date columns
+        for col in date_columns:
+            column_config[col] = st.column_config.SelectboxColumn(
+                col,
+                options=['P', 'A', 'I', 'L', 'H', 'W', '-'],
+                help="P=Present, A=Absent, I=Incomplete, L=Leave, H=Holiday, W=Weekend, -=No Data",
+                width="small"
+            )
+        
+        edited_df = st.data_editor(
+            report_df,
+            use_container_width=True,
+            height=400,
+            column_config=column_config,
+            key="attendance_editor"
+        )
+        
+        # Recalculate totals only for the rows touched in the editor
+        edited_rows = st.session_state.get("attendance_editor", {}).get("edited_rows", {})
+        if edited_rows:
+            rows = edited_row_positions(edited_rows)
+            present_delta, absent_delta = update_report_totals(edited_df, rows, date_columns)
+            
+            # Update the report_df for download; the edits identify its contents.
+            # Any edit therefore invalidates the whole export and the statistics:
+            # the export is rebuilt in full, but only when a download is prepared,
+            # and the unedited preview pages stay cached under the old fingerprint.
+            report_df = edited_df
+            edits = json.dumps(edited_rows, sort_keys=True, default=str)
+            report_fingerprint = content_hash(f"{report_fingerprint}:{edits}".encode())
+            st.success(f"✅ **Data updated!** Totals recalculated for {len(rows)} edited student(s).")
+            
+            # Show updated statistics (overall totals)
+            col1, col2 = st.columns(2)
+            with col1:
+                st.metric("Updated Total Present", int(total_present) + present_delta, delta=present_delta)
+            with col2:
+                st.metric("Updated Total Absent (incl. No Data)", int(total_absent) + absent_delta,
+                          delta=absent_delta, delta_color="inverse")
+            
+            # Show color-coded preview of the edited rows
+            st.markdown("### 🎨 **Color-Coded Preview of Your Edits**")
+            styled_edited_df = style_dataframe(edited_df.iloc[rows])
+            st.dataframe(styled_edited_df, use_container_width=True, height=min(300, 38 + 35 * len(rows)))
+        
+        st.markdown("**Editing Tips:**")
+        st.markdown("- **Click on attendance cells** to edit with dropdown menu: P, A, I, L, H, W or -")
+        st.markdown("- **P** = Present, **A** = Absent, **I** = Incomplete, **L** = Leave, **H** = Holiday, "
+                    "**W** = Weekend, **-** = No Data")
+        st.markdown("- **Individual student totals** update automatically for each row")
+        st.markdown("- **Overall totals** update automatically when you make changes")
+        st.markdown("- **Color preview** shows below when you edit data")
+        st.markdown("- **Roll No and Student Name** cannot be edited")
+    else:
+        # Style and display only the visible page (read-only)
+        render_report_preview(report_df, report_fingerprint)
+    
+    # Download section
+    st.markdown("### 💾 **Download Your Report**")
+    
+    col1, col2 = st.columns([2, 1])
+    
+    with col1:
+        # Create download file only when requested
+        render_download_section(report_df, report_fingerprint)
+    
+    with col2:
+        st.info("📄 **Report Features:**\n- Color-coded attendance\n- Professional formatting\n- Auto-adjusted columns\n- Summary statistics")
+    
+    # Summary statistics, computed once per report version
+    with st.expander("📈 **Detailed Student Statistics**", expanded=False):
+        with span('statistics', rows=len(report_df)):
+            summary = get_caches()['report'].get_or_compute(('summary', report_fingerprint),
+                                                              lambda: summarize_report(report_df))
+        st.caption(f"Chronic absentees attend less than {CHRONIC_ATTENDANCE_PERCENT:.0f}% of their counted days. "
+                   "These tables are also included as sheets in the color-coded Excel report.")
+        for tab, (name, table) in zip(st.tabs(list(summary)), summary.items()):
+            with tab:
+                st.dataframe(table, use_container_width=True, hide_index=True)
 
 # Streamlit App
 def main():
@@ -374,247 +765,201 @@ def main():
     
     st.markdown("---")
     
+    # Reports can also come from previously saved uploads
+    store = AttendanceStore()
+    source = "📁 Upload a file"
+    if store:
+        source = st.radio("Report source", ["📁 Upload a file", "🗄️ Saved history"], horizontal=True,
+                          label_visibility="collapsed")
+    
+    profile_run = st.toggle(
+        "⏱️ **Performance profiling**",
+        value=False,
+        help="Time each processing stage (with peak memory) and show the results at the bottom of the page"
+    )
+    profiler = Profiler() if profile_run else None
+    
+    with profiling(profiler) if profiler else nullcontext():
+        if source == "🗄️ Saved history":
+            render_history_source(store)
+        else:
+            render_upload_source()
+    
+    if profiler is not None:
+        render_performance(profiler)
+
+def render_history_source(store):
+    """Report for a date range from the saved history store"""
+    st.markdown("### 🗄️ **Report from saved history**")
+    first, last = store.date_range()
+    date_range = st.date_input("📅 Report period", value=(first.date(), last.date()),
+                               min_value=first.date(), max_value=last.date())
+    # date_input returns a single date while the end of the range is being picked
+    if len(date_range) == 2:
+        with st.spinner("🔄 Building report from history..."):
+            report_df = process_attendance_data(store, date_range=date_range)
+        render_report(report_df)
+
+def render_background_job(uploaded_files, all_sheets=False):
+    """Submit the uploads as a background report job, poll it and show the finished report"""
+    queue = get_job_queue()
+    # The job detects the layout itself, so both settings are offered: the
+    # duplicate policy applies to status sheets, the shift to punch logs
+    duplicates = st.radio("📑 **When a student has several records on one day:**", list(DUPLICATE_POLICIES),
+                          format_func=DUPLICATE_POLICIES.get, horizontal=True)
+    shift = shift_settings()
+    calendar = calendar_settings()
+    key = (tuple(content_hash(f.getvalue()) for f in uploaded_files), all_sheets, duplicates,
+           tuple(sorted(shift.items())), calendar.signature if calendar else None)
+    job = st.session_state.get('report_job')
+    if job is None or job['key'] != key:
+        if job is not None:
+            queue.cancel(job['id'])
+        job_id = queue.submit(report_job, [(f.getvalue(), f.name) for f in uploaded_files], all_sheets=all_sheets,
+                              duplicates=duplicates, shift=shift, calendar=calendar,
+                              label=', '.join(f.name for f in uploaded_files))
+        job = st.session_state['report_job'] = {'id': job_id, 'key': key}
+    
+    status = queue.status(job['id'])
+    if status is None:
+        # The finished job was dropped from the queue; build it again
+        st.session_state.pop('report_job', None)
+        st.rerun()
+    
+    if status['state'] in (QUEUED, RUNNING):
+        st.progress(status['progress'], text=f"⏳ {status['message']} ({status['seconds']:.0f}s, job {status['id']})")
+        if st.button("🛑 Cancel report generation"):
+            queue.cancel(job['id'])
+            st.rerun()
+        time.sleep(JOB_POLL_SECONDS)
+        st.rerun()
+    
+    if status['state'] in (CANCELLED, FAILED):
+        if status['state'] == FAILED:
+            st.error(f"❌ **Error processing file:** {status['error']}")
+        else:
+            st.warning("🛑 Report generation was cancelled.")
+        if st.button("🔁 Start again"):
+            queue.forget(job['id'])
+            st.session_state.pop('report_job', None)
+            st.rerun()
+        return
+    
+    result = queue.result(job['id'])
+    columns = result['columns']
+    st.success(f"✅ **Report built in the background** in {status['seconds']:.1f}s "
+               f"({len(result['report'])} students × {len(result['report'].dates)} days)")
+    st.caption(f"Columns used: Name = {columns['name']}, Date = {columns['date']}, "
+               f"Status = {columns['status'] or 'from punch times'}, Roll = {columns['roll'] or '-'}")
+    if len(result['sheets']) > 1:
+        with st.expander("📚 **Sheets Read**", expanded=False):
+            st.dataframe(result['sheets'], use_container_width=True, hide_index=True)
+            st.caption(f"{result['duplicates_removed']} duplicate records removed.")
+    
+    profiler = active_profiler()
+    if profiler is not None:
+        profiler.spans.extend(dict(record, stage=f"job: {record['stage']}") for record in result['spans'])
+    
+    report_df = result['report'].to_frame()
+    fingerprint = frame_fingerprint(report_df)
+    export = st.session_state.get('excel_export')
+    if export is None or export['fingerprint'] != fingerprint:
+        # The job already built the workbook; offer it without another export
+        seconds = sum(record['seconds'] for record in result['spans'] if record['stage'] == 'excel_export')
+        st.session_state['excel_export'] = {'fingerprint': fingerprint, 'format': 'styled', 'data': result['export'],
+                                            'seconds': seconds, 'cached': False}
+    render_report(report_df)
+
+def render_upload_source():
+    """Upload, process and show a report for an Excel file"""
     # File upload section
     st.markdown("### 📁 **Upload your attendance data**")
     
-    uploaded_file = st.file_uploader(
+    uploaded_files = st.file_uploader(
         "Choose your Excel file",
         type=['xlsx', 'xls'],
-        help="Upload your attendance Excel file (max 200MB)",
+        accept_multiple_files=True,
+        help="Upload your attendance Excel file, or several to merge them into one report (max 200MB each)",
         label_visibility="collapsed"
     )
     
-    if uploaded_file is not None:
+    all_sheets = st.toggle(
+        "📚 **Merge all sheets**",
+        value=False,
+        help="Read every sheet of every uploaded workbook (e.g. one sheet per month) and merge them into one report"
+    )
+    
+    low_memory = st.toggle(
+        "🪶 **Low-memory mode**",
+        value=False,
+        help="Stream very large exports in chunks instead of loading the whole workbook at once"
+    )
+    
+    background = st.toggle(
+        "🧵 **Background processing**",
+        value=False,
+        help="Build the report in a shared worker pool so large files don't block the page; "
+             "columns must be detectable automatically"
+    )
+    
+    if uploaded_files and background:
+        render_background_job(uploaded_files, all_sheets)
+    elif uploaded_files:
         try:
-            # Read the uploaded file with proper engine detection
-            with st.spinner("📖 Reading your Excel file..."):
-                file_extension = uploaded_file.name.split('.')[-1].lower()
+            merge_mode = all_sheets or len(uploaded_files) > 1
+            stream_source = None
+            if merge_mode:
+                if low_memory:
+                    st.info("🪶 Low-memory mode streams a single sheet; in merge mode every sheet is read in full.")
+                with st.spinner("📚 Reading all sheets in parallel..."):
+                    # Cached by the uploads' content hashes, like single-file reads
+                    file_hashes = tuple(content_hash(f.getvalue()) for f in uploaded_files)
+                    file_hash = content_hash('|'.join(file_hashes + (str(all_sheets),)).encode())
+                    df, sheets, duplicates = get_caches()['parsed'].get_or_compute(
+                        ('merge', file_hashes, all_sheets),
+                        lambda: read_merged_uploads(uploaded_files, all_sheets)
+                    )
+                records_msg = (f"Merged {len(df)} records from {len(sheets)} sheet(s) in {len(uploaded_files)} file(s)"
+                               f" ({duplicates} duplicate records removed)")
+            else:
+                uploaded_file = uploaded_files[0]
+                # Read the uploaded file with proper engine detection
+                with st.spinner("📖 Reading your Excel file..."):
+                    # Parsed uploads are cached by content hash, so reruns skip read_excel
+                    file_hash = content_hash(uploaded_file.getvalue())
+                    df = get_caches()['parsed'].get_or_compute(
+                        (file_hash, low_memory),
+                        lambda: read_uploaded_file(uploaded_file, low_memory)
+                    )
                 
-                if file_extension == 'xls':
-                    df = pd.read_excel(uploaded_file, engine='xlrd')
-                elif file_extension in ['xlsx', 'xlsm']:
-                    df = pd.read_excel(uploaded_file, engine='openpyxl')
+                if low_memory:
+                    stream_source = uploaded_file
+                    records_msg = f"Loaded the first {len(df)} records for preview (low-memory mode)"
                 else:
-                    try:
-                        df = pd.read_excel(uploaded_file, engine='openpyxl')
-                    except:
-                        df = pd.read_excel(uploaded_file, engine='xlrd')
+                    records_msg = f"Found {len(df)} records in your file"
             
             # Success message
             st.markdown(f"""
             <div class="success-msg">
                 ✅ <strong>File uploaded successfully!</strong><br>
-                📊 Found {len(df)} records in your file
+                📊 {records_msg}
             </div>
             """, unsafe_allow_html=True)
             
+            if merge_mode:
+                with st.expander("📚 **Sheets Read**", expanded=False):
+                    st.dataframe(sheets, use_container_width=True, hide_index=True)
+                    st.caption(f"Sheets were parsed in parallel; slowest sheet took {sheets['seconds'].max():.2f}s.")
+            
             # Show original data preview
             with st.expander("📋 **Original Data Preview**", expanded=False):
                 st.dataframe(df.head(10), use_container_width=True)
             
             # Process the data
             with st.spinner("🔄 Processing your attendance data..."):
-                report_df = process_attendance_data(df)
+                report_df = process_attendance_data(df, stream_source=stream_source, cache_key=file_hash)
             
-            # Only show results if processing was successful
-            if report_df is not None and len(report_df) > 0:
-                # Display statistics
-                st.markdown("### 📊 **Report Statistics**")
-                
-                col1, col2, col3, col4 = st.columns(4)
-                
-                with col1:
-                    st.metric(
-                        label="👥 Total Students",
-                        value=len(report_df)
-                    )
-                
-                with col2:
-                    if 'Total Present' in report_df.columns:
-                        total_present = report_df['Total Present'].sum()
-                        st.metric(
-                            label="✅ Total Present",
-                            value=int(total_present)
-                        )
-                    else:
-                        st.metric(label="✅ Total Present", value="N/A")
-                
-                with col3:
-                    if 'Total Absent' in report_df.columns:
-                        total_absent = report_df['Total Absent'].sum()
-                        st.metric(
-                            label="❌ Total Absent (incl. No Data)",
-                            value=int(total_absent)
-                        )
-                    else:
-                        st.metric(label="❌ Total Absent (incl. No Data)", value="N/A")
-                
-                with col4:
-                    date_columns = [col for col in report_df.columns if col not in ['Roll No', 'Student Name', 'Total Present', 'Total Absent']]
-                    st.metric(
-                        label="📅 Date Columns",
-                        value=len(date_columns)
-                    )
-                
-                st.markdown("---")
-                
-                # Display processed report
-                st.markdown("### 📋 **Attendance Report Preview**")
-                st.markdown("**Legend:** 🟢 **P** = Present | 🔴 **A** = Absent | 🟡 **I** = Incomplete | ⚫ **-** = No Data")
-                st.markdown("**Note:** Both 'A' (Absent) and '-' (No Data) are counted as absent in totals.")
-                
-                # Add editing option
-                edit_mode = st.toggle("✏️ **Enable Editing Mode**", value=False, help="Turn on to edit attendance data manually")
-                
-                if edit_mode:
-                    st.info("📝 **Editing Mode Active:** You can now edit the attendance data directly. Changes will be reflected in the download.")
-                    
-                    # Create editable dataframe
-                    # Configure columns for better editing experience
-                    date_columns = [col for col in report_df.columns if col not in ['Roll No', 'Student Name', 'Total Present', 'Total Absent']]
-                    column_config = {
-                        "Roll No": st.column_config.NumberColumn(
-                            "Roll No",
-                            help="Student roll number",
-                            disabled=True,
-                            width="small"
-                        ),
-                        "Student Name": st.column_config.TextColumn(
-                            "Student Name",
-                            help="Student name",
-                            disabled=True,
-                            width="medium"
-                        ),
-                        "Total Present": st.column_config.NumberColumn(
-                            "Total Present",
-                            help="Total present days (auto-calculated)",
-                            disabled=True,
-                            width="small"
-                        ),
-                        "Total Absent": st.column_config.NumberColumn(
-                            "Total Absent (incl. No Data)", 
-                            help="Total absent days including 'No Data' entries (auto-calculated)",
-                            disabled=True,
-                            width="small"
-                        )
-                    }
-                    
-                    # Add selectbox configuration for date columns
-                    for col in date_columns:
-                        column_config[col] = st.column_config.SelectboxColumn(
-                            col,
-                            options=['P', 'A', 'I', '-'],
-                            help="P=Present, A=Absent, I=Incomplete, -=No Data",
-                            width="small"
-                        )
-                    
-                    edited_df = st.data_editor(
-                        report_df,
-                        use_container_width=True,
-                        height=400,
-                        column_config=column_config,
-                        key="attendance_editor"
-                    )
-                    
-                    # Recalculate totals when data is edited
-                    if not edited_df.equals(report_df):
-                        date_columns = [col for col in edited_df.columns if col not in ['Roll No', 'Student Name', 'Total Present', 'Total Absent']]
-                        
-                        # Recalculate individual student totals (row by row)
-                        for index, row in edited_df.iterrows():
-                            present_count = 0
-                            absent_count = 0
-                            
-                            # Count P, A, and - for each student
-                            for col in date_columns:
-                                val = row[col]
-                                if val == 'P':
-                                    present_count += 1
-                                elif val == 'A' or val == '-':
-                                    absent_count += 1
-                            
-                            # Update the individual student's totals
-                            edited_df.at[index, 'Total Present'] = present_count
-                            edited_df.at[index, 'Total Absent'] = absent_count
-                        
-                        # Update the report_df for download
-                        report_df = edited_df.copy()
-                        st.success("✅ **Data updated!** Individual and overall totals have been recalculated.")
-                        
-                        # Show updated statistics (overall totals)
-                        col1, col2 = st.columns(2)
-                        with col1:
-                            st.metric("Updated Total Present", int(edited_df['Total Present'].sum()))
-                        with col2:
-                            st.metric("Updated Total Absent (incl. No Data)", int(edited_df['Total Absent'].sum()))
-                        
-                        # Show color-coded preview of edited data
-                        st.markdown("### 🎨 **Color-Coded Preview of Your Edits**")
-                        styled_edited_df = style_dataframe(edited_df)
-                        st.dataframe(styled_edited_df, use_container_width=True, height=300)
-                    
-                    st.markdown("**Editing Tips:**")
-                    st.markdown("- **Click on attendance cells** to edit with dropdown menu: P, A, I, or -")
-                    st.markdown("- **P** = Present, **A** = Absent, **I** = Incomplete, **-** = No Data")
-                    st.markdown("- **Individual student totals** update automatically for each row")
-                    st.markdown("- **Overall totals** update automatically when you make changes")
-                    st.markdown("- **Color preview** shows below when you edit data")
-                    st.markdown("- **Roll No and Student Name** cannot be edited")
-                else:
-                    # Style and display the dataframe (read-only)
-                    styled_df = style_dataframe(report_df)
-                    st.dataframe(styled_df, use_container_width=True, height=400)
-                
-                # Download section
-                st.markdown("### 💾 **Download Your Report**")
-                
-                col1, col2 = st.columns([2, 1])
-                
-                with col1:
-                    # Create download file
-                    excel_file = create_excel_download(report_df, "attendance_report.xlsx")
-                    
-                    st.download_button(
-                        label="📥 Download Attendance Report (Excel)",
-                        data=excel_file,
-                        file_name=f"attendance_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
-                        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                        help="Download the formatted attendance report as an Excel file",
-                        use_container_width=True
-                    )
-                
-                with col2:
-                    st.info("📄 **Report Features:**\n- Color-coded attendance\n- Professional formatting\n- Auto-adjusted columns\n- Summary statistics")
-                
-                # Summary statistics
-                with st.expander("📈 **Detailed Student Statistics**", expanded=False):
-                    summary_data = []
-                    for _, row in report_df.iterrows():
-                        date_cols = [col for col in report_df.columns if col not in ['Roll No', 'Student Name', 'Total Present', 'Total Absent']]
-                        present_count = 0
-                        absent_count = 0
-                        
-                        for col in date_cols:
-                            val = row[col]
-                            if val == 'P':
-                                present_count += 1
-                            elif val == 'A' or val == '-':
-                                absent_count += 1
-                        
-                        total_days = present_count + absent_count
-                        attendance_pct = round((present_count / total_days * 100), 2) if total_days > 0 else 0
-                        
-                        summary_data.append({
-                            'Roll No': row['Roll No'],
-                            'Student Name': row['Student Name'],
-                            'Present Days': present_count,
-                            'Absent Days': absent_count,
-                            'Total Days': total_days,
-                            'Attendance %': attendance_pct
-                        })
-                    
-                    summary_df = pd.DataFrame(summary_data)
-                    st.dataframe(summary_df, use_container_width=True)
+            render_report(report_df)
         
         except Exception as e:
             st.error(f"❌ **Error processing file:** {str(e)}")
@@ -0,0 +1,29 @@
+import numpy as np
+import pandas as pd
+
+from attendance_calendar import AttendanceCalendar, apply_calendar
+from attendance_dates import parse_dates
+from attendance_matrix import AttendanceMatrix
+from attendance_status import ABSENT
+
+
+def test_report_labels_are_read_month_first_after_a_day_first_upload():
+    parse_dates(['13/05/2025', '14/05/2025'])
+    calendar = AttendanceCalendar.from_rules([
+        {'rule': 'weekend', 'value': 'Saturday Sunday'},
+        {'rule': 'holiday', 'start': '2025-01-06', 'value': 'Epiphany'},
+    ])
+    students = pd.DataFrame({'Roll No': [1], 'Student Name': ['a']})
+    report = AttendanceMatrix(students, ['01/04/2025', '01/05/2025', '01/06/2025', '01/07/2025'],
+                              np.full((1, 4), ABSENT))
+
+    assert apply_calendar(report, calendar).labels().tolist() == [['W', 'W', 'H', 'A']]
+
+
+def test_calendar_without_a_weekend_rule_marks_no_weekends():
+    calendar = AttendanceCalendar.from_rules([{'rule': 'holiday', 'start': '2025-01-06', 'value': 'Epiphany'}])
+    students = pd.DataFrame({'Roll No': [1], 'Student Name': ['a']})
+    report = AttendanceMatrix(students, ['01/04/2025', '01/05/2025', '01/06/2025'], np.full((1, 3), ABSENT))
+
+    assert calendar.weekend == frozenset()
+    assert apply_calendar(report, calendar).labels().tolist() == [['A', 'A', 'H']]
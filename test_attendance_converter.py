@@ -0,0 +1,44 @@
+import os
+
+import pandas as pd
+
+from attendance_converter import input_root, report_path_for, run_batch
+
+
+def test_same_file_name_in_two_folders_gets_two_reports(tmp_path):
+    inputs = [str(tmp_path / 'branch_a' / 'attendance.xlsx'), str(tmp_path / 'branch_b' / 'attendance.xlsx')]
+    root = input_root(inputs)
+    output_dir = str(tmp_path / 'reports')
+
+    paths = [report_path_for(path, output_dir, root) for path in inputs]
+
+    assert paths == [os.path.join(output_dir, 'branch_a', 'attendance_attendance_report.xlsx'),
+                     os.path.join(output_dir, 'branch_b', 'attendance_attendance_report.xlsx')]
+
+
+def test_inputs_writing_the_same_report_fail(tmp_path):
+    inputs = []
+    for name in ('attendance.xls', 'attendance.xlsx'):
+        (tmp_path / name).write_bytes(b'')
+        inputs.append(str(tmp_path / name))
+
+    results = run_batch(inputs, str(tmp_path / 'reports'), workers=1)
+
+    assert [result['status'] for result in results] == ['failed', 'failed']
+    assert not os.path.exists(tmp_path / 'reports' / 'attendance_attendance_report.xlsx')
+
+
+def test_changed_options_rebuild_an_up_to_date_report(tmp_path):
+    source = str(tmp_path / 'attendance.xlsx')
+    pd.DataFrame({'Name': ['a', 'b'], 'Date': ['05/01/2025', '05/01/2025'], 'Status': ['P', 'A']}).to_excel(
+        source, index=False)
+    output_dir = str(tmp_path / 'reports')
+
+    def statuses(**options):
+        return [result['status'] for result in run_batch([source], output_dir, workers=1, **options)]
+
+    assert statuses() == ['ok']
+    assert statuses() == ['skipped']
+    assert statuses(chunk_rows=1) == ['ok']
+    assert statuses(chunk_rows=1) == ['skipped']
+    assert statuses(chunk_rows=1, formats=('styled', 'csv')) == ['ok']
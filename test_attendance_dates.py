@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import attendance_dates
+from attendance_dates import parse_dates
+
+
+AMBIGUOUS = ['05/01/2025', '05/02/2025', '05/03/2025']
+
+
+def test_ambiguous_dates_do_not_depend_on_earlier_calls():
+    before = parse_dates(AMBIGUOUS)
+    parse_dates(['13/05/2025', '14/05/2025'])
+    after = parse_dates(AMBIGUOUS)
+
+    expected = pd.to_datetime(['2025-05-01', '2025-05-02', '2025-05-03'])
+    assert list(before) == list(expected)
+    assert list(after) == list(expected)
+
+
+def test_day_first_sample_reads_day_first():
+    parsed = parse_dates(['13/05/2025', '01/06/2025'])
+    assert list(parsed) == list(pd.to_datetime(['2025-05-13', '2025-06-01']))
+
+
+@pytest.mark.parametrize('arrow', [True, False])
+def test_split_timestamps_parse_like_whole_timestamps(arrow, monkeypatch):
+    if not arrow:
+        monkeypatch.setattr(attendance_dates, '_arrow_compute', lambda: None)
+    stamps = pd.Timestamp('2025-05-01') + pd.to_timedelta(np.arange(0, 86400 * 3, 97), unit='s')
+    odd = ['05/01/2025 12:00:00 AM', '05/01/2025 12:30:00 pm', '05/01/2025 00:30:00 AM', '05/01/2025 13:00:00 PM',
+           '05/01/2025 7:59:60 PM', '05/01/2025  7:59:42 PM', '05/01/2025 7:59:42 PM ', '05/01/2025',
+           '02/30/2025 1:00:00 AM']
+    texts = pd.Series(list(stamps.strftime('%m/%d/%Y %I:%M:%S %p')) + odd, dtype=object)
+
+    parsed = parse_dates(texts)
+    monkeypatch.setattr(attendance_dates, 'SPLIT_MIN_VALUES', len(texts) + 1)
+    whole = parse_dates(texts)
+
+    pd.testing.assert_series_equal(parsed, whole)
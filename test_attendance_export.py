@@ -0,0 +1,107 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import attendance_export
+from attendance_export import write_classic_report, write_report, write_report_chunks, write_styled_report
+
+REPORT = pd.DataFrame({
+    'Roll No': pd.Series([1, 'A-2', 3.5, np.nan], dtype=object),
+    'Student Name': ['Tom & Jerry', '<b>"Bold"</b>', "O'Brien\n2nd line", '  spaced  '],
+    'Total Present': [2, 0, 1, 0],
+    'Total Absent': [0, 2, 1, 1],
+    '05/01/2025': ['P', 'A', np.nan, '-'],
+    '05/02/2025 <&>': ['P', 'A', 'I', np.nan],
+})
+
+
+def _written(df, fmt, chunks=None):
+    output = io.BytesIO()
+    if chunks is None:
+        write_report(df, output, fmt)
+    else:
+        write_report_chunks([df.iloc[start:start + chunks] for start in range(0, len(df), chunks)], output,
+                            list(df.columns), fmt)
+    output.seek(0)
+    return output
+
+
+@pytest.mark.parametrize('chunks', [None, 1])
+def test_plain_xlsx_reads_back_like_the_report(chunks, monkeypatch):
+    # Rows split across the writer's render blocks too
+    monkeypatch.setattr(attendance_export, 'XLSX_BLOCK_ROWS', 3)
+
+    read = pd.read_excel(_written(REPORT, 'xlsx', chunks))
+
+    pd.testing.assert_frame_equal(read, REPORT, check_dtype=False)
+    assert read['Roll No'].tolist()[:3] == [1, 'A-2', 3.5]
+
+
+def test_plain_xlsx_drops_characters_xml_cannot_hold():
+    df = pd.DataFrame({'Name': ['bell\x07 and tab\t', 'nul\x00'], 'Flag': [True, False], 'Value': [np.inf, 0.1]})
+
+    read = pd.read_excel(_written(df, 'xlsx'))
+
+    assert read['Name'].tolist() == ['bell and tab\t', 'nul']
+    assert read['Flag'].tolist() == [True, False]
+    assert read['Value'].isna().tolist() == [True, False]
+    assert read['Value'].iloc[1] == 0.1
+
+
+@pytest.mark.parametrize('chunks', [None, 1])
+def test_csv_reads_back_like_the_report(chunks):
+    read = pd.read_csv(_written(REPORT, 'csv', chunks), keep_default_na=False, na_values=[''])
+
+    assert list(read.columns) == list(REPORT.columns)
+    assert read['Roll No'].tolist()[:3] == ['1', 'A-2', '3.5']
+    assert np.isnan(read['Roll No'].iloc[3])
+    pd.testing.assert_frame_equal(read.drop(columns=['Roll No']), REPORT.drop(columns=['Roll No']),
+                                  check_dtype=False)
+
+
+@pytest.mark.parametrize('chunks', [None, 1])
+def test_parquet_reads_back_like_the_report(chunks):
+    pytest.importorskip('pyarrow')
+
+    read = pd.read_parquet(_written(REPORT, 'parquet', chunks))
+
+    # Mixed-type columns are stored as text; missing values stay missing
+    assert read['Roll No'].tolist()[:3] == ['1', 'A-2', '3.5']
+    assert read['Roll No'].isna().tolist() == [False, False, False, True]
+    pd.testing.assert_frame_equal(read.drop(columns=['Roll No']), REPORT.drop(columns=['Roll No']),
+                                  check_dtype=False)
+
+
+def _cell_styles(workbook):
+    """Per sheet: column widths and each cell's value, font, fill, border and alignment"""
+    sheets = {}
+    for worksheet in workbook.worksheets:
+        cells = [(cell.coordinate, cell.value, cell.font.b, cell.font.color.rgb if cell.font.color else None,
+                  cell.fill.fill_type, cell.fill.fgColor.rgb if cell.fill.fill_type else None,
+                  tuple(getattr(cell.border, side).style for side in ('left', 'right', 'top', 'bottom')),
+                  cell.alignment.horizontal, cell.alignment.vertical)
+                 for row in worksheet.iter_rows() for cell in row]
+        widths = {letter: worksheet.column_dimensions[letter].width for letter in 'ABCDEFG'}
+        sheets[worksheet.title] = (widths, cells)
+    return sheets
+
+
+def test_styled_export_looks_like_the_classic_export():
+    from openpyxl import load_workbook
+
+    report = REPORT.assign(**{'05/03/2025': ['L', 'H', 'W', 'LATE']})
+    extra_sheets = {'Summary': pd.DataFrame({'Student Name': ['Tom & Jerry', 'x'], 'Attendance %': [66.67, np.nan]})}
+    fast, classic = io.BytesIO(), io.BytesIO()
+    write_styled_report(report, fast, extra_sheets=extra_sheets)
+    write_classic_report(report, classic, extra_sheets=extra_sheets)
+
+    fast_styles, classic_styles = _cell_styles(load_workbook(fast)), _cell_styles(load_workbook(classic))
+
+    assert list(fast_styles) == list(classic_styles) == ['Attendance Report', 'Summary']
+    for name in classic_styles:
+        assert fast_styles[name][0] == classic_styles[name][0], name
+        assert len(fast_styles[name][1]) == len(classic_styles[name][1])
+        for fast_cell, classic_cell in zip(fast_styles[name][1], classic_styles[name][1]):
+            assert fast_cell == classic_cell
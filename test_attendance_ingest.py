@@ -0,0 +1,35 @@
+import io
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from attendance_core import build_attendance_report
+from attendance_ingest import stream_attendance_matrix
+from attendance_pivot import BEST, FIRST
+
+
+def _workbook(dates):
+    records = pd.DataFrame({'Name': ['a', 'b', 'a', 'b', 'c', 'c'], 'Date': dates,
+                            'Status': ['P', 'A', 'A', 'P', 'P', 'A']})
+    source = io.BytesIO()
+    records.to_excel(source, index=False)
+    source.seek(0)
+    return source
+
+
+@pytest.mark.parametrize('duplicates', [FIRST, BEST])
+@pytest.mark.parametrize('dates', [
+    ['05/01/2025', '05/02/2025', '05/01/2025', 'oops', '05/02/2025', '05/01/2025'],
+    ['05/01/2025', '05/02/2025', '05/01/2025', '13/05/2025', '05/02/2025', '05/01/2025'],
+    ['05/01/2025', datetime(2025, 5, 1), '05/02/2025', datetime(2025, 5, 1), '05/02/2025', ''],
+])
+def test_streamed_report_matches_whole_file_across_chunks(dates, duplicates):
+    source = _workbook(dates)
+    expected, _ = build_attendance_report(pd.read_excel(source), 'Name', 'Date', 'Status', duplicates=duplicates)
+    source.seek(0)
+
+    streamed = stream_attendance_matrix(source, 'Name', 'Date', 'Status', chunk_rows=2, duplicates=duplicates)
+
+    assert list(streamed.dates) == list(expected.dates)
+    pd.testing.assert_frame_equal(streamed.to_frame(), expected.to_frame())
@@ -0,0 +1,60 @@
+import io
+
+import pandas as pd
+import pytest
+
+from attendance_core import build_report, create_excel_download, detect_columns
+from attendance_jobs import JobCancelled, JobContext, report_job
+
+RECORDS = pd.DataFrame({
+    'Name': ['a', 'a', 'b', 'b', 'a'],
+    'Date': ['05/01/2025', '05/01/2025', '05/01/2025', '05/02/2025', '05/02/2025'],
+    'Status': ['A', 'A', 'P', 'A', 'P'],
+})
+
+
+def _upload(records, filename='records.xlsx'):
+    data = io.BytesIO()
+    records.to_excel(data, index=False)
+    return data.getvalue(), filename
+
+
+def _context(cancel_after=None):
+    """A JobContext that is cancelled once `cancel_after` progress updates were made"""
+    cancelled = {}
+
+    class Progress(dict):
+        def __setitem__(self, key, value):
+            super().__setitem__(key, value)
+            if cancel_after is not None and len(calls) >= cancel_after:
+                cancelled[key] = True
+            calls.append(value)
+
+    calls = []
+    progress = Progress()
+    return JobContext('job-1', progress, cancelled), calls
+
+
+def test_single_upload_job_matches_the_foreground():
+    context, _ = _context()
+    result = report_job(context, [_upload(RECORDS)])
+
+    expected, notes = build_report(RECORDS, detect_columns(RECORDS))
+    # The repeated record is kept: a single upload is not merged
+    assert result['duplicates_removed'] == 0
+    pd.testing.assert_frame_equal(result['notes']['conversion_sample'], notes['conversion_sample'])
+    pd.testing.assert_frame_equal(result['report'].to_frame(), expected.to_frame())
+    exported = pd.read_excel(io.BytesIO(result['export']), sheet_name=None)
+    foreground = pd.read_excel(create_excel_download(expected), sheet_name=None)
+    assert list(exported) == list(foreground)
+    for name in foreground:
+        pd.testing.assert_frame_equal(exported[name], foreground[name])
+
+
+def test_cancel_is_noticed_while_the_report_is_exported(monkeypatch):
+    monkeypatch.setattr('attendance_jobs.EXPORT_CHUNK_ROWS', 1)
+    context, calls = _context(cancel_after=4)
+
+    with pytest.raises(JobCancelled):
+        report_job(context, [_upload(RECORDS)])
+    assert calls[-1][1].startswith('Writing the Excel report')
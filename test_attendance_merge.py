@@ -0,0 +1,36 @@
+import io
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from attendance_merge import read_sheets
+
+
+def _workbook(sheets):
+    data = io.BytesIO()
+    with pd.ExcelWriter(data) as writer:
+        for name, frame in sheets.items():
+            frame.to_excel(writer, sheet_name=name, index=False)
+    return data.getvalue()
+
+
+def test_read_sheets_opens_each_workbook_once_on_a_shared_pool():
+    months = _workbook({'May': pd.DataFrame({'Name': ['x'], 'Status': ['P']}),
+                        'Jun': pd.DataFrame({'Name': ['y', 'z'], 'Status': ['A', 'P']})})
+    single = _workbook({'Sheet1': pd.DataFrame({'Name': ['q'], 'Status': ['P']})})
+    sources = [(months, 'months.xlsx'), (single, 'single.xlsx'), (b'not a workbook', 'broken.xlsx')]
+    submitted = []
+
+    class CountingPool(ThreadPoolExecutor):
+        def map(self, func, jobs):
+            jobs = list(jobs)
+            submitted.extend(jobs)
+            return super().map(func, jobs)
+
+    with CountingPool(max_workers=2) as pool:
+        results = read_sheets(sources, executor=pool)
+
+    assert len(submitted) == len(sources)
+    assert [(r['file'], r['sheet'], r['rows']) for r in results] == [
+        ('months.xlsx', 'May', 1), ('months.xlsx', 'Jun', 2), ('single.xlsx', 'Sheet1', 1), ('broken.xlsx', 0, 0)]
+    assert results[-1]['error'] is not None
@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from attendance_pivot import BEST, FIRST, pivot_codes
+from attendance_status import ABSENT, INCOMPLETE, LEAVE, NO_DATA, OTHER_CODE, PRESENT, STATUS_RANK
+
+
+def _records(seed, rolls_name_students=True, rows=400):
+    """Random records with repeated employee-days, missing keys and every status code"""
+    rng = np.random.default_rng(seed)
+    roll = rng.integers(1, 30, rows).astype(float)
+    if rolls_name_students:
+        name = np.array([f'student {int(r):02d}' for r in roll], dtype=object)
+    else:
+        # Some roll numbers are shared by two names
+        name = np.array([f'student {int(r) % 7}' for r in rng.integers(1, 30, rows)], dtype=object)
+    date = np.array([f'2025-05-{day:02d}' for day in rng.integers(1, 12, rows)], dtype=object)
+    roll[rng.random(rows) < 0.03] = np.nan
+    name[rng.random(rows) < 0.03] = None
+    date[rng.random(rows) < 0.03] = None
+    codes = rng.integers(0, OTHER_CODE + 2, rows).astype(np.uint8)
+    return pd.DataFrame({'Roll No': roll, 'Student Name': name, 'Date': date, 'code': codes})
+
+
+@pytest.mark.parametrize('rolls_name_students', [True, False])
+@pytest.mark.parametrize('seed', range(3))
+def test_first_policy_matches_pivot_table(seed, rolls_name_students):
+    records = _records(seed, rolls_name_students)
+
+    students, dates, matrix = pivot_codes(records[['Roll No', 'Student Name']], records['Date'], records['code'])
+
+    expected = records.pivot_table(index=['Roll No', 'Student Name'], columns='Date', values='code',
+                                   aggfunc='first')
+    assert dates == list(expected.columns)
+    assert list(students.itertuples(index=False, name=None)) == list(expected.index)
+    np.testing.assert_array_equal(matrix, expected.fillna(NO_DATA).to_numpy(dtype=np.uint8))
+
+
+def test_best_policy_keeps_the_highest_ranked_status_of_each_employee_day():
+    records = _records(7)
+
+    students, dates, matrix = pivot_codes(records[['Roll No', 'Student Name']], records['Date'], records['code'],
+                                          policy=BEST)
+
+    complete = records.dropna()
+    best = complete.loc[complete['code'].map(STATUS_RANK.__getitem__).groupby(
+        [complete['Roll No'], complete['Student Name'], complete['Date']]).idxmax()]
+    expected = best.pivot_table(index=['Roll No', 'Student Name'], columns='Date', values='code', aggfunc='first')
+    assert dates == list(expected.columns)
+    assert list(students.itertuples(index=False, name=None)) == list(expected.index)
+    np.testing.assert_array_equal(matrix, expected.fillna(NO_DATA).to_numpy(dtype=np.uint8))
+
+
+@pytest.mark.parametrize('statuses, first, best', [
+    ([ABSENT, PRESENT, INCOMPLETE], ABSENT, PRESENT),
+    ([ABSENT, INCOMPLETE], ABSENT, INCOMPLETE),
+    ([NO_DATA, ABSENT], NO_DATA, ABSENT),
+    ([OTHER_CODE, ABSENT], OTHER_CODE, ABSENT),
+    ([LEAVE, INCOMPLETE, OTHER_CODE], LEAVE, INCOMPLETE),
+])
+def test_duplicate_employee_days_follow_the_policy(statuses, first, best):
+    keys = pd.DataFrame({'Roll No': [1] * len(statuses), 'Student Name': ['a'] * len(statuses)})
+    dates = ['2025-05-01'] * len(statuses)
+
+    for policy, expected in [(FIRST, first), (BEST, best)]:
+        _, _, matrix = pivot_codes(keys, dates, statuses, policy=policy)
+        assert matrix.tolist() == [[expected]]
@@ -0,0 +1,39 @@
+import io
+
+import pandas as pd
+
+from attendance_core import build_attendance_report
+from attendance_ingest import stream_attendance_matrix
+from attendance_matrix import AttendanceMatrix
+from attendance_pivot import BEST
+
+RECORDS = pd.DataFrame({
+    'Name': ['a', 'a', 'a', 'a', 'b', 'b'],
+    'Date': ['05/01/2025', '05/02/2025', '05/03/2025', '05/04/2025', '05/01/2025', '05/02/2025'],
+    'Status': ['P', 'Late', 'A', 'Half Day', 'late', ''],
+})
+
+
+def test_unknown_statuses_keep_their_label_and_are_not_counted_absent():
+    report, notes = build_attendance_report(RECORDS, 'Name', 'Date', 'Status')
+    frame = report.to_frame()
+
+    assert frame['Total Present'].tolist() == [1, 0]
+    # b: no record on two days plus a blank status; 'LATE' is not absent
+    assert frame['Total Absent'].tolist() == [1, 3]
+    assert frame.iloc[0, 4:].tolist() == ['P', 'LATE', 'A', 'HALF DAY']
+    assert frame.iloc[1, 4:].tolist() == ['LATE', '-', '-', '-']
+    assert notes['other_statuses'] == ['LATE', 'HALF DAY']
+    assert notes['conversion_sample']['Converted'].tolist() == ['P', 'LATE', 'A', 'HALF DAY', 'LATE', '-']
+    assert AttendanceMatrix.from_frame(frame).to_frame().equals(frame)
+
+
+def test_streamed_report_keeps_unknown_statuses():
+    source = io.BytesIO()
+    RECORDS.to_excel(source, index=False)
+    source.seek(0)
+
+    streamed = stream_attendance_matrix(source, 'Name', 'Date', 'Status', chunk_rows=2, duplicates=BEST)
+    expected, _ = build_attendance_report(RECORDS, 'Name', 'Date', 'Status', duplicates=BEST)
+
+    pd.testing.assert_frame_equal(streamed.to_frame(), expected.to_frame())
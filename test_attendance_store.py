@@ -0,0 +1,46 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from attendance_store import AttendanceStore, status_records
+
+
+def _upload(prefix, rows=20):
+    return pd.DataFrame({'Name': [f'{prefix}{i}' for i in range(rows)],
+                         'Date': ['05/01/2025'] * rows, 'Status': ['P'] * rows})
+
+
+def test_rows_without_a_readable_date_are_returned():
+    df = pd.DataFrame({'Name': ['a', 'b', 'c'], 'Date': ['05/01/2025', '05/02/2025', 'not a date'],
+                       'Status': ['P', 'P', 'A']})
+
+    records, rejected = status_records(df, 'Name', 'Date', 'Status')
+
+    assert len(records) == 2
+    assert rejected['Name'].tolist() == ['c']
+
+
+def test_concurrent_appends_to_one_month_keep_every_record(tmp_path):
+    store = AttendanceStore(str(tmp_path))
+
+    def save(prefix):
+        for batch in range(5):
+            store.append(status_records(_upload(f'{prefix}-{batch}-'), 'Name', 'Date', 'Status')[0])
+
+    with ThreadPoolExecutor(max_workers=6) as pool:
+        list(pool.map(save, 'abcdef'))
+
+    assert len(store.read()) == 6 * 5 * 20
+
+
+def test_a_corrected_re_upload_replaces_the_stored_records(tmp_path):
+    store = AttendanceStore(str(tmp_path))
+    first = pd.DataFrame({'Name': ['a', 'b'], 'Date': ['05/01/2025', '05/01/2025'], 'Status': ['A', 'P']})
+    corrected = pd.DataFrame({'Name': ['a', 'b', 'c'], 'Date': ['05/01/2025'] * 3, 'Status': ['P', 'P', 'A']})
+
+    assert store.append(status_records(first, 'Name', 'Date', 'Status')[0]) == (2, 0, 0)
+    version = store.version()
+    assert store.append(status_records(corrected, 'Name', 'Date', 'Status')[0]) == (1, 1, 1)
+
+    assert store.version() != version
+    assert store.matrix().labels().tolist() == [['P'], ['P'], ['A']]
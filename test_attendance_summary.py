@@ -0,0 +1,31 @@
+import numpy as np
+import pandas as pd
+
+from attendance_dates import parse_dates
+from attendance_matrix import AttendanceMatrix
+from attendance_status import ABSENT, LEAVE, NO_DATA, PRESENT
+from attendance_summary import summarize_report
+from attendance_totals import compute_totals
+
+
+def test_monthly_rollup_reads_report_labels_month_first():
+    parse_dates(['13/05/2025', '14/05/2025'])
+    students = pd.DataFrame({'Roll No': [1], 'Student Name': ['a']})
+    report = AttendanceMatrix(students, ['05/01/2025', '05/02/2025', '06/01/2025'], np.full((1, 3), PRESENT))
+
+    monthly = summarize_report(report)['Monthly Rollup']
+
+    assert monthly['Month'].tolist() == ['May 2025', 'Jun 2025']
+    assert monthly['Dates'].tolist() == [2, 1]
+
+
+def test_student_summary_matches_report_totals():
+    students = pd.DataFrame({'Roll No': [1, 2, 3], 'Student Name': ['a', 'b', 'c']})
+    codes = np.array([[PRESENT, ABSENT, PRESENT], [PRESENT, NO_DATA, NO_DATA], [LEAVE, LEAVE, LEAVE]])
+    report = AttendanceMatrix(students, ['05/01/2025', '05/02/2025', '05/03/2025'], codes)
+
+    summary = summarize_report(report)['Student Summary']
+    totals = compute_totals(codes)
+
+    assert summary['Attendance %'].tolist() == totals['Attendance %'].tolist() == [66.67, 33.33, 0.0]
+    assert summary['Absent'].tolist() == totals['Absent Days'].tolist()
@@ -0,0 +1,147 @@
+import io
+import os
+import struct
+
+import pandas as pd
+import pytest
+
+from attendance_xls import read_xls
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def _record(code, payload=b''):
+    return struct.pack('<HH', code, len(payload)) + payload
+
+
+def _assert_reads_like_pandas(data):
+    expected = pd.read_excel(io.BytesIO(data), engine='xlrd')
+    pd.testing.assert_frame_equal(read_xls(data), expected)
+    return expected
+
+
+def test_zkteco_export_matches_pandas():
+    with open(os.path.join(HERE, 'may-july7.xls'), 'rb') as handle:
+        expected = _assert_reads_like_pandas(handle.read())
+    assert len(expected) > 0
+
+
+def _biff2_cell(code, row, col, payload, format_index=0):
+    return _record(code, struct.pack('<HHBBB', row, col, 0, format_index, 0) + payload)
+
+
+def _biff2_label(row, col, text):
+    data = text.encode('latin-1')
+    return _biff2_cell(0x0004, row, col, struct.pack('<B', len(data)) + data)
+
+
+def _biff2_sheet(cells, extra=()):
+    """A bare BIFF2 worksheet stream; format 1 is a date format"""
+    header = [_biff2_label(0, col, name) for col, name in enumerate(['Name', 'Count', 'Hours', 'Day', 'Flag'])]
+    formats = [_record(0x001E, b'\x07General'), _record(0x001E, b'\x06M/D/YY')]
+    return b''.join([_record(0x0009, b'\x00\x00\x10\x00'), *formats, *header, *cells, *extra, _record(0x000A)])
+
+
+BIFF2_CELLS = [
+    _biff2_label(1, 0, 'Ann'), _biff2_label(2, 0, 'Bo\xe9'), _biff2_label(3, 0, 'NA'),
+    _biff2_cell(0x0002, 1, 1, struct.pack('<H', 7)), _biff2_label(2, 1, '12'),
+    _biff2_cell(0x0003, 1, 2, struct.pack('<d', 7.25)), _biff2_cell(0x0003, 3, 2, struct.pack('<d', -0.5)),
+    _biff2_cell(0x0002, 1, 3, struct.pack('<H', 45778), format_index=1),
+    _biff2_cell(0x0003, 2, 3, struct.pack('<d', 45779.375), format_index=1),
+    _biff2_cell(0x0005, 1, 4, b'\x01\x00'), _biff2_cell(0x0005, 2, 4, b'\x00\x00'),
+    _biff2_cell(0x0001, 3, 4, b''),
+]
+
+
+def test_biff2_integers_numbers_labels_dates_and_booleans_match_pandas():
+    expected = _assert_reads_like_pandas(_biff2_sheet(BIFF2_CELLS))
+
+    assert expected['Name'].tolist()[:2] == ['Ann', 'Bo\xe9']
+    assert expected['Day'].iloc[1] == pd.Timestamp('2025-05-02 09:00')
+
+
+def test_biff2_with_rk_records_falls_back_to_xlrd_and_matches_pandas():
+    rk = _record(0x027E, struct.pack('<HHHI', 3, 1, 0, (42 << 2) | 2))
+    expected = _assert_reads_like_pandas(_biff2_sheet(BIFF2_CELLS, [rk]))
+
+    assert expected['Count'].iloc[2] == 42
+
+
+def _rk_integer(value):
+    return (value << 2) | 2
+
+
+def _rk_float(value):
+    """RK of a float whose low 34 mantissa bits are zero"""
+    return struct.unpack('<Q', struct.pack('<d', value))[0] >> 32 & ~3
+
+
+def _biff8_text(text, length_bytes='<H'):
+    return struct.pack(length_bytes, len(text)) + b'\x00' + text.encode('latin-1')
+
+
+def _biff8_workbook(strings, cells):
+    """
+    A BIFF8 workbook stream (no OLE2 container, which xlrd also reads):
+    globals with a shared string table and one sheet of `cells` records.
+    XF 0 is General, XF 1 the built-in date format 14.
+    """
+    xf = [_record(0x00E0, struct.pack('<HH', 0, fmt) + b'\x00' * 16) for fmt in (0, 14)]
+    sst = _record(0x00FC, struct.pack('<II', len(strings), len(strings))
+                  + b''.join(_biff8_text(text) for text in strings))
+
+    def globals_stream(sheet_offset):
+        sheet = _record(0x0085, struct.pack('<IH', sheet_offset, 0) + _biff8_text('Sheet1', '<B'))
+        return b''.join([_record(0x0809, struct.pack('<HHHHII', 0x0600, 0x0005, 0, 0, 0, 0)),
+                         _record(0x0042, struct.pack('<H', 1200)), _record(0x0022, struct.pack('<H', 0)),
+                         *xf, sheet, sst, _record(0x000A)])
+
+    sheet = b''.join([_record(0x0809, struct.pack('<HHHHII', 0x0600, 0x0010, 0, 0, 0, 0)), *cells,
+                      _record(0x000A)])
+    offset = len(globals_stream(0))
+    return globals_stream(offset) + sheet
+
+
+def test_biff8_shared_strings_rk_mulrk_and_dates_match_pandas():
+    strings = ['Name', 'Count', 'Hours', 'Day', 'Ann', 'Bob', 'NA', '12']
+    label = lambda row, col, index: _record(0x00FD, struct.pack('<HHHI', row, col, 0, index))
+    cells = [label(0, col, col) for col in range(4)]
+    cells += [label(1, 0, 4), label(2, 0, 5), label(3, 0, 6), label(3, 1, 7)]
+    # Row 1: MULRK over Count (integer), Hours (float) and Day (a date serial)
+    cells.append(_record(0x00BD, struct.pack('<HH', 1, 1) + struct.pack('<HI', 0, _rk_integer(5))
+                         + struct.pack('<HI', 0, _rk_float(7.5)) + struct.pack('<HI', 1, _rk_integer(45778))
+                         + struct.pack('<H', 3)))
+    # Row 2: RK integers scaled by 100, a NUMBER and a fractional date
+    cells.append(_record(0x027E, struct.pack('<HHHI', 2, 1, 0, _rk_integer(1234) | 1)))
+    cells.append(_record(0x0203, struct.pack('<HHHd', 2, 2, 0, 8.125)))
+    cells.append(_record(0x0203, struct.pack('<HHHd', 2, 3, 1, 45779.5)))
+    cells.append(_record(0x0205, struct.pack('<HHHBB', 3, 2, 0, 1, 0)))
+
+    expected = _assert_reads_like_pandas(_biff8_workbook(strings, cells))
+
+    assert expected['Name'].tolist()[:2] == ['Ann', 'Bob']
+    assert expected['Count'].tolist()[:2] == [5, 12.34]
+    assert expected['Hours'].tolist()[:2] == [7.5, 8.125]
+    assert expected['Day'].tolist()[:2] == [pd.Timestamp('2025-05-01'), pd.Timestamp('2025-05-02 12:00')]
+
+
+def test_biff8_workbook_written_by_xlwt_matches_pandas():
+    xlwt = pytest.importorskip('xlwt')
+    from datetime import datetime
+
+    workbook = xlwt.Workbook()
+    sheet = workbook.add_sheet('Sheet1')
+    date_style = xlwt.easyxf(num_format_str='M/D/YYYY h:mm:ss')
+    rows = [['Name', 'Roll', 'Date', 'Hours', 'Late'],
+            ['Ann', 1, datetime(2025, 5, 1, 9, 30), 7.5, False],
+            ['Bob', 123456, datetime(2025, 5, 2), 0.1, True],
+            ['Ann', 'N/A', datetime(2025, 5, 3, 17, 0, 5), -3, None]]
+    for row, values in enumerate(rows):
+        for col, value in enumerate(values):
+            if value is not None:
+                sheet.write(row, col, value, date_style if isinstance(value, datetime) else xlwt.Style.default_style)
+    data = io.BytesIO()
+    workbook.save(data)
+
+    expected = _assert_reads_like_pandas(data.getvalue())
+    assert expected['Date'].iloc[0] == pd.Timestamp('2025-05-01 09:30')